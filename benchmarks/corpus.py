@@ -0,0 +1,148 @@
+"""
+Sentetik Not Korpusu
+Gerçekçi Türkçe içerikli, frontmatter'lı not dosyaları üretir (seed ile
+tekrarlanabilir): klasör dağılımı, SIRKET_PROJE_CONFIG projeleri,
+sabitlenmiş / hatırlatıcılı notlar, paragraf + madde + görev listeleri,
+log-normal gövde uzunluğu. Notların çoğu appProperties'li (backfill
+edilmiş), bir kısmı değil; böylece metadata yolu da gövde indirir.
+"""
+from __future__ import annotations
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+from services import drive
+
+# Klasör başına not oranı
+FOLDER_WEIGHTS = {"inbox": 0.10, "notlar": 0.50, "gorevler": 0.20, "arsiv": 0.18, "cop_kutusu": 0.02}
+PROJECT_RATE = 0.7
+PINNED_RATE = 0.03
+APP_PROPERTIES_RATE = 0.9
+BODY_CHARS_MEDIAN = 900
+
+PROJECTS = [f"{sirket} - {proje}" for sirket, projeler in drive.SIRKET_PROJE_CONFIG.items() for proje in projeler]
+
+SUBJECTS = (
+    "Müşteri", "Proje ekibi", "Tedarikçi", "Yönetim kurulu", "Hukuk birimi", "Satış ekibi", "Finans",
+    "Danışman", "Yatırımcı", "Bakanlık", "Banka", "Saha ekibi", "Tasarım ekibi", "Ortak firma",
+)
+OBJECTS = (
+    "sözleşme taslağını", "bütçe revizyonunu", "teklif dosyasını", "sunum içeriğini", "iş takvimini",
+    "fatura kayıtlarını", "risk analizini", "toplantı notlarını", "hakediş raporunu", "tedarik planını",
+    "kredi başvurusunu", "ürün gereksinimlerini", "pazar araştırmasını", "ödeme planını", "ihale şartnamesini",
+)
+VERBS = (
+    "inceledi", "onayladı", "revize etmek istiyor", "gelecek haftaya erteledi", "yeniden değerlendirecek",
+    "eksik buldu", "paylaştı", "imzaya hazırladı", "yorumlarıyla geri gönderdi", "öncelikli olarak ele alacak",
+)
+DETAILS = (
+    "maliyet kalemleri netleşmeden ilerlemek istemiyorlar",
+    "teslim tarihi konusunda esneklik var ama yazılı teyit gerekiyor",
+    "döviz kuru farkı ayrıca hesaplanacak",
+    "teknik şartname ekinde güncel çizimler yok",
+    "karşı tarafın avukatı ek madde talep etti",
+    "ilk ödeme sipariş onayından sonra yapılacak",
+    "kalite kontrol sonuçları rapora eklenmeli",
+    "saha ziyareti için ulaşım ve konaklama planlanmalı",
+    "yıllık raporlama süreciyle aynı döneme denk geliyor",
+    "öncelik sırası bir sonraki toplantıda belirlenecek",
+)
+TITLE_WORDS = (
+    "Toplantı", "Görüşme", "Sözleşme", "Teklif", "Bütçe", "Sunum", "Rapor", "Takvim", "Ödeme", "Revizyon",
+    "Planlama", "Tedarik", "Satış", "Yatırım", "Eğitim", "Kontrol", "Değerlendirme", "Hazırlık",
+)
+TITLE_SUFFIXES = ("notları", "özeti", "takibi", "hazırlığı", "planı", "kararları", "soruları", "listesi")
+
+
+def _sentence(rng: random.Random) -> str:
+    sentence = f"{rng.choice(SUBJECTS)} {rng.choice(OBJECTS)} {rng.choice(VERBS)}"
+    if rng.random() < 0.6:
+        sentence += f"; {rng.choice(DETAILS)}"
+    return sentence + "."
+
+
+def _body(rng: random.Random, folder: str, target_chars: int) -> str:
+    """Paragraflar; arada madde listeleri, görevlerde onay kutuları"""
+    blocks = []
+    size = 0
+    while size < target_chars:
+        roll = rng.random()
+        if folder == "gorevler" and roll < 0.35:
+            block = "\n".join(f"- [{'x' if rng.random() < 0.3 else ' '}] {_sentence(rng)}" for _ in range(rng.randint(2, 6)))
+        elif roll < 0.2:
+            block = "\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(2, 5)))
+        else:
+            block = " ".join(_sentence(rng) for _ in range(rng.randint(1, 4)))
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
+
+
+def _title(rng: random.Random, proje: str | None) -> str:
+    title = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_SUFFIXES)}"
+    if proje and rng.random() < 0.5:
+        title = f"{proje.split(' - ', 1)[1]} - {title}"
+    return title
+
+
+def _filename(created: str, title: str, index: int) -> str:
+    """save_file'ın ad biçimi (aynı başlıklar için sıra eki)"""
+    safe_title = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in title)
+    safe_title = safe_title[:50].strip().replace(" ", "-").lower()
+    return f"{created}-{safe_title}-{index}.md"
+
+
+def _frontmatter(proje: str | None, created: str, pinned: bool, reminder: str | None, reminder_time: str) -> str:
+    """create_frontmatter ile aynı biçim, ama geçmiş tarihli"""
+    proje_str = f'"{proje}"' if proje else "null"
+    reminder_str = f'"{reminder}"' if reminder else "null"
+    return (
+        f"---\nproje: {proje_str}\ncreated: {created}\npinned: {'true' if pinned else 'false'}\n"
+        f"reminder: {reminder_str}\nreminder_time: \"{reminder_time}\"\n---"
+    )
+
+
+def generate(count: int, seed: int = 42) -> list[dict]:
+    """count not: {folder, name, content, app_properties, modified}"""
+    rng = random.Random(seed)
+    folders = list(FOLDER_WEIGHTS)
+    weights = list(FOLDER_WEIGHTS.values())
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    span = int(timedelta(days=730).total_seconds())
+    notes = []
+    for i in range(count):
+        folder = rng.choices(folders, weights)[0]
+        proje = rng.choice(PROJECTS) if rng.random() < PROJECT_RATE else None
+        moment = start + timedelta(seconds=rng.randrange(span), milliseconds=i % 1000)
+        created = moment.strftime("%Y-%m-%d")
+        pinned = rng.random() < PINNED_RATE
+        reminder = "daily" if folder == "gorevler" and rng.random() < 0.6 else None
+        reminder_time = f"{rng.choice((8, 9, 10, 14, 17)):02d}:00"
+        title = _title(rng, proje)
+        target = int(BODY_CHARS_MEDIAN * math.exp(rng.gauss(0, 0.8)))
+        body = _body(rng, folder, max(80, min(target, 20_000)))
+        content = f"{_frontmatter(proje, created, pinned, reminder, reminder_time)}\n\n# {title}\n\n{body}"
+        app_properties = None
+        if rng.random() < APP_PROPERTIES_RATE:
+            app_properties = drive.build_app_properties(
+                title, drive.generate_summary(body, fallback=title), proje, pinned, created, reminder, reminder_time
+            )
+        notes.append({
+            "folder": folder,
+            "name": _filename(created, title, i),
+            "content": content,
+            "app_properties": app_properties,
+            "modified": moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z",
+        })
+    return notes
+
+
+def populate(service, notes: list[dict]) -> dict[str, str]:
+    """Notları sahte Drive'a yükle, {klasör: id} döndür"""
+    folder_ids = {name: service.add_folder(name) for name in drive.FOLDER_CONFIG}
+    for note in notes:
+        service.add_file(
+            folder_ids[note["folder"]], note["name"], note["content"].encode("utf-8"),
+            note["app_properties"], note["modified"],
+        )
+    return folder_ids
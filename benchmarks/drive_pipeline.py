@@ -0,0 +1,284 @@
+"""
+Drive Okuma Hattı Benchmark'ı
+Sentetik Türkçe korpus (100 - 50k not) sahte Drive servisine yüklenir
+ve gerçek DriveBackend + services.drive yolu ölçülür; ağ / kimlik
+bilgisi gerekmez, seed ile tekrarlanabilir.
+
+Her korpus boyutu için:
+- get_items / get_items_metadata: soğuk (boş cache) ve sıcak süre
+- parse hızı: parse_frontmatter, generate_summary, _parse_item (not/sn)
+- filtre süresi: get_items_filtered ve indeks sorguları (sıcak cache)
+- bellek: cache'in tahmini boyutu, soğuk yüklemenin tracemalloc tepe / kalan
+- Drive çağrıları: aşama başına mantıksal çağrı, retry dahil HTTP, 429
+
+Sonuç JSON'dur; --save-baseline ile saklanır, --baseline ile karşılaştırılır
+(--max-regression aşılırsa çıkış kodu 1).
+
+Kullanım:
+    python benchmarks/drive_pipeline.py [--sizes 100,1000,10000] [--latency-ms 5] [--jitter-ms 2]
+        [--rate-limit 0.01] [--seed 42] [--json] [--save-baseline FILE] [--baseline FILE]
+"""
+import os
+import sys
+
+# Ölçüm tekrarlanabilir olsun: disk deposu, paylaşılan cache ve Changes senkronizasyonu kapalı
+os.environ["CONTENT_STORE_PATH"] = ""
+os.environ["SHARED_CACHE_PATH"] = ""
+os.environ["DRIVE_SYNC_INTERVAL"] = "0"
+os.environ["ERROR_LOG_SPOOL_PATH"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse  # noqa: E402
+import gc  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+
+import corpus  # noqa: E402
+from fake_drive import FakeDriveService  # noqa: E402
+from services import drive, indexes  # noqa: E402
+from services.storage import set_storage  # noqa: E402
+from services.storage_drive import DriveBackend  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10_000)
+FOLDER = "notlar"  # korpusun yarısı; ana liste görünümü
+WARM_REPEATS = 20
+MIN_SAMPLE_SECONDS = 0.2  # parse hızı en az bu kadar süre ölçülür
+NOISE_FLOOR_MS = 1.0  # bunun altındaki süreler karşılaştırmada yok sayılır
+
+# Karşılaştırmada yön: bu eklerle biten metrikler düşük olmalı, _per_sec yüksek
+LOWER_IS_BETTER = ("_ms", "_bytes", "_calls", "http_requests")
+HIGHER_IS_BETTER = ("_per_sec",)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _warm(fn, repeats: int = WARM_REPEATS) -> float:
+    """Medyan süre (saniye)"""
+    return statistics.median(_timed(fn) for _ in range(repeats))
+
+
+def _throughput(fn, inputs: list) -> float:
+    """fn'in girdi başına saniyedeki çağrı sayısı (en az MIN_SAMPLE_SECONDS ölçülür)"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for value in inputs:
+            fn(value)
+        count += len(inputs)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            return round(count / elapsed, 1)
+
+
+def _cold(service: FakeDriveService, fn) -> dict:
+    """Boş cache'ten tek çağrı: süre + Drive çağrıları"""
+    drive.clear_cache(broadcast=False)
+    before = service.stats()
+    elapsed = _timed(fn)
+    stats = service.stats(since=before)
+    return {
+        "cold_ms": _ms(elapsed),
+        "cold_calls": stats["total_calls"],
+        "cold_http_requests": stats["http_requests"],
+        "cold_rate_limited": stats["rate_limited"],
+        "cold_calls_by_method": stats["calls"],
+    }
+
+
+def _warm_phase(service: FakeDriveService, fn) -> dict:
+    before = service.stats()
+    elapsed = _warm(fn)
+    return {"warm_ms": _ms(elapsed), "warm_calls": service.stats(since=before)["total_calls"]}
+
+
+def _parse_rates(notes: list[dict]) -> dict:
+    contents = [n["content"] for n in notes]
+    bodies = [drive.parse_body(drive.parse_frontmatter(c)[1])[1] for c in contents]
+    infos = [{"id": f"bench{i}", "name": n["name"], "modifiedTime": n["modified"], "appProperties": {}}
+             for i, n in enumerate(notes)]
+    pairs = list(zip(infos, contents))
+    return {
+        "parse_frontmatter_per_sec": _throughput(drive.parse_frontmatter, contents),
+        "generate_summary_per_sec": _throughput(drive.generate_summary, bodies),
+        "parse_item_per_sec": _throughput(lambda pair: drive._parse_item(*pair), pairs),
+    }
+
+
+def _filter_latencies(service: FakeDriveService) -> dict:
+    """Sıcak cache üzerinde filtre süreleri (medyan)"""
+    drive.get_items(FOLDER)
+    company = next(iter(drive.SIRKET_PROJE_CONFIG))
+    cases = {
+        "proje": lambda: drive.get_items_filtered(FOLDER, corpus.PROJECTS[0]),
+        "company": lambda: drive.get_items_filtered(FOLDER, f"{company} (Tümü)"),
+        "no_project": lambda: drive.get_items_filtered(FOLDER, "Projesi Yok"),
+        "index_company_sorted": lambda: indexes.query_items(FOLDER, company=company, sort="-created"),
+        "index_pinned_range": lambda: indexes.query_items(FOLDER, pinned=True, modified_from="2025-01-01"),
+        "index_page": lambda: indexes.query_page(FOLDER, f"{company} (Tümü)", limit=drive.DEFAULT_PAGE_SIZE),
+    }
+    before = service.stats()
+    result = {f"{name}_ms": _ms(_warm(fn)) for name, fn in cases.items()}
+    result["filter_calls"] = service.stats(since=before)["total_calls"]
+    return result
+
+
+def _memory(service: FakeDriveService) -> dict:
+    """Soğuk yüklemenin bellek maliyeti (gecikmesiz, tracemalloc yavaşlatır)"""
+    latency, jitter, rate_limit = service.latency, service.jitter, service.rate_limit
+    service.latency = service.jitter = service.rate_limit = 0
+    try:
+        drive.clear_cache(broadcast=False)
+        gc.collect()
+        tracemalloc.start()
+        drive.get_items(FOLDER)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        service.latency, service.jitter, service.rate_limit = latency, jitter, rate_limit
+    return {
+        "cache_bytes": drive.get_cache_stats()["bytes"],
+        "traced_retained_bytes": retained,
+        "traced_peak_bytes": peak,
+    }
+
+
+def run_size(size: int, latency_ms: float, jitter_ms: float, rate_limit: float, seed: int) -> dict:
+    notes = corpus.generate(size, seed)
+    service = FakeDriveService(latency_ms, jitter_ms, rate_limit, seed)
+    corpus.populate(service, notes)
+    set_storage(DriveBackend(service, service.drive_id))
+    # Üretimdeki gibi senkronizasyon açık: liste TTL'i yok, sıcak ölçüm süre aşımına uğramaz
+    drive.set_sync_active(True)
+    try:
+        folder_notes = [n for n in notes if n["folder"] == FOLDER]
+        report = {"notes": size, "folder": FOLDER, "folder_notes": len(folder_notes)}
+        report["get_items"] = _cold(service, lambda: drive.get_items(FOLDER))
+        report["get_items"].update(_warm_phase(service, lambda: drive.get_items(FOLDER)))
+        report["get_items_metadata"] = _cold(service, lambda: drive.get_items_metadata(FOLDER))
+        report["get_items_metadata"].update(_warm_phase(service, lambda: drive.get_items_metadata(FOLDER)))
+        report["parse"] = _parse_rates(folder_notes)
+        report["filter"] = _filter_latencies(service)
+        report["memory"] = _memory(service)
+        report["drive"] = service.stats()
+    finally:
+        drive.set_sync_active(False)
+        drive.clear_cache(broadcast=False)
+        set_storage(None)
+    return report
+
+
+def run(sizes: list[int], latency_ms: float, jitter_ms: float, rate_limit: float, seed: int) -> dict:
+    return {
+        "config": {
+            "sizes": sizes, "latency_ms": latency_ms, "jitter_ms": jitter_ms,
+            "rate_limit": rate_limit, "seed": seed, "fetch_workers": drive.FETCH_WORKERS,
+        },
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "results": {str(size): run_size(size, latency_ms, jitter_ms, rate_limit, seed) for size in sizes},
+    }
+
+
+# ---------- baseline karşılaştırması ----------
+
+def _flatten(report: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[dict]:
+    """Baseline'a göre her metriğin değişimi; regression: izin verilen oranı aşan kötüleşme"""
+    current = _flatten(report["results"])
+    previous = _flatten(baseline["results"])
+    rows = []
+    for path, value in current.items():
+        old = previous.get(path)
+        if old is None or path.endswith("_by_method"):
+            continue
+        lower = path.endswith(LOWER_IS_BETTER)
+        if not lower and not path.endswith(HIGHER_IS_BETTER):
+            continue
+        if path.endswith("_ms") and max(value, old) < NOISE_FLOOR_MS:
+            continue
+        change = (value - old) / old if old else (0.0 if value == old else float("inf"))
+        worse = change if lower else -change
+        rows.append({"metric": path, "baseline": old, "current": value, "change": round(change, 4),
+                     "regression": worse > max_regression})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="virgülle korpus boyutları")
+    parser.add_argument("--latency-ms", type=float, default=5, help="Drive çağrısı başına gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=2, help="gecikmeye ± rastgele ek")
+    parser.add_argument("--rate-limit", type=float, default=0, help="429 oranı (0..1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yaz")
+    parser.add_argument("--save-baseline", metavar="FILE", help="sonucu baseline olarak kaydet")
+    parser.add_argument("--baseline", metavar="FILE", help="sonucu bu baseline ile karşılaştır")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="izin verilen kötüleşme oranı")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, args.latency_ms, args.jitter_ms, args.rate_limit, args.seed)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print("Uyarı: baseline farklı ayarlarla alınmış", file=sys.stderr)
+        report["comparison"] = compare(report, baseline, args.max_regression)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"gecikme {args.latency_ms}±{args.jitter_ms} ms, 429 oranı {args.rate_limit}, seed {args.seed}")
+        for size, result in report["results"].items():
+            items, meta, memory = result["get_items"], result["get_items_metadata"], result["memory"]
+            print(f"\n{size} not ({result['folder_notes']} {result['folder']})")
+            print(f"  get_items            soğuk {items['cold_ms']:>10.1f} ms  {items['cold_calls']:>6} çağrı"
+                  f"   sıcak {items['warm_ms']:.3f} ms")
+            print(f"  get_items_metadata   soğuk {meta['cold_ms']:>10.1f} ms  {meta['cold_calls']:>6} çağrı"
+                  f"   sıcak {meta['warm_ms']:.3f} ms")
+            for name, rate in result["parse"].items():
+                print(f"  {name:<28} {rate:>12,.0f}")
+            for name, value in result["filter"].items():
+                print(f"  filtre {name:<26} {value:>10}")
+            print(f"  bellek cache {memory['cache_bytes'] / 1024 / 1024:.1f} MB,"
+                  f" tepe {memory['traced_peak_bytes'] / 1024 / 1024:.1f} MB")
+            print(f"  drive {result['drive']['total_calls']} çağrı, {result['drive']['rate_limited']} × 429")
+        if args.baseline:
+            print(f"\nbaseline: {len(report['comparison'])} metrik, {len(regressions)} regresyon")
+            for row in regressions:
+                print(f"  {row['metric']}: {row['baseline']} → {row['current']} ({row['change']:+.0%})")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
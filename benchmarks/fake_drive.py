@@ -0,0 +1,293 @@
+"""
+Sahte Drive Servisi
+googleapiclient'ın Drive v3 servisinin bellek içi taklidi: DriveBackend'e
+verilir, böylece sayfalama (100'lük sayfalar), alan seçimi dışındaki tüm
+yol gerçek koddan geçer. Her execute() çağrısına gecikme + jitter eklenir
+ve istenen oranda 429 döner; 429'lar DriveHttp gibi (3 tekrar, urllib3
+backoff'u) tekrar denenir, denemeler tükenirse HttpError yükselir.
+
+Benchmark ve yük testi içindir; ağ ve kimlik bilgisi gerekmez.
+"""
+from __future__ import annotations
+import hashlib
+import itertools
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from services.storage import FOLDER_MIME
+from services.transport import MAX_RETRIES
+
+DRIVE_ID = "0AFakeBenchDrive"
+PAGE_SIZE_LIMIT = 1000
+RETRY_BACKOFF = 0.5  # seconds, transport'taki Retry(backoff_factor=0.5)
+
+_PARENT_RE = re.compile(r"'([^']+)' in parents")
+_NAME_CONTAINS_RE = re.compile(r"name contains '([^']*)'")
+
+
+def _format_time(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+class _Request:
+    """googleapiclient HttpRequest yerine: execute() gecikme / 429 uygular"""
+
+    def __init__(self, service: "FakeDriveService", method: str, run):
+        self._service = service
+        self._method = method
+        self._run = run
+
+    def execute(self, **kwargs):
+        return self._service._execute(self._method, self._run)
+
+
+class _Files:
+    def __init__(self, service: "FakeDriveService"):
+        self._s = service
+
+    def list(self, q: str = "", fields: str = None, orderBy: str = None, pageSize: int = 100,
+             pageToken: str = None, **kwargs):
+        return _Request(self._s, "files.list", lambda: self._s._list(q, pageSize, pageToken))
+
+    def get(self, fileId: str, fields: str = None, **kwargs):
+        return _Request(self._s, "files.get", lambda: self._s._meta(self._s._file(fileId)))
+
+    def get_media(self, fileId: str, **kwargs):
+        return _Request(self._s, "files.get_media", lambda: self._s._file(fileId)["body"])
+
+    def create(self, body: dict = None, media_body=None, fields: str = None, **kwargs):
+        return _Request(self._s, "files.create", lambda: self._s._create(body or {}, media_body))
+
+    def update(self, fileId: str, body: dict = None, media_body=None, addParents: str = None,
+               removeParents: str = None, fields: str = None, **kwargs):
+        return _Request(self._s, "files.update",
+                        lambda: self._s._update(fileId, body or {}, media_body, addParents, removeParents))
+
+    def delete(self, fileId: str, **kwargs):
+        return _Request(self._s, "files.delete", lambda: self._s._delete(fileId))
+
+
+class _Changes:
+    def __init__(self, service: "FakeDriveService"):
+        self._s = service
+
+    def getStartPageToken(self, **kwargs):
+        return _Request(self._s, "changes.getStartPageToken",
+                        lambda: {"startPageToken": str(len(self._s._changes))})
+
+    def list(self, pageToken: str, pageSize: int = 1000, **kwargs):
+        return _Request(self._s, "changes.list", lambda: self._s._list_changes(pageToken, pageSize))
+
+
+class FakeDriveService:
+    """Tek Shared Drive'lık bellek içi Drive v3 (files + changes alt kümesi)"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, rate_limit: float = 0,
+                 seed: int = None, drive_id: str = DRIVE_ID):
+        self.drive_id = drive_id
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._files = {}
+        self._changes = []  # file id sırası (Changes API)
+        self._ids = itertools.count(1)
+        self._clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self._listing_cache = {}  # (parent, ad filtresi) → sıralı liste; her yazmada boşaltılır
+        self.calls = {}
+        self.http_requests = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    # ---------- googleapiclient yüzeyi ----------
+
+    def files(self) -> _Files:
+        return _Files(self)
+
+    def changes(self) -> _Changes:
+        return _Changes(self)
+
+    def _execute(self, method: str, run):
+        for attempt in range(MAX_RETRIES + 1):
+            with self._lock:
+                delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+                limited = self.rate_limit > 0 and self._random.random() < self.rate_limit
+                self.http_requests += 1
+                if not limited:
+                    self.calls[method] = self.calls.get(method, 0) + 1
+            time.sleep(max(0.0, delay))
+            if not limited:
+                with self._lock:
+                    return run()
+            with self._lock:
+                self.rate_limited += 1
+            if attempt == MAX_RETRIES:
+                with self._lock:
+                    self.failed += 1
+                raise HttpError(httplib2.Response({"status": 429}), b'{"error": {"code": 429}}')
+            # urllib3 Retry: ilk tekrar beklemesiz, sonra backoff * 2^(n-1)
+            time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1) if attempt else 0)
+
+    # ---------- veri ----------
+
+    def _tick(self) -> str:
+        """Yazma zamanı: gerçek saat, ama her yazmada kesin artan (sürüm karşılaştırması için)"""
+        self._clock = max(self._clock + timedelta(milliseconds=1), datetime.now(timezone.utc))
+        return _format_time(self._clock)
+
+    def _file(self, file_id: str) -> dict:
+        record = self._files.get(file_id)
+        if record is None or record["trashed"]:
+            raise HttpError(httplib2.Response({"status": 404}), b'{"error": {"code": 404}}')
+        return record
+
+    @staticmethod
+    def _meta(record: dict) -> dict:
+        meta = {k: v for k, v in record.items() if k not in ("body", "trashed")}
+        meta["appProperties"] = dict(record["appProperties"])
+        meta["parents"] = list(record["parents"])
+        return meta
+
+    def _changed(self, file_id: str):
+        self._listing_cache.clear()
+        self._changes.append(file_id)
+
+    def add_folder(self, name: str) -> str:
+        with self._lock:
+            file_id = f"folder_{name}"
+            self._files[file_id] = {
+                "id": file_id, "name": name, "mimeType": FOLDER_MIME, "parents": [self.drive_id],
+                "modifiedTime": self._tick(), "appProperties": {}, "trashed": False,
+            }
+            self._listing_cache.clear()
+            return file_id
+
+    def add_file(self, folder_id: str, name: str, body: bytes, app_properties: dict = None,
+                 modified_time: str = None, file_id: str = None) -> str:
+        """Korpus yükleme: çağrı sayılmaz, gecikme yok"""
+        with self._lock:
+            file_id = file_id or f"1fake{next(self._ids):028x}"
+            self._files[file_id] = {
+                "id": file_id, "name": name, "mimeType": "text/markdown", "parents": [folder_id],
+                "modifiedTime": modified_time or self._tick(), "md5Checksum": hashlib.md5(body).hexdigest(),
+                "appProperties": {k: v for k, v in (app_properties or {}).items() if v is not None},
+                "body": body, "trashed": False,
+            }
+            self._changed(file_id)
+            return file_id
+
+    def _list(self, q: str, page_size: int, page_token: str | None) -> dict:
+        parent = _PARENT_RE.search(q)
+        name = _NAME_CONTAINS_RE.search(q)
+        key = (parent.group(1) if parent else None, name.group(1) if name else None, FOLDER_MIME in q)
+        listing = self._listing_cache.get(key)
+        if listing is None:
+            listing = [
+                r for r in self._files.values()
+                if not r["trashed"]
+                and (key[0] is None or key[0] in r["parents"])
+                and (key[1] is None or key[1] in r["name"])
+                and (not key[2] or r["mimeType"] == FOLDER_MIME)
+            ]
+            listing.sort(key=lambda r: r["modifiedTime"], reverse=True)
+            self._listing_cache[key] = listing
+        start = int(page_token or 0)
+        end = start + min(page_size, PAGE_SIZE_LIMIT)
+        result = {"files": [self._meta(r) for r in listing[start:end]]}
+        if end < len(listing):
+            result["nextPageToken"] = str(end)
+        return result
+
+    @staticmethod
+    def _media_bytes(media_body) -> bytes:
+        size = media_body.size()
+        if size is not None:
+            return media_body.getbytes(0, size)
+        # _StreamingUpload: boyut bilinmiyor, kısa okumaya kadar parça parça
+        data, chunk = bytearray(), media_body.chunksize()
+        while True:
+            part = media_body.getbytes(len(data), chunk)
+            data.extend(part)
+            if len(part) < chunk:
+                return bytes(data)
+
+    def _create(self, body: dict, media_body) -> dict:
+        file_id = f"1fake{next(self._ids):028x}"
+        content = self._media_bytes(media_body) if media_body is not None else b""
+        self._files[file_id] = {
+            "id": file_id, "name": body["name"], "mimeType": body.get("mimeType", "text/markdown"),
+            "parents": list(body.get("parents") or [self.drive_id]), "modifiedTime": self._tick(),
+            "md5Checksum": hashlib.md5(content).hexdigest(),
+            "appProperties": {k: v for k, v in (body.get("appProperties") or {}).items() if v is not None},
+            "body": content, "trashed": False,
+        }
+        self._changed(file_id)
+        return self._meta(self._files[file_id])
+
+    def _update(self, file_id: str, body: dict, media_body, add_parents: str, remove_parents: str) -> dict:
+        record = self._file(file_id)
+        if media_body is not None:
+            record["body"] = self._media_bytes(media_body)
+            record["md5Checksum"] = hashlib.md5(record["body"]).hexdigest()
+        for key, value in (body.get("appProperties") or {}).items():
+            if value is None:
+                record["appProperties"].pop(key, None)
+            else:
+                record["appProperties"][key] = value
+        if add_parents:
+            record["parents"] = [p for p in record["parents"] if p != remove_parents] + [add_parents]
+        record["modifiedTime"] = body.get("modifiedTime") or self._tick()
+        self._changed(file_id)
+        return self._meta(record)
+
+    def _delete(self, file_id: str) -> dict:
+        self._file(file_id)
+        del self._files[file_id]
+        self._changed(file_id)
+        return {}
+
+    def _list_changes(self, page_token: str, page_size: int) -> dict:
+        start = int(page_token)
+        end = min(len(self._changes), start + min(page_size, PAGE_SIZE_LIMIT))
+        changes = []
+        for file_id in self._changes[start:end]:
+            record = self._files.get(file_id)
+            if record is None:
+                changes.append({"fileId": file_id, "removed": True})
+            else:
+                changes.append({"fileId": file_id, "removed": False, "file": self._meta(record)})
+        result = {"changes": changes}
+        if end < len(self._changes):
+            result["nextPageToken"] = str(end)
+        else:
+            result["newStartPageToken"] = str(end)
+        return result
+
+    # ---------- görünürlük ----------
+
+    def stats(self, since: dict = None) -> dict:
+        """Mantıksal çağrılar (metot başına), retry dahil HTTP istekleri, 429'lar;
+        since verilirse o andan (önceki stats() sonucu) bu yana olanlar"""
+        with self._lock:
+            stats = {
+                "calls": dict(sorted(self.calls.items())),
+                "total_calls": sum(self.calls.values()),
+                "http_requests": self.http_requests,
+                "rate_limited": self.rate_limited,
+                "failed": self.failed,
+            }
+        if since is not None:
+            stats["calls"] = {
+                method: count - since["calls"].get(method, 0)
+                for method, count in stats["calls"].items() if count != since["calls"].get(method, 0)
+            }
+            for key in ("total_calls", "http_requests", "rate_limited", "failed"):
+                stats[key] -= since[key]
+        return stats
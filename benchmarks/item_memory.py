@@ -0,0 +1,104 @@
+"""
+Öğe Bellek Benchmark'ı
+10k notluk bir klasörün cache'te kapladığı belleği ölçer: düz dict,
+slotted Item ve gövdesi sıkıştırılmış Item. Render instance boyutu
+seçerken referans alınır.
+
+Kullanım:
+    python benchmarks/item_memory.py [--notes 10000] [--body-chars 1200] [--json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import item as item_module  # noqa: E402
+from services.item import Item  # noqa: E402
+
+WORDS = (
+    "proje toplantı rapor teklif sözleşme müşteri bütçe takvim revizyon onay "
+    "tasarım şantiye ihale fatura ödeme görüşme sunum taslak kontrol teslim "
+    "malzeme ekip planlama risk kalite tedarik hakediş keşif metraj çizim"
+).split()
+PROJECTS = [f"Şirket {s} - Proje {p}" for s in range(8) for p in range(6)]
+
+
+def _sample_records(count: int, body_chars: int, seed: int = 42) -> list[dict]:
+    """Drive'dan parse edilmiş gibi görünen ham kayıtlar (her biri ayrı string nesneleri)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < body_chars:
+            words.append(rng.choice(WORDS))
+        content = " ".join(words)
+        day = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        records.append({
+            "id": f"1{i:032x}",
+            "filename": f"{day}-not-{i}.md",
+            "title": f"Not {i} {rng.choice(WORDS)}",
+            "content": content,
+            "summary": content[:260],
+            # Drive'dan her seferinde ayrı string olarak gelir (intern edilmemiş)
+            "proje": "".join(rng.choice(PROJECTS)) if rng.random() < 0.7 else None,
+            "created": "".join(day),
+            "modified": f"{day}T{rng.randint(0, 23):02d}:00:00.000Z",
+            "pinned": rng.random() < 0.05,
+            "reminder": None,
+            "reminder_time": "".join(["09", ":00"]),
+        })
+    return records
+
+
+def _measure(build) -> int:
+    """build() sonucunun tuttuğu bellek (byte, tracemalloc)"""
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return size
+
+
+def run(notes: int, body_chars: int) -> dict:
+    results = {}
+    item_module.COMPRESS_BODIES = False
+    results["dict"] = _measure(lambda: _sample_records(notes, body_chars))
+    results["item"] = _measure(lambda: [Item(**r) for r in _sample_records(notes, body_chars)])
+    item_module.COMPRESS_BODIES = True
+    results["item_compressed"] = _measure(lambda: [Item(**r) for r in _sample_records(notes, body_chars)])
+    item_module.COMPRESS_BODIES = False
+    return {
+        "notes": notes,
+        "body_chars": body_chars,
+        "bytes": results,
+        "mb_per_10k": {k: round(v / notes * 10_000 / 1024 / 1024, 2) for k, v in results.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--body-chars", type=int, default=1200)
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    report = run(args.notes, args.body_chars)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.notes} not, ~{args.body_chars} karakter gövde")
+    baseline = report["bytes"]["dict"]
+    for name, size in report["bytes"].items():
+        print(f"  {name:<16} {report['mb_per_10k'][name]:>8.2f} MB / 10k not   ({size / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
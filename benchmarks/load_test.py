@@ -0,0 +1,335 @@
+"""
+Uçtan Uca Yük Testi
+SPA'nın (static/index.html) istek düzenini çok sayıda eşzamanlı sanal
+kullanıcıyla FastAPI uygulamasına oynatır. Uygulama aynı process'te
+(httpx ASGITransport) çalışır, Drive yerine gecikmeli sahte servis
+kullanılır; ağ / kimlik bilgisi gerekmez.
+
+Oturum (kullanıcı başına, tarayıcı gibi cookie + ETag saklanır):
+1. POST /api/auth, GET /api/auth
+2. Paralel: /api/counts, /api/companies, /api/config ve her tab için
+   /api/items/{tab} ön yüklemesi (SPA sayfa URL'i: limit + fields)
+3. Kart açma (GET /api/items/{tab}/{id}), arama
+4. Mutasyonlar: pin (aç/kapat), düzenle, taşı (ve geri), yeni not + sil
+5. Sayıları tekrar doğrula (If-None-Match → 304)
+
+Rapor: endpoint başına p50/p95/p99, istek/sn, hata oranı, oturum başına
+Drive çağrısı ve event loop gecikmesi (loop'u bloklayan kod burada görünür).
+Instance boyutlandırma ve event loop regresyonları için kullanılır.
+
+Kullanım:
+    python benchmarks/load_test.py [--users 20] [--sessions 3] [--notes 2000] [--latency-ms 20]
+        [--jitter-ms 10] [--rate-limit 0] [--think-ms 50] [--full-lists] [--json]
+"""
+from __future__ import annotations
+import os
+import sys
+
+# Disk deposu, paylaşılan cache, Changes senkronizasyonu kapalı; uygulama anahtarı sabit
+os.environ["CONTENT_STORE_PATH"] = ""
+os.environ["SHARED_CACHE_PATH"] = ""
+os.environ["DRIVE_SYNC_INTERVAL"] = "0"
+os.environ["ERROR_LOG_SPOOL_PATH"] = ""
+os.environ.setdefault("APP_SECRET_KEY", "load-test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import time  # noqa: E402
+from urllib.parse import quote  # noqa: E402
+
+import httpx  # noqa: E402
+
+import corpus  # noqa: E402
+from fake_drive import FakeDriveService  # noqa: E402
+from services import drive  # noqa: E402
+from services.storage import set_storage  # noqa: E402
+from services.storage_drive import DriveBackend  # noqa: E402
+
+import main  # noqa: E402
+
+TABS = list(drive.FOLDER_CONFIG)
+PAGE_SIZE = 50  # CONFIG.list.pageSize
+PAGE_FIELDS = "id,title,summary,proje,created,modified,pinned,reminder,reminder_time"  # CONFIG.list.fields
+SEARCH_TERMS = ("sözleşme", "bütçe", "toplantı", "ödeme", "rapor")
+LOOP_PROBE_INTERVAL = 0.005  # seconds
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank yüzdelik"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    """Endpoint etiketi başına süreler ve durum kodları"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = {}
+
+    def add(self, label: str, seconds: float, status: int | None):
+        self.latencies.setdefault(label, []).append(seconds)
+        statuses = self.statuses.setdefault(label, {})
+        key = str(status) if status is not None else "exception"
+        statuses[key] = statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for label, values in sorted(self.latencies.items()):
+            errors = self.errors.get(label, 0)
+            endpoints[label] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2),
+                "errors": errors,
+                "error_rate": round(errors / len(values), 4),
+                "statuses": self.statuses[label],
+            }
+        return endpoints
+
+
+class User:
+    """Tek tarayıcı: cookie jar + URL başına ETag (If-None-Match)"""
+
+    def __init__(self, app, recorder: Recorder, rng: random.Random, think: float, full_lists: bool):
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test")
+        self.recorder = recorder
+        self.rng = rng
+        self.think = think
+        self.full_lists = full_lists
+        self.etags = {}
+        self.bodies = {}
+
+    async def request(self, label: str, method: str, url: str, body: dict = None):
+        headers = {}
+        if method == "GET" and url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, json=body, headers=headers)
+        except Exception as e:
+            self.recorder.add(label, time.perf_counter() - start, None)
+            print(f"{label}: {type(e).__name__}: {e}", file=sys.stderr)
+            return None
+        self.recorder.add(label, time.perf_counter() - start, response.status_code)
+        if response.status_code == 304:
+            return self.bodies.get(url)
+        if response.status_code >= 400:
+            return None
+        data = response.json()
+        if method == "GET" and "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+            self.bodies[url] = data
+        return data
+
+    async def pause(self):
+        if self.think:
+            await asyncio.sleep(self.rng.uniform(0, 2 * self.think))
+
+    def items_url(self, tab: str) -> str:
+        if self.full_lists:
+            return f"/api/items/{tab}"
+        return f"/api/items/{tab}?filter={quote('Tümü')}&limit={PAGE_SIZE}&fields={PAGE_FIELDS}"
+
+    async def session(self):
+        await self.request("POST /api/auth", "POST", "/api/auth", {"key": main.SECRET_KEY})
+        await self.request("GET /api/auth", "GET", "/api/auth")
+
+        # loadInitialData: sayılar, şirketler, config ve tab ön yüklemesi aynı anda
+        results = await asyncio.gather(
+            self.request("GET /api/counts", "GET", "/api/counts"),
+            self.request("GET /api/companies", "GET", "/api/companies"),
+            self.request("GET /api/config", "GET", "/api/config"),
+            *(self.request("GET /api/items/{folder}", "GET", self.items_url(tab)) for tab in TABS),
+        )
+        lists = {tab: _page_items(data) for tab, data in zip(TABS, results[3:])}
+        await self.pause()
+
+        tab = "notlar" if lists.get("notlar") else self.rng.choice(TABS)
+        items = lists.get(tab) or []
+        if items:
+            item = self.rng.choice(items)
+            await self.request("GET /api/items/{folder}/{id}", "GET", f"/api/items/{tab}/{item['id']}")
+            await self.pause()
+            await self.request("GET /api/search", "GET",
+                               f"/api/search?q={quote(self.rng.choice(SEARCH_TERMS))}&folder={tab}")
+            await self.pause()
+
+            # Pin aç / kapat (veri aynı kalır)
+            for _ in range(2):
+                await self.request("POST /api/items/{id}/pin", "POST", f"/api/items/{item['id']}/pin?folder={tab}")
+            await self.pause()
+
+            full = await self.request("GET /api/items/{folder}/{id}", "GET", f"/api/items/{tab}/{item['id']}")
+            if full:
+                await self.request("PUT /api/items/{id}", "PUT", f"/api/items/{item['id']}?folder={tab}", {
+                    "title": full.get("title") or "Başlıksız",
+                    "content": (full.get("content") or "") + "\n\nYük testi düzenlemesi.",
+                    "proje": full.get("proje"),
+                    "pinned": bool(full.get("pinned")),
+                })
+                await self.pause()
+
+            # Arşive taşı ve geri al
+            target = "arsiv" if tab != "arsiv" else "notlar"
+            moved = await self.request("POST /api/items/{id}/move", "POST", f"/api/items/{item['id']}/move",
+                                       {"from_folder": tab, "to_folder": target})
+            if moved:
+                await self.request("POST /api/items/{id}/move", "POST", f"/api/items/{item['id']}/move",
+                                   {"from_folder": target, "to_folder": tab})
+            await self.pause()
+
+        # Hızlı not + sil (çöp kutusuna)
+        created = await self.request("POST /api/items", "POST", "/api/items", {
+            "title": f"Yük testi notu {self.rng.randrange(10 ** 6)}",
+            "content": "Müşteri toplantısı sonrası yapılacaklar listesi.",
+            "folder": "inbox",
+        })
+        if created and created.get("id"):
+            await self.pause()
+            await self.request("DELETE /api/items/{id}", "DELETE", f"/api/items/{created['id']}?folder=inbox")
+
+        # Sekme dönüşü: tarayıcı ETag'le yeniden doğrular
+        await self.request("GET /api/counts", "GET", "/api/counts")
+        await self.request("GET /api/items/{folder}", "GET", self.items_url(tab))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def _page_items(data) -> list[dict]:
+    if isinstance(data, dict):
+        return data.get("items") or []
+    return data or []
+
+
+async def _probe_loop(lags: list[float], stop: asyncio.Event):
+    """Event loop gecikmesi: uyanma zamanı ile beklenen arasındaki fark"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LOOP_PROBE_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - start - LOOP_PROBE_INTERVAL))
+
+
+async def _run(users: int, sessions: int, think: float, full_lists: bool, seed: int, recorder: Recorder) -> dict:
+    rng = random.Random(seed)
+    clients = [User(main.app, recorder, random.Random(rng.random()), think, full_lists) for _ in range(users)]
+    lags = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop(lags, stop))
+
+    async def user_loop(user: User):
+        for _ in range(sessions):
+            await user.session()
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(user_loop(user) for user in clients))
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+        for user in clients:
+            await user.close()
+    return {
+        "elapsed": elapsed,
+        "loop_lag": {
+            "p50_ms": round(percentile(lags, 50) * 1000, 2),
+            "p99_ms": round(percentile(lags, 99) * 1000, 2),
+            "max_ms": round(max(lags, default=0) * 1000, 2),
+        },
+    }
+
+
+def run(users: int, sessions: int, notes: int, latency_ms: float, jitter_ms: float, rate_limit: float,
+        think_ms: float, full_lists: bool, warmup: bool, seed: int) -> dict:
+    service = FakeDriveService(latency_ms, jitter_ms, rate_limit, seed)
+    corpus.populate(service, corpus.generate(notes, seed))
+    set_storage(DriveBackend(service, service.drive_id))
+    drive.clear_cache(broadcast=False)
+    try:
+        if warmup:
+            # Tek oturum: cache'ler dolar, ölçüm kararlı durumu gösterir
+            asyncio.run(_run(1, 1, 0, full_lists, seed, Recorder()))
+        recorder = Recorder()
+        before = service.stats()
+        result = asyncio.run(_run(users, sessions, think_ms / 1000, full_lists, seed, recorder))
+        drive_stats = service.stats(since=before)
+    finally:
+        drive.clear_cache(broadcast=False)
+        set_storage(None)
+
+    endpoints = recorder.summary()
+    total = sum(e["count"] for e in endpoints.values())
+    errors = sum(e["errors"] for e in endpoints.values())
+    session_count = users * sessions
+    return {
+        "config": {
+            "users": users, "sessions_per_user": sessions, "notes": notes, "latency_ms": latency_ms,
+            "jitter_ms": jitter_ms, "rate_limit": rate_limit, "think_ms": think_ms,
+            "full_lists": full_lists, "warmup": warmup, "seed": seed,
+        },
+        "elapsed_s": round(result["elapsed"], 3),
+        "requests": total,
+        "throughput_rps": round(total / result["elapsed"], 1),
+        "sessions_per_sec": round(session_count / result["elapsed"], 2),
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "drive": {
+            "calls": drive_stats["total_calls"],
+            "calls_per_session": round(drive_stats["total_calls"] / session_count, 2),
+            "calls_by_method": drive_stats["calls"],
+            "rate_limited": drive_stats["rate_limited"],
+            "failed": drive_stats["failed"],
+        },
+        "loop_lag": result["loop_lag"],
+        "endpoints": endpoints,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="eşzamanlı sanal kullanıcı")
+    parser.add_argument("--sessions", type=int, default=3, help="kullanıcı başına oturum")
+    parser.add_argument("--notes", type=int, default=2000, help="korpus boyutu")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Drive çağrısı başına gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="gecikmeye ± rastgele ek")
+    parser.add_argument("--rate-limit", type=float, default=0, help="429 oranı (0..1)")
+    parser.add_argument("--think-ms", type=float, default=50, help="adımlar arası ortalama bekleme")
+    parser.add_argument("--full-lists", action="store_true", help="tab ön yüklemesi sayfasız tam liste")
+    parser.add_argument("--no-warmup", action="store_true", help="soğuk cache ile başla")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    report = run(args.users, args.sessions, args.notes, args.latency_ms, args.jitter_ms, args.rate_limit,
+                 args.think_ms, args.full_lists, not args.no_warmup, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    print(f"{args.users} kullanıcı × {args.sessions} oturum, {args.notes} not, "
+          f"Drive {args.latency_ms}±{args.jitter_ms} ms")
+    print(f"{report['requests']} istek / {report['elapsed_s']} sn = {report['throughput_rps']} istek/sn, "
+          f"hata %{report['error_rate'] * 100:.2f}")
+    print(f"Drive: oturum başına {report['drive']['calls_per_session']} çağrı, {report['drive']['rate_limited']} × 429")
+    lag = report["loop_lag"]
+    print(f"event loop gecikmesi: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms\n")
+    print(f"  {'endpoint':<34} {'adet':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'hata':>6}")
+    for label, e in report["endpoints"].items():
+        print(f"  {label:<34} {e['count']:>6} {e['p50_ms']:>9.1f} {e['p95_ms']:>9.1f} {e['p99_ms']:>9.1f} {e['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main_cli()
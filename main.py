@@ -3,22 +3,37 @@ Kişisel Not Defterim - FastAPI Backend
 """
 import os
 import sys
+import json
+import zlib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
+from urllib.parse import quote
 
 from services.drive import (
-    get_items, get_items_filtered, get_all_counts,
-    save_file, move_file, delete_file, update_proje, toggle_pin,
-    export_items, get_sirket_options, get_proje_options,
-    get_companies_with_counts, clear_cache, SIRKET_PROJE_CONFIG,
-    log_error
+    get_items, get_sirket_options, get_proje_options,
+    get_companies_with_counts, clear_cache, invalidate_folder, get_cache_stats,
+    SIRKET_PROJE_CONFIG, FOLDER_CONFIG,
+    log_error, shutdown_error_log, parse_fields, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    get_cache_version, is_folder_fresh, enable_snapshot_serving, CACHE_EPOCH
 )
+from services import drive_async
+from services.indexes import parse_filters
+from services.export import EXPORT_FORMATS, export_filename
+from services.response_cache import EncodedBody, get_response_cache
+from services.shared_cache import get_shared_cache
+from services.storage import StorageError
+from services.events import get_event_bus, event_stream
+from services.metrics import MetricsMiddleware, render as render_metrics
+from services import profiling
+from services.sync import start_sync, stop_sync
+from services.transport import get_transport_stats
 
 # macOS Anımsatıcılar senkronizasyonu
 def sync_tasks_to_reminders():
@@ -57,14 +72,29 @@ def sync_tasks_to_reminders():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Uygulama başlangıcında çalışacak işlemler"""
-    # Startup: Mevcut görevleri Anımsatıcılar'a senkronize et
-    sync_tasks_to_reminders()
+    # Startup: Mevcut görevleri Anımsatıcılar'a senkronize et (event loop'u bloklamadan)
+    await drive_async.run_sync(sync_tasks_to_reminders)
+    # Bundan sonraki soğuk okumalar disk snapshot'ından (arka planda doğrulanır)
+    enable_snapshot_serving()
+    # Drive Changes API ile arka plan senkronizasyonu
+    start_sync()
     yield
-    # Shutdown: Temizlik işlemleri (şimdilik yok)
+    # Shutdown: Senkronizasyonu durdur, bekleyen hata loglarını yaz
+    stop_sync()
+    await drive_async.run_sync(shutdown_error_log)
 
 app = FastAPI(title="Kişisel Not Defterim API", lifespan=lifespan)
 
 
+# Depolama hataları (local backend: 400 / 404 / 409) HTTP durumuyla döner
+@app.exception_handler(StorageError)
+async def storage_exception_handler(request: Request, exc: StorageError):
+    if exc.status >= 500:
+        log_error(error_type=type(exc).__name__, message=str(exc),
+                  details={"url": str(request.url), "method": request.method})
+    return await http_exception_handler(request, HTTPException(status_code=exc.status, detail=str(exc)))
+
+
 # Global Exception Handler - Hataları Drive'a logla
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -76,7 +106,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         "error_message": str(exc)
     }
 
-    # Drive'a logla (arka planda, hata olsa bile devam et)
+    # Drive'a logla (kuyruğa alınır, arka planda toplu yazılır)
     try:
         log_error(
             error_type=type(exc).__name__,
@@ -110,8 +140,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# SSE akışı sıkıştırılmaz: event-stream'i muaf tutmayan Starlette sürümlerinde
+# GZipMiddleware akışı tamponlar ve olaylar istemciye ulaşmaz
+UNCOMPRESSED_PATHS = ("/api/events",)
+
+
+class StreamSafeGZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 # Gzip sıkıştırma (500 byte üzeri yanıtlar için)
-app.add_middleware(GZipMiddleware, minimum_size=500)
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=500)
+
+# Route başına süre / durum metrikleri (en dışta: sıkıştırma dahil ölçülür)
+app.add_middleware(MetricsMiddleware)
+
+# İsteğe bağlı profil (X-Profile başlığı / ?profile=1 ya da PROFILE_SLOW_MS); PROFILE_DIR boşsa hiç eklenmez
+if profiling.is_enabled():
+    app.add_middleware(profiling.ProfilingMiddleware, authorize=lambda scope: is_authorized(Request(scope)))
 
 # Static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -151,19 +201,83 @@ class ExportRequest(BaseModel):
     folder: str
     filter: str = "Tümü"
     name: str
+    format: str = "md"
 
 
 # Auth - cookie tabanlı
 COOKIE_NAME = "notdefteri_key"
 
 
+def is_authorized(request: Request) -> bool:
+    """Cookie veya query param'daki key doğru mu"""
+    key = request.cookies.get(COOKIE_NAME) or request.query_params.get("key")
+    return key == SECRET_KEY
+
+
 def check_auth(request: Request):
     """Cookie'den veya query param'dan auth kontrol et"""
-    key = request.cookies.get(COOKIE_NAME) or request.query_params.get("key")
-    if key != SECRET_KEY:
+    if not is_authorized(request):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+def check_folder(*folders: str):
+    """Bilinmeyen klasör adı → 400"""
+    for folder in folders:
+        if folder not in FOLDER_CONFIG:
+            raise HTTPException(status_code=400, detail=f"Bilinmeyen klasör: {folder}")
+
+
+# Conditional GET - ETag (cache sürümü) eşleşirse 304.
+# Zayıf ETag: aynı sürümün ham / gzip / br gövdeleri aynı etiketi taşır
+def make_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in (CACHE_EPOCH, *parts)) + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+async def load_versioned(key: str, load):
+    """(sürüm, veri). Sürüm veriden önce okunur (arada yazma olursa sadece fazladan
+    bir tam yanıt gider); soğuk yükleme sürümü ilerlettiyse veri yeni sürümle
+    tekrar okunur (artık cache'ten), böylece ilk yeniden doğrulama 304 alır."""
+    version = get_cache_version(key)
+    data = await load()
+    current = get_cache_version(key)
+    if current != version:
+        version, data = current, await load()
+    return version, data
+
+
+def conditional_json(request: Request, etag: str, content) -> Response:
+    """If-None-Match ETag ile eşleşirse gövdesiz 304, değilse ETag'li JSON"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content, headers=headers)
+
+
+def encoded_json(request: Request, etag: str, body: EncodedBody) -> Response:
+    """Hazır (serileştirilmiş + sıkıştırılmış) gövdeyi gönder; GZipMiddleware tekrar sıkıştırmaz"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    content, encoding = body.select(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content, media_type="application/json", headers=headers)
+
+
+# Config statik: ETag'ler bir kez hesaplanır
+_CONFIG_HASH = f"{zlib.crc32(json.dumps(SIRKET_PROJE_CONFIG, sort_keys=True).encode()):x}"
+CONFIG_ETAG = make_etag("config", _CONFIG_HASH)
+COMPANIES_ETAG = make_etag("companies", _CONFIG_HASH)
+
+
 # Routes
 @app.get("/")
 async def root():
@@ -198,27 +312,89 @@ async def verify_auth(request: Request):
 async def get_counts(request: Request):
     """Get all folder counts"""
     check_auth(request)
-    return get_all_counts()
+    version, counts = await load_versioned("counts", drive_async.get_all_counts)
+    return conditional_json(request, make_etag("counts", version), counts)
 
 
 @app.get("/api/items/{folder}")
 async def get_folder_items(
     folder: str,
     request: Request,
-    filter: str = Query("Tümü")
+    filter: str = Query("Tümü"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    company: Optional[str] = None,
+    proje: Optional[str] = None,
+    pinned: Optional[bool] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    modified_from: Optional[str] = None,
+    modified_to: Optional[str] = None,
+    sort: Optional[str] = None
 ):
-    """Get items from a folder with optional filter"""
+    """Get items from a folder with optional filter.
+
+    With limit/cursor returns a page: {items, next_cursor, total}.
+    fields=id,title,summary projects each item to the given fields.
+    company, proje, pinned and created/modified ranges combine (AND);
+    sort=modified|-modified|created|-created (default: pinned first, newest).
+    """
+    check_auth(request)
+    check_folder(folder)
+    # Sorgu parametreleri (filtre, sayfa, alanlar) ETag'e dahil
+    query_hash = f"{zlib.crc32(request.url.query.encode()):x}"
+    etag = make_etag("items", folder, get_cache_version(folder), query_hash)
+    paged = limit is not None or cursor is not None
+    try:
+        selected = parse_fields(fields)
+        filters = parse_filters(company, proje, pinned, created_from, created_to, modified_from, modified_to, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Liste taze ve bu sürüm için yanıt hazırsa serileştirme/sıkıştırma yapılmaz
+    response_cache = get_response_cache()
+    with_content = not paged or selected is None or "content" in selected
+    if is_folder_fresh(folder, with_content=with_content):
+        body = response_cache.get(etag)
+        if body is not None:
+            return encoded_json(request, etag, body)
+
+    async def load():
+        if paged:
+            return await drive_async.get_items_page(
+                folder, filter, limit or DEFAULT_PAGE_SIZE, cursor, selected, **filters
+            )
+        if filter == "Tümü" and not any(filters.values()) and filters["pinned"] is None:
+            items = await drive_async.get_items(folder)
+        else:
+            items = await drive_async.get_items_filtered(folder, filter, **filters)
+        if selected is not None:
+            items = [{field: item.get(field) for field in selected} for item in items]
+        return items
+
+    try:
+        version, content = await load_versioned(folder, load)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = make_etag("items", folder, version, query_hash)
+    return encoded_json(request, etag, response_cache.put(etag, content))
+
+
+@app.get("/api/items/{folder}/{file_id}")
+async def get_folder_item(folder: str, file_id: str, request: Request):
+    """Get a single item with its full body"""
     check_auth(request)
-    if filter == "Tümü":
-        return get_items(folder)
-    return get_items_filtered(folder, filter)
+    check_folder(folder)
+    return await drive_async.get_item(file_id, folder)
 
 
 @app.post("/api/items")
 async def create_item(item: ItemCreate, request: Request):
     """Create a new item"""
     check_auth(request)
-    file_id = save_file(item.title, item.content, item.folder, item.proje)
+    check_folder(item.folder)
+    file_id = await drive_async.save_file(item.title, item.content, item.folder, item.proje)
     return {"success": True, "id": file_id}
 
 
@@ -231,7 +407,8 @@ async def update_item(
 ):
     """Update an existing item"""
     check_auth(request)
-    save_file(item.title, item.content, folder, item.proje, file_id, item.pinned)
+    check_folder(folder)
+    await drive_async.save_file(item.title, item.content, folder, item.proje, file_id, item.pinned)
     return {"success": True}
 
 
@@ -239,7 +416,8 @@ async def update_item(
 async def move_item(file_id: str, move: MoveRequest, request: Request):
     """Move item between folders"""
     check_auth(request)
-    move_file(file_id, move.from_folder, move.to_folder)
+    check_folder(move.from_folder, move.to_folder)
+    await drive_async.move_file(file_id, move.from_folder, move.to_folder)
     return {"success": True}
 
 
@@ -247,7 +425,8 @@ async def move_item(file_id: str, move: MoveRequest, request: Request):
 async def pin_item(file_id: str, request: Request, folder: str = Query(...)):
     """Toggle pin status"""
     check_auth(request)
-    new_status = toggle_pin(file_id, folder)
+    check_folder(folder)
+    new_status = await drive_async.toggle_pin(file_id, folder)
     return {"success": True, "pinned": new_status}
 
 
@@ -255,7 +434,8 @@ async def pin_item(file_id: str, request: Request, folder: str = Query(...)):
 async def set_proje(file_id: str, proje: ProjeUpdate, request: Request):
     """Update item's project"""
     check_auth(request)
-    update_proje(file_id, proje.folder, proje.proje)
+    check_folder(proje.folder)
+    await drive_async.update_proje(file_id, proje.folder, proje.proje)
     return {"success": True}
 
 
@@ -263,7 +443,8 @@ async def set_proje(file_id: str, proje: ProjeUpdate, request: Request):
 async def delete_item(file_id: str, request: Request, folder: str = Query(...)):
     """Delete or trash an item"""
     check_auth(request)
-    delete_file(file_id, folder)
+    check_folder(folder)
+    await drive_async.delete_file(file_id, folder)
     return {"success": True}
 
 
@@ -271,7 +452,7 @@ async def delete_item(file_id: str, request: Request, folder: str = Query(...)):
 async def get_companies(request: Request):
     """Get companies with project counts"""
     check_auth(request)
-    return get_companies_with_counts()
+    return conditional_json(request, COMPANIES_ETAG, get_companies_with_counts())
 
 
 @app.get("/api/projects")
@@ -292,24 +473,141 @@ async def get_sirketler(request: Request):
 async def get_config(request: Request):
     """Get full company-project config"""
     check_auth(request)
-    return SIRKET_PROJE_CONFIG
+    response_cache = get_response_cache()
+    body = response_cache.get(CONFIG_ETAG) or response_cache.put(CONFIG_ETAG, SIRKET_PROJE_CONFIG)
+    return encoded_json(request, CONFIG_ETAG, body)
 
 
 @app.post("/api/export")
 async def export(export_req: ExportRequest, request: Request):
-    """Export filtered items to a file"""
+    """Export filtered items to a file in Drive (resumable chunked upload)"""
     check_auth(request)
-    items = get_items_filtered(export_req.folder, export_req.filter)
-    filename = export_items(items, export_req.name)
+    check_folder(export_req.folder)
+    if export_req.format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid export format")
+    filename = await drive_async.upload_export(
+        export_req.folder, export_req.filter, export_req.name, export_req.format
+    )
     return {"success": True, "filename": filename}
 
 
+@app.get("/api/export/download")
+async def export_download(
+    request: Request,
+    folder: str,
+    filter: str = "Tümü",
+    name: str = "export",
+    format: str = "md"
+):
+    """Stream filtered items directly to the client (md, jsonl, zip)"""
+    check_auth(request)
+    check_folder(folder)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid export format")
+    filename = export_filename(name, format)
+    return StreamingResponse(
+        drive_async.iter_export(folder, filter, name, format),
+        media_type=EXPORT_FORMATS[format][0],
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+    )
+
+
+@app.get("/api/sync")
+async def sync_delta(request: Request, since: Optional[str] = None):
+    """Items changed since a server version, plus tombstones (full list if since is unknown)"""
+    check_auth(request)
+    return await drive_async.get_delta(since)
+
+
+@app.get("/api/events")
+async def events(request: Request):
+    """Server-Sent Events change feed (Last-Event-ID replay, heartbeat)"""
+    check_auth(request)
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    if not get_event_bus().has_capacity():
+        raise HTTPException(status_code=503, detail="Too many event stream clients")
+    return StreamingResponse(
+        event_stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/search")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    folder: Optional[str] = None,
+    proje: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Full-text search over all folders (BM25, prefix matching)"""
+    check_auth(request)
+    if folder:
+        check_folder(folder)
+    return await drive_async.search(q, folder, proje, limit)
+
+
+@app.post("/api/migrate/app-properties")
+async def migrate_app_properties(request: Request):
+    """Backfill Drive appProperties for existing notes"""
+    check_auth(request)
+    return await drive_async.backfill_app_properties()
+
+
+@app.get("/api/stats")
+async def get_stats(request: Request):
+    """Drive transport counters, SSE clients, response / data cache statistics"""
+    check_auth(request)
+    return {
+        "transport": get_transport_stats(),
+        "event_clients": get_event_bus().client_count,
+        "response_cache": get_response_cache().stats(),
+        "cache": get_cache_stats(),
+        "shared_cache": shared.stats() if (shared := get_shared_cache()) else None,
+    }
+
+
+@app.get("/api/metrics")
+async def metrics(request: Request):
+    """Prometheus text format: route latency / status, Drive calls per caller, caches, thread pools"""
+    check_auth(request)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/profiles")
+async def list_profiles(request: Request, limit: int = Query(profiling.PROFILE_KEEP, ge=1, le=500)):
+    """Recently saved request profiles (newest first, without stacks)"""
+    check_auth(request)
+    return {
+        "enabled": profiling.is_enabled(),
+        "slow_ms": profiling.PROFILE_SLOW_MS,
+        "profiles": await drive_async.run_sync(profiling.list_profiles, limit),
+    }
+
+
+@app.get("/api/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str, format: str = "json"):
+    """One profile: top functions, per-thread time, folded stacks (format=folded for flame graph tools)"""
+    check_auth(request)
+    profile = await drive_async.run_sync(profiling.load_profile, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profil bulunamadı")
+    if format == "folded":
+        return PlainTextResponse(profiling.folded(profile))
+    return profile
+
+
 @app.post("/api/refresh")
-async def refresh(request: Request):
-    """Clear cache"""
+async def refresh(request: Request, folder: Optional[str] = None):
+    """Reload one folder from Drive (without folder: clear the whole cache)"""
     check_auth(request)
-    clear_cache()
-    return {"success": True}
+    if folder is None:
+        clear_cache()
+    else:
+        check_folder(folder)
+        invalidate_folder(folder)
+    return {"success": True, "folder": folder}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+"""
+Cache Yöneticisi
+services.drive'ın bellek cache'i: anahtar öneklerine göre namespace
+TTL'leri (klasör id'leri, öğe listeleri, sayılar), bellek bütçesi ile
+LRU eviction, süresi dolmuş kaydı bir süre daha sunma (stale) ve
+hit / miss / eviction / boyut istatistikleri. Tüm işlemler kısa bir
+kilit altında yapılır; thread'lerden ve event loop'tan güvenle çağrılır.
+"""
+from __future__ import annotations
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# namespace: (anahtar öneki, varsayılan TTL saniye; None = süresiz)
+NAMESPACES = {
+    "folder_ids": ("folder_ids", float(os.environ.get("CACHE_TTL_FOLDER_IDS", "3600"))),
+    "items": ("items_", float(os.environ.get("CACHE_TTL_ITEMS", "30"))),
+    "counts": ("all_counts", float(os.environ.get("CACHE_TTL_COUNTS", "30"))),
+}
+DEFAULT_NAMESPACE = "other"
+DEFAULT_TTL = 30  # seconds
+
+SIZE_SAMPLE = 32  # büyük listelerde boyut bu kadar öğeden tahmin edilir
+
+NAMESPACE_TTL = object()  # set(ttl=...) varsayılanı: namespace'in TTL'i
+
+
+def namespace_of(key: str) -> str:
+    for name, (prefix, _) in NAMESPACES.items():
+        if key.startswith(prefix):
+            return name
+    return DEFAULT_NAMESPACE
+
+
+def namespace_ttl(key: str) -> float | None:
+    """Anahtarın namespace'inin varsayılan TTL'i"""
+    return NAMESPACES.get(namespace_of(key), (None, DEFAULT_TTL))[1]
+
+
+def _object_size(obj) -> int:
+    """Tek değerin yaklaşık boyutu (sığ: kendisi + doğrudan alanları)"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in obj.items())
+    elif hasattr(obj, "__slots__"):
+        size += sum(sys.getsizeof(getattr(obj, slot, None)) for slot in obj.__slots__)
+    return size
+
+
+def estimate_size(value) -> int:
+    """Liste / dict değerinin yaklaşık bellek boyutu (byte); büyük listelerde örneklenir"""
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return sys.getsizeof(value)
+        step = max(1, len(value) // SIZE_SAMPLE)
+        sample = value[::step]
+        average = sum(_object_size(v) for v in sample) / len(sample)
+        return sys.getsizeof(value) + int(average * len(value))
+    return _object_size(value)
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "size")
+
+    def __init__(self, value, expires, size):
+        self.value = value
+        self.expires = expires
+        self.size = size
+
+
+class CacheManager:
+    """Bellek bütçeli, namespace TTL'li LRU cache"""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, stale_duration: float = 0):
+        self.max_bytes = max_bytes
+        self.stale_duration = stale_duration
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {}
+
+    def _count(self, key: str, stat: str):
+        counters = self._stats.setdefault(namespace_of(key), {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0})
+        counters[stat] += 1
+
+    # ---------- okuma ----------
+
+    def get(self, key: str):
+        """Taze değer, yoksa None"""
+        value, fresh = self.get_entry(key, allow_stale=False)
+        return value if fresh else None
+
+    def get_entry(self, key: str, allow_stale: bool = True) -> tuple:
+        """(değer, taze_mi); süresi dolmuş ama stale_duration içindeki kayıt da döner"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = time.time()
+                if entry.expires is None or now < entry.expires:
+                    self._entries.move_to_end(key)
+                    self._count(key, "hits")
+                    return entry.value, True
+                if allow_stale and now < entry.expires + self.stale_duration:
+                    self._entries.move_to_end(key)
+                    self._count(key, "stale_hits")
+                    return entry.value, False
+            self._count(key, "misses")
+            return None, False
+
+    def peek(self, key: str):
+        """Süresine bakmadan mevcut değer (istatistik / LRU sırası değişmez)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def is_fresh(self, key: str) -> bool:
+        """Kayıt var ve süresi dolmamış mı (istatistiğe sayılmaz)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry.expires is None or time.time() < entry.expires)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def keys(self, prefix: str = "") -> list[str]:
+        with self._lock:
+            return [key for key in self._entries if key.startswith(prefix)]
+
+    # ---------- yazma ----------
+
+    def set(self, key: str, value, ttl=NAMESPACE_TTL):
+        """Değeri yaz (ttl verilmezse namespace TTL'i, None = süresiz) ve bütçeyi koru"""
+        if ttl is NAMESPACE_TTL:
+            ttl = namespace_ttl(key)
+        size = estimate_size(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = _Entry(value, None if ttl is None else time.time() + ttl, size)
+            self._bytes += size
+            self._evict(keep=key)
+
+    def replace(self, key: str, value):
+        """Değeri süresini değiştirmeden güncelle (yerinde yama); kayıt yoksa bir şey yapmaz"""
+        size = estimate_size(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._bytes += size - entry.size
+            entry.value = value
+            entry.size = size
+            self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                self._entries.move_to_end(key)
+                key = next(iter(self._entries))
+            entry = self._entries.pop(key)
+            self._bytes -= entry.size
+            self._count(key, "evictions")
+
+    def expire(self, key: str):
+        """Değer kalsın (yeniden yüklemede karşılaştırma için) ama stale olarak da sunulmasın"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = float("-inf")
+
+    def set_expiry(self, key_or_prefix: str, ttl: float | None, prefix: bool = False):
+        """Kaydın (prefix=True ise öneke uyan tüm kayıtların) süresini yeniden ayarla"""
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(key_or_prefix)] if prefix else [key_or_prefix]
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.expires = expires
+
+    def pop(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._bytes -= entry.size
+            return entry.value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # ---------- görünürlük ----------
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = {}
+            for key, entry in self._entries.items():
+                ns = namespaces.setdefault(namespace_of(key), {"entries": 0, "bytes": 0})
+                ns["entries"] += 1
+                ns["bytes"] += entry.size
+            for name, counters in self._stats.items():
+                namespaces.setdefault(name, {"entries": 0, "bytes": 0}).update(counters)
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "namespaces": namespaces,
+            }
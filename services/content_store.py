@@ -0,0 +1,177 @@
+"""
+Kalıcı İçerik Deposu
+Drive'dan indirilip parse edilen notları diskte (SQLite) saklar.
+Kayıtlar dosya id + sürüm (md5Checksum / modifiedTime) ile eşleşir,
+böylece sadece sürümü değişen dosyalar yeniden indirilir.
+"""
+from __future__ import annotations
+import os
+import json
+import sqlite3
+import threading
+import time
+
+from services.item import Item, json_default
+
+# Boş bırakılırsa kalıcı depo devre dışı kalır
+CONTENT_STORE_PATH = os.environ.get("CONTENT_STORE_PATH", os.path.join(".cache", "content.db"))
+
+# Hiçbir klasörde listelenmeyen kayıtlar bu süre sonra silinir
+ORPHAN_TTL = 7 * 24 * 60 * 60  # seconds
+
+
+def file_version(file_info: dict) -> str:
+    """Listeleme kaydından içerik sürümü (md5 yoksa modifiedTime)"""
+    return file_info.get('md5Checksum') or file_info.get('modifiedTime') or ""
+
+
+class ContentStore:
+    """id + sürüm anahtarlı, klasör snapshot'ı tutan disk deposu"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                folder TEXT,
+                pos INTEGER,
+                data TEXT NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS items_folder ON items(folder, pos);
+            CREATE TABLE IF NOT EXISTS folders (
+                folder TEXT PRIMARY KEY,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._conn.commit()
+
+    def get_many(self, files: list[dict]) -> dict[str, Item]:
+        """Sürümü eşleşen kayıtları döndür: {file_id: item}"""
+        if not files:
+            return {}
+        wanted = {f['id']: file_version(f) for f in files}
+        found = {}
+        ids = list(wanted)
+        with self._lock:
+            # SQLite parametre limitine takılmamak için parça parça sorgula
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, version, data FROM items WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for file_id, version, data in rows:
+                    if version and version == wanted.get(file_id):
+                        found[file_id] = Item.from_mapping(json.loads(data))
+        return found
+
+    def put_many(self, folder: str, entries: list[tuple[str, dict]]):
+        """(version, item) kayıtlarını yaz"""
+        if not entries:
+            return
+        now = time.time()
+        rows = [
+            (item['id'], version, folder, json.dumps(item, ensure_ascii=False, default=json_default), now)
+            for version, item in entries
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO items (id, version, folder, data, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET version=excluded.version, folder=excluded.folder, "
+                "data=excluded.data, updated=excluded.updated",
+                rows
+            )
+            self._conn.commit()
+
+    def set_folder(self, folder: str, items: list[dict]):
+        """Klasör snapshot'ını güncelle (sıra + üyelik), eski kayıtları ayır"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE items SET folder = NULL, pos = NULL WHERE folder = ?", (folder,))
+            self._conn.executemany(
+                "UPDATE items SET folder = ?, pos = ?, data = ?, updated = ? WHERE id = ?",
+                [
+                    (folder, pos, json.dumps(item, ensure_ascii=False, default=json_default), now, item['id'])
+                    for pos, item in enumerate(items)
+                ]
+            )
+            self._conn.execute(
+                "INSERT INTO folders (folder, synced_at) VALUES (?, ?) "
+                "ON CONFLICT(folder) DO UPDATE SET synced_at=excluded.synced_at",
+                (folder, now)
+            )
+            self._conn.execute(
+                "DELETE FROM items WHERE folder IS NULL AND updated < ?", (now - ORPHAN_TTL,)
+            )
+            self._conn.commit()
+
+    def set_item_folder(self, file_id: str, folder: str | None):
+        """Tek kaydın klasörünü değiştir (None: hiçbir klasörde değil)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE items SET folder = ?, pos = NULL, updated = ? WHERE id = ?",
+                (folder, time.time(), file_id)
+            )
+            self._conn.commit()
+
+    def snapshot(self, folder: str) -> list[Item] | None:
+        """Klasörün son bilinen listesi (hiç senkronize edilmediyse None)"""
+        with self._lock:
+            synced = self._conn.execute(
+                "SELECT synced_at FROM folders WHERE folder = ?", (folder,)
+            ).fetchone()
+            if synced is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT data FROM items WHERE folder = ? ORDER BY pos", (folder,)
+            ).fetchall()
+        return [Item.from_mapping(json.loads(data)) for (data,) in rows]
+
+    def get_meta(self, key: str) -> str | None:
+        """Küçük durum kayıtları (ör. Changes API sayfa token'ı)"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str | None):
+        with self._lock:
+            if value is None:
+                self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+            else:
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                    (key, value)
+                )
+            self._conn.commit()
+
+
+_store = None
+_store_failed = False
+_store_lock = threading.Lock()
+
+
+def get_content_store() -> ContentStore | None:
+    """Depo singleton'ı (devre dışıysa veya açılamazsa None)"""
+    global _store, _store_failed
+    if _store is None and CONTENT_STORE_PATH and not _store_failed:
+        with _store_lock:
+            if _store is None and not _store_failed:
+                try:
+                    _store = ContentStore(CONTENT_STORE_PATH)
+                except (OSError, sqlite3.Error) as e:
+                    _store_failed = True
+                    print(f"Content store disabled: {e}")
+    return _store
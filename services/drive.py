@@ -2,17 +2,28 @@
 Google Drive API Service
 Tüm Drive işlemleri bu modülde
 """
+from __future__ import annotations
 import os
 import sys
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaInMemoryUpload
-from google.auth.transport.requests import AuthorizedSession
+import base64
+import itertools
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 import time
 
+from services.cache import CacheManager, NAMESPACE_TTL, namespace_ttl
+from services.content_store import get_content_store, file_version
+from services.events import publish_event
+from services.item import Item
+from services.metrics import register_executor
+from services.profiling import bind
+from services.shared_cache import CLEAR_ALL, get_shared_cache
+from services.storage import FETCH_WORKERS, get_storage
+
 # macOS Anımsatıcılar entegrasyonu (sadece macOS'ta ve lokal çalışırken)
 _reminders_available = False
 if sys.platform == "darwin":
@@ -27,10 +38,6 @@ if sys.platform == "darwin":
     except ImportError:
         pass
 
-# Config
-SCOPES = ['https://www.googleapis.com/auth/drive']
-SHARED_DRIVE_ID = os.environ.get("SHARED_DRIVE_ID", "0AFbVhvJLQtOHUk9PVA")
-
 # Şirket ve Proje Konfigürasyonu
 SIRKET_PROJE_CONFIG = {
     "ENVEX": [
@@ -105,87 +112,411 @@ FOLDER_CONFIG = {
     "cop_kutusu": "cop_kutusu",
 }
 
-# Drive Service Singleton
-_drive_service = None
-_folder_ids_cache = None
+# Süresi dolmuş kayıt bu kadar süre daha sunulur, arka planda yenilenir
+STALE_DURATION = 300  # seconds
+
+# TTL Cache: folder_ids / items_* / all_counts namespace'leri (services/cache.py)
+_cache = CacheManager(stale_duration=STALE_DURATION)
+
+# Bu process'te disk snapshot'ı sunulmuş klasörler (sadece ilk istekte)
+_snapshot_served = set()
+
+# Snapshot sadece sunucunun okuma yolunda sunulur (enable_snapshot_serving);
+# scriptler ve tek seferlik çağıranlar her zaman güncel listeyi yükler
+_serve_snapshots = False
+
+# Changes API senkronizasyonu çalışırken item cache'leri süresiz tutulur
+_sync_active = False
+_cache_lock = threading.Lock()
+
+# Yazma/invalidation sayacı: eski sürümle başlamış yüklemeler cache'e yazılmaz
+_cache_generation = 0
+
+# Single-flight: aynı anahtar için eşzamanlı yüklemeler tek fetch'i paylaşır
+_inflight = {}
+_inflight_lock = threading.Lock()
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+register_executor("cache-refresh", _refresh_executor)
+
+# Paylaşılan katman (SHARED_CACHE_PATH): yerel kopyanın karşılık geldiği kayıt sürümü
+_shared_versions = {}
+SHARED_LOAD_TIMEOUT = 60  # seconds, başka worker'ın yüklemesi en fazla bu kadar beklenir
+
+# Klasör / sayı verisi değiştikçe artan sürümler (ETag için).
+# Process'e özgü epoch ile birlikte kullanılır: restart sonrası sürümler çakışmaz.
+CACHE_EPOCH = f"{int(time.time()):x}"
+_version_counter = itertools.count(1)
+_versions = {}
+
+
+def get_cache_version(key: str) -> int:
+    """Klasör adı veya "counts" için güncel veri sürümü"""
+    return _versions.get(key, 0)
+
+
+def _bump_versions(*keys):
+    for key in keys:
+        if key is not None:
+            _versions[key] = next(_version_counter)
+
+
+# Öğe bazlı değişiklik günlüğü (delta sync): id → (sürüm, klasör, öğe | None).
+# Sırası sürüm sırasıdır; güncellenen kayıt sona taşınır. None = tombstone.
+MAX_TOMBSTONES = 2000
+_item_log = OrderedDict()
+_item_log_lock = threading.Lock()
+_item_version = 0
+_tombstones = 0
+_min_delta_version = 0  # daha eski "since" değerleri tam senkronizasyon gerektirir
+
+
+def _record_item(file_id: str, folder_type: str | None, item: dict | None):
+    """Öğe değişikliğini günlüğe yaz (_item_log_lock tutulurken çağrılır)"""
+    global _item_version, _tombstones, _min_delta_version
+    previous = _item_log.get(file_id)
+    if item is None:
+        if previous is None or previous[2] is None:
+            # Bilinmeyen veya zaten silinmiş
+            return
+        _tombstones += 1
+    elif previous is not None and previous[2] is None:
+        _tombstones -= 1
+    _item_log.pop(file_id, None)
+    _item_version += 1
+    _item_log[file_id] = (_item_version, folder_type, item)
+
+    # En eski tombstone'ları at; onlardan önceki "since" değerleri artık delta alamaz
+    if _tombstones > MAX_TOMBSTONES:
+        for old_id, (version, _, old_item) in list(_item_log.items()):
+            if old_item is None:
+                del _item_log[old_id]
+                _tombstones -= 1
+                _min_delta_version = version
+                if _tombstones <= MAX_TOMBSTONES // 2:
+                    break
+
+
+def _log_item_change(file_id: str, folder_type: str | None, item: dict | None):
+    with _item_log_lock:
+        _record_item(file_id, folder_type, item)
+
+
+def _log_list_change(folder_type: str, items: list[dict]):
+    """Yeniden yüklenen listeyi günlükle karşılaştır: yeni/değişen öğeler ve çıkanlar"""
+    with _item_log_lock:
+        for item in items:
+            entry = _item_log.get(item["id"])
+            if entry is not None and entry[1] == folder_type and entry[2] is not None \
+                    and _metadata_view(entry[2]) == _metadata_view(item):
+                # Değişmedi: sürüm aynı kalır, referans güncellenir
+                _item_log[item["id"]] = (entry[0], folder_type, item)
+                continue
+            _record_item(item["id"], folder_type, item)
+
+        # Günlükte bu klasörde görünüp listede olmayanlar silinmiştir
+        # (başka klasörde görülmüşse taşınmıştır, kaydı zaten o klasördedir)
+        current = {item["id"] for item in items}
+        gone = [
+            file_id for file_id, (_, folder, item) in _item_log.items()
+            if folder == folder_type and item is not None and file_id not in current
+        ]
+        for file_id in gone:
+            _record_item(file_id, folder_type, None)
+
+
+def get_delta(since: str = None) -> dict:
+    """since sürümünden bu yana değişen öğeler + tombstone'lar.
+
+    since boşsa, başka process'e aitse veya tombstone'ları silinmişse
+    tam liste döner (full=True). Sürüm "<epoch>.<n>" biçimindedir.
+    """
+    # Henüz yüklenmemiş klasörlerin öğeleri de günlüğe girsin
+    for folder_type in FOLDER_CONFIG:
+        get_items_metadata(folder_type)
+
+    epoch, _, number = (since or "").partition(".")
+    with _item_log_lock:
+        full = not (epoch == CACHE_EPOCH and number.isdigit()
+                    and _min_delta_version <= int(number) <= _item_version)
+        since_version = 0 if full else int(number)
+        items, deleted = [], []
+        for file_id, (version, folder_type, item) in reversed(_item_log.items()):
+            if version <= since_version:
+                break
+            if item is None:
+                if not full:
+                    deleted.append(file_id)
+            else:
+                items.append(dict(_metadata_view(item), folder=folder_type, version=version))
+        current = _item_version
+
+    return {
+        "version": f"{CACHE_EPOCH}.{current}",
+        "full": full,
+        "items": items,
+        "deleted": deleted,
+    }
+
 
-# TTL Cache
-_cache = {}
-_cache_ttl = {}
-CACHE_DURATION = 30  # seconds
+# Cache değişikliklerini dinleyenler (ör. arama indeksi).
+# listener(event, folder_type, payload) - event: folder | folder_meta | upsert | remove | invalidate | clear
+_cache_listeners = []
+
+
+def add_cache_listener(listener):
+    """Klasör listeleri yüklendiğinde/yamalandığında çağrılacak fonksiyonu kaydet"""
+    if listener not in _cache_listeners:
+        _cache_listeners.append(listener)
+
+
+def _notify_cache_listeners(event: str, folder_type: str = None, payload=None):
+    for listener in _cache_listeners:
+        try:
+            listener(event, folder_type, payload)
+        except Exception as e:
+            print(f"Cache listener error ({event}): {e}")
 
 
 def get_cached(key):
     """Get cached value if not expired"""
-    if key in _cache and key in _cache_ttl:
-        if time.time() < _cache_ttl[key]:
-            return _cache[key]
-    return None
+    return _cache.get(key)
 
 
-def set_cached(key, value, ttl=CACHE_DURATION):
-    """Set cache with TTL"""
-    _cache[key] = value
-    _cache_ttl[key] = time.time() + ttl
+def set_cached(key, value, ttl=NAMESPACE_TTL):
+    """Set cache with TTL (varsayılan: namespace TTL'i, ttl=None: süresiz); paylaşılan katmana da yazar"""
+    _cache.set(key, value, ttl)
+    shared = _shared()
+    if shared is not None:
+        try:
+            _shared_versions[key] = shared.put(key, value, namespace_ttl(key) if ttl is NAMESPACE_TTL else ttl)
+        except Exception as e:
+            _shared_versions.pop(key, None)
+            print(f"Shared cache write failed for {key}: {e}")
+
+
+def get_cache_stats() -> dict:
+    return _cache.stats()
+
+
+def is_folder_fresh(folder_type: str, with_content: bool = True) -> bool:
+    """Klasör listesi cache'te taze mi (hazır yanıt veriye dokunmadan sunulabilir)"""
+    if _cache.is_fresh(f"items_{folder_type}"):
+        return True
+    return not with_content and _cache.is_fresh(f"items_meta_{folder_type}")
 
 
-def get_credentials():
-    """Environment'tan credentials al"""
-    creds_json = os.environ.get("GCP_CREDENTIALS")
-    if creds_json:
-        creds_info = json.loads(creds_json)
-        return service_account.Credentials.from_service_account_info(creds_info, scopes=SCOPES)
-    raise ValueError("GCP_CREDENTIALS environment variable not set")
+def _bump_generation():
+    global _cache_generation
+    _cache_generation += 1
+
+
+def _single_flight(key, loader):
+    """Aynı anahtar için tek yükleme çalıştır, eşzamanlı çağıranlar sonucu paylaşır"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+    if not leader:
+        return future.result()
+    try:
+        result = loader()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _refresh_in_background(key, loader):
+    """Bayat kayıt için tek arka plan yenilemesi başlat"""
+    if key in _inflight:
+        return
+
+    def run():
+        try:
+            _single_flight(key, loader)
+        except Exception as e:
+            print(f"Background refresh failed for {key}: {e}")
+
+    _refresh_executor.submit(run)
 
 
-def get_drive_service():
-    """Google Drive API servisi - singleton"""
-    global _drive_service
-    if _drive_service is None:
-        credentials = get_credentials()
-        authed_session = AuthorizedSession(credentials)
+def _cached_or_load(key, loader):
+    """Taze cache → hemen; bayat → hemen + arka planda yenile; yok → single-flight yükle"""
+    value, fresh = _cache.get_entry(key)
+    if value is not None:
+        if not fresh:
+            _refresh_in_background(key, lambda: _load_shared_first(key, loader))
+        return value
+    return _single_flight(key, lambda: _load_shared_first(key, loader))
+
+
+# ---------- paylaşılan katman (çok worker) ----------
+
+def _shared():
+    """Paylaşılan cache (kapalıysa None); ilk kullanımda invalidation izleyicisi başlar"""
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.watch(_apply_shared_invalidations)
+    return shared
+
+
+def _load_shared_first(key, loader):
+    """Paylaşılan katmanda taze kayıt varsa onu al; yoksa anahtarı tek worker Drive'dan yükler"""
+    shared = _shared()
+    if shared is None:
+        return loader()
+    lease = f"load:{key}"
+    try:
+        value = _from_shared(shared, key)
+        if value is not None:
+            return value
+        if not shared.try_lease(lease, SHARED_LOAD_TIMEOUT):
+            generation = _cache_generation
+            found = shared.wait_for(key, lease, SHARED_LOAD_TIMEOUT)
+            if found is not None:
+                return _install_shared(key, *found, generation=generation)
+            shared.try_lease(lease, SHARED_LOAD_TIMEOUT)
+    except Exception as e:
+        print(f"Shared cache read failed for {key}: {e}")
+    try:
+        return loader()
+    finally:
+        try:
+            shared.release(lease)
+        except Exception:
+            pass
+
+
+def _from_shared(shared, key):
+    generation = _cache_generation
+    found = shared.get(key)
+    return _install_shared(key, *found, generation=generation) if found is not None else None
+
+
+def _install_shared(key, value, expires, version, generation):
+    """Paylaşılan kaydı yerel cache'e al (tekrar yayınlamadan).
+
+    Yerel süre namespace TTL'ini aşmaz: diğer worker'ın yüklemesi bu
+    worker'da en geç bir TTL sonra paylaşılan katmandan yeniden okunur.
+    """
+    if generation != _cache_generation:
+        # Okurken yerel yazma oldu: yine de döndür, cache'e yazma
+        return value
+    if key.startswith("items_") and _sync_active:
+        ttl = None
+    else:
+        ttl = namespace_ttl(key)
+        if expires is not None:
+            remaining = max(0.0, expires - time.time())
+            ttl = remaining if ttl is None else min(ttl, remaining)
+
+    if key.startswith("items_"):
+        meta = key.startswith("items_meta_")
+        folder_type = key[len("items_meta_" if meta else "items_"):]
+        _snapshot_served.add(folder_type)
+        _track_list_change(folder_type, _cache.peek(key), value)
+        _cache.set(key, value, ttl)
+        _notify_cache_listeners("folder_meta" if meta else "folder", folder_type, value)
+    else:
+        if key == "all_counts" and _cache.peek(key) != value:
+            _bump_versions("counts")
+        _cache.set(key, value, ttl)
+    _shared_versions[key] = version
+    return value
+
+
+def _share_patches(patched: dict, dropped: set):
+    """Yerel yamaları paylaşılan katmana yaz ve diğer worker'lara duyur.
+
+    patched: anahtar → (yeni değer, değişen öğeler). Paylaşılan kayıt bu
+    arada başka worker tarafından yazıldıysa silinir; okuyan yeniden yükler.
+    """
+    shared = _shared()
+    if shared is None or not (patched or dropped):
+        return
+    try:
+        for key, (value, changed) in patched.items():
+            version = _shared_versions.get(key)
+            version = shared.patch(key, value, changed, version) if version is not None else None
+            if version is None:
+                dropped.add(key)
+            else:
+                _shared_versions[key] = version
+        for key in dropped:
+            _shared_versions.pop(key, None)
+        if dropped:
+            shared.delete(*dropped)
+        shared.publish([*patched, *dropped])
+    except Exception as e:
+        print(f"Shared cache write failed: {e}")
+
+
+def _apply_shared_invalidations(keys: set[str]):
+    """Başka worker'ın yazdığı anahtarların yerel kopyalarını düşür (tekrar yayınlamadan)"""
+    if CLEAR_ALL in keys:
+        clear_cache(broadcast=False)
+        return
+    folders = set()
+    for key in keys:
+        _shared_versions.pop(key, None)
+        if key.startswith("items_"):
+            folders.add(key[len("items_meta_" if key.startswith("items_meta_") else "items_"):])
+        else:
+            _cache.pop(key)
+    for folder_type in folders & set(FOLDER_CONFIG):
+        # Disk snapshot'ı yazandan eski olabilir: yeniden yükleme paylaşılan katmandan / Drive'dan
+        _snapshot_served.add(folder_type)
+        _invalidate_folder(folder_type, broadcast=False)
+    if "all_counts" in keys:
+        _bump_versions("counts")
+        publish_event("counts_changed", counts=None)
+
 
-        class RequestsHttpAdapter:
-            def __init__(self, session):
-                self.session = session
+def set_sync_active(active: bool):
+    """Senkronizasyon motoru açıkken item cache'leri TTL ile düşmez"""
+    global _sync_active
+    _sync_active = active
+    # Mevcut item cache'lerini yeni moda taşı (kapanınca hemen yenilenir)
+    _cache.set_expiry("items_", None if active else 0, prefix=True)
 
-            def request(self, uri, method='GET', body=None, headers=None, **kwargs):
-                response = self.session.request(method, uri, data=body, headers=headers)
-                return type('Response', (), {
-                    'status': response.status_code,
-                    'reason': response.reason
-                })(), response.content
 
-        _drive_service = build('drive', 'v3', http=RequestsHttpAdapter(authed_session))
-    return _drive_service
+def _items_ttl():
+    return None if _sync_active else NAMESPACE_TTL
 
 
 def get_folder_ids() -> dict:
     """Alt klasör ID'lerini al - cached"""
-    global _folder_ids_cache
-    if _folder_ids_cache is None:
-        service = get_drive_service()
-        results = service.files().list(
-            q=f"'{SHARED_DRIVE_ID}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false",
-            fields="files(id, name)",
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True,
-            corpora="drive",
-            driveId=SHARED_DRIVE_ID
-        ).execute()
-
-        _folder_ids_cache = {}
-        for folder in results.get('files', []):
-            _folder_ids_cache[folder['name']] = folder['id']
-    return _folder_ids_cache
-
-
-def clear_cache():
-    """Cache'i temizle"""
-    global _folder_ids_cache, _cache, _cache_ttl
-    _folder_ids_cache = None
-    _cache = {}
-    _cache_ttl = {}
+    folder_ids = _cache.get("folder_ids")
+    if folder_ids is None:
+        shared = _shared()
+        if shared is not None:
+            folder_ids = _from_shared(shared, "folder_ids")
+    if folder_ids is None:
+        folder_ids = get_storage().list_folders()
+        set_cached("folder_ids", folder_ids)
+    return folder_ids
+
+
+def clear_cache(broadcast: bool = True):
+    """Cache'i temizle (broadcast: paylaşılan katmanı da temizle, diğer worker'lara duyur)"""
+    _bump_generation()
+    _cache.clear()
+    _shared_versions.clear()
+    _bump_versions(*FOLDER_CONFIG, "counts")
+    _notify_cache_listeners("clear")
+    shared = _shared() if broadcast else None
+    if shared is not None:
+        try:
+            shared.clear()
+            shared.publish([CLEAR_ALL])
+        except Exception as e:
+            print(f"Shared cache clear failed: {e}")
 
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
@@ -214,9 +545,10 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
     return frontmatter, body
 
 
-def create_frontmatter(proje: str = None, pinned: bool = False, reminder: str = None, reminder_time: str = "09:00") -> str:
-    """Yeni frontmatter oluştur"""
-    today = datetime.now().strftime("%Y-%m-%d")
+def create_frontmatter(proje: str = None, pinned: bool = False, reminder: str = None, reminder_time: str = "09:00",
+                       created: str = None) -> str:
+    """Yeni frontmatter oluştur (created verilmezse bugün)"""
+    today = created or datetime.now().strftime("%Y-%m-%d")
     proje_str = f'"{proje}"' if proje else "null"
     pinned_str = "true" if pinned else "false"
     reminder_str = f'"{reminder}"' if reminder else "null"
@@ -262,95 +594,327 @@ def generate_summary(content: str, max_chars: int = 260, fallback: str = None) -
     return summary
 
 
-def _fetch_file_content(service, file_info: dict) -> dict:
+# ============================================
+# APP PROPERTIES - Liste görünümü için metadata
+# ============================================
+
+APP_PROPERTIES_VERSION = "1"
+APP_PROPERTY_MAX_BYTES = 124  # Drive limiti: anahtar + değer (UTF-8)
+SUMMARY_CHUNKS = 10  # Özet birden fazla property'ye bölünür
+
+
+def _fit_property(key: str, value: str) -> str:
+    """Değeri Drive'ın property boyut limitine sığacak şekilde kes"""
+    budget = APP_PROPERTY_MAX_BYTES - len(key.encode('utf-8'))
+    encoded = value.encode('utf-8')
+    if len(encoded) <= budget:
+        return value
+    return encoded[:budget].decode('utf-8', errors='ignore')
+
+
+def build_app_properties(title: str, summary: str, proje: str = None, pinned: bool = False,
+                         created: str = None, reminder: str = None, reminder_time: str = "09:00") -> dict:
+    """Frontmatter alanlarını appProperties'e dönüştür (None = property'yi sil)"""
+    props = {
+        "nd_v": APP_PROPERTIES_VERSION,
+        "title": _fit_property("title", title or ""),
+        "proje": _fit_property("proje", proje) if proje else None,
+        "created": created,
+        "pinned": "true" if pinned else "false",
+        "reminder": reminder,
+        "reminder_time": reminder_time,
+    }
+    # Özeti karakter sınırından bölmeden parçala
+    remaining = summary or ""
+    for i in range(SUMMARY_CHUNKS):
+        key = f"summary_{i}"
+        chunk = _fit_property(key, remaining) if remaining else None
+        props[key] = chunk
+        remaining = remaining[len(chunk):] if chunk else ""
+    return props
+
+
+def _app_properties_for_item(item: dict) -> dict:
+    return build_app_properties(
+        item.get("title"), item.get("summary"), item.get("proje"), item.get("pinned", False),
+        item.get("created"), item.get("reminder"), item.get("reminder_time", "09:00")
+    )
+
+
+def _has_app_properties(file_info: dict) -> bool:
+    return (file_info.get('appProperties') or {}).get("nd_v") == APP_PROPERTIES_VERSION
+
+
+def _apply_app_properties(item: dict, file_info: dict) -> dict:
+    """appProperties varsa metadata alanlarını oradan al (frontmatter'dan önceliklidir)"""
+    if not _has_app_properties(file_info):
+        return item
+    props = file_info['appProperties']
+    item["proje"] = props.get("proje")
+    item["created"] = props.get("created")
+    item["pinned"] = props.get("pinned") == "true"
+    item["reminder"] = props.get("reminder")
+    item["reminder_time"] = props.get("reminder_time") or "09:00"
+    return item
+
+
+def _item_from_listing(file_info: dict) -> Item | None:
+    """Sadece listeleme metadata'sından öğe üret (gövde yok); özet yoksa None"""
+    if not _has_app_properties(file_info):
+        return None
+    props = file_info['appProperties']
+    summary = "".join(props.get(f"summary_{i}", "") for i in range(SUMMARY_CHUNKS))
+    if not summary:
+        return None
+    item = Item(
+        id=file_info['id'],
+        filename=file_info['name'],
+        title=props.get("title") or file_info['name'].replace('.md', ''),
+        summary=summary,
+        modified=file_info['modifiedTime'],
+    )
+    return _apply_app_properties(item, file_info)
+
+
+def _metadata_view(item) -> Item:
+    """Liste görünümü: gövde hariç tüm alanlar"""
+    return Item.from_mapping(item).without_content()
+
+
+def _fetch_file_content(file_info: dict) -> Item:
     """Tek dosyanın içeriğini çek ve parse et"""
-    content = service.files().get_media(fileId=file_info['id']).execute().decode('utf-8')
+    content = get_storage().read_file(file_info['id']).decode('utf-8')
+    return _parse_item(file_info, content)
+
+
+def _parse_item(file_info: dict, content: str) -> Item:
+    """Markdown içeriği + dosya metadata'sından öğe üret"""
     frontmatter, body = parse_frontmatter(content)
     title, body_content = parse_body(body, file_info['name'].replace('.md', ''))
-    return {
-        "id": file_info['id'],
-        "filename": file_info['name'],
-        "title": title,
-        "content": body_content,
-        "summary": generate_summary(body_content, fallback=title),
-        "proje": frontmatter.get("proje"),
-        "created": frontmatter.get("created"),
-        "modified": file_info['modifiedTime'],
-        "pinned": frontmatter.get("pinned", False),
-        "reminder": frontmatter.get("reminder"),
-        "reminder_time": frontmatter.get("reminder_time", "09:00"),
-    }
+    item = Item(
+        id=file_info['id'],
+        filename=file_info['name'],
+        title=title,
+        content=body_content,
+        summary=generate_summary(body_content, fallback=title),
+        proje=frontmatter.get("proje"),
+        created=frontmatter.get("created"),
+        modified=file_info['modifiedTime'],
+        pinned=frontmatter.get("pinned", False),
+        reminder=frontmatter.get("reminder"),
+        reminder_time=frontmatter.get("reminder_time", "09:00"),
+    )
+    return _apply_app_properties(item, file_info)
+
+
+def _sort_items(items: list[dict]) -> list[dict]:
+    """Sabitlenmiş öğeler üstte, sonra en son değişen"""
+    items.sort(key=lambda x: x.get("modified") or "", reverse=True)
+    items.sort(key=lambda x: (not x.get("pinned", False)))
+    return items
+
+
+def _apply_listing(item: dict, file_info: dict) -> dict:
+    """Depodaki kayda listelemeden gelen güncel alanları uygula"""
+    item["filename"] = file_info['name']
+    item["modified"] = file_info['modifiedTime']
+    return _apply_app_properties(item, file_info)
 
 
-def _list_all_files(service, folder_id: str, fields: str = "nextPageToken, files(id, name, modifiedTime)") -> list[dict]:
-    """Klasördeki tüm dosyaları pagination ile çek"""
-    all_files = []
-    page_token = None
-    while True:
-        results = service.files().list(
-            q=f"'{folder_id}' in parents and trashed=false",
-            fields=fields,
-            orderBy="modifiedTime desc",
-            pageSize=100,
-            pageToken=page_token,
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True
-        ).execute()
-        all_files.extend(results.get('files', []))
-        page_token = results.get('nextPageToken')
-        if not page_token:
-            break
-    return all_files
+def _track_list_change(folder_type: str, previous: list[dict] | None, items: list[dict]):
+    """Yeniden yüklenen liste öncekinden farklıysa sürümleri artır ve olay yayınla"""
+    if previous is not None and previous == items:
+        return
+    _log_list_change(folder_type, items)
+    _bump_versions(folder_type)
+    if previous is not None:
+        # Arka plan yenilemesi dışarıdan gelen değişiklik buldu
+        publish_event("folder_changed", folder=folder_type)
+    if previous is None or len(previous) != len(items):
+        _bump_versions("counts")
+        if previous is not None:
+            publish_event("counts_changed", counts=None)
 
 
 def get_items(folder_type: str) -> list[dict]:
-    """Google Drive'dan dosyaları çek (cached, paralel fetch)"""
+    """Google Drive'dan dosyaları çek (cached, değişen dosyalar paralel fetch)"""
+    return _cached_or_load(f"items_{folder_type}", lambda: _load_items(folder_type))
+
+
+def _load_items(folder_type: str) -> list[dict]:
+    """Klasörü yükle ve cache'e yaz (get_items single-flight içinden çağrılır)"""
     cache_key = f"items_{folder_type}"
-    cached = get_cached(cache_key)
-    if cached is not None:
-        return cached
+    generation = _cache_generation
+    store = get_content_store()
+
+    # Sunucu yeni başladıysa diskteki son snapshot'ı hemen sun, arka planda doğrula
+    if store and _serve_snapshots and folder_type not in _snapshot_served:
+        _snapshot_served.add(folder_type)
+        snapshot = store.snapshot(folder_type)
+        if snapshot is not None:
+            _sort_items(snapshot)
+            _track_list_change(folder_type, _cache.peek(cache_key), snapshot)
+            set_cached(cache_key, snapshot, _items_ttl())
+            _notify_cache_listeners("folder", folder_type, snapshot)
+            _refresh_executor.submit(_revalidate_snapshot, folder_type)
+            return snapshot
 
-    service = get_drive_service()
     folder_ids = get_folder_ids()
 
     if folder_type not in folder_ids:
         return []
 
     folder_id = folder_ids[folder_type]
-    all_files = _list_all_files(service, folder_id)
+    all_files = get_storage().list_files(folder_id)
+
+    # Sürümü değişmemiş dosyalar depodan, diğerleri Drive'dan
+    known = store.get_many(all_files) if store else {}
+    missing = [f for f in all_files if f['id'] not in known]
+
+    # Değişen içerikleri paralel çek (FETCH_WORKERS thread)
+    fetched = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            futures = {executor.submit(bind(_fetch_file_content), f): f for f in missing}
+            for future in as_completed(futures):
+                item = future.result()
+                fetched[item["id"]] = item
+        if store:
+            store.put_many(folder_type, [(file_version(f), fetched[f['id']]) for f in missing])
+
+    items = [
+        fetched[f['id']] if f['id'] in fetched else _apply_listing(known[f['id']], f)
+        for f in all_files
+    ]
 
-    # İçerikleri paralel çek (5 thread)
-    items = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(_fetch_file_content, service, f): f for f in all_files}
-        for future in as_completed(futures):
-            items.append(future.result())
+    _sort_items(items)
+    # Yükleme sırasında yazma olduysa sonuç eski olabilir: cache'e yazma
+    if generation == _cache_generation:
+        if store:
+            store.set_folder(folder_type, items)
+        _track_list_change(folder_type, _cache.peek(cache_key), items)
+        set_cached(cache_key, items, _items_ttl())
+        _notify_cache_listeners("folder", folder_type, items)
+    return items
 
-    # Sabitlenmiş öğeler üstte
-    items.sort(key=lambda x: (not x.get("pinned", False)))
-    set_cached(cache_key, items)
+
+def enable_snapshot_serving():
+    """Soğuk başlangıçta klasörleri disk snapshot'ından sun (sadece sunucu, main.py lifespan)"""
+    global _serve_snapshots
+    _serve_snapshots = True
+
+
+def _revalidate_snapshot(folder_type: str):
+    """Sunulan snapshot'ı Drive listesiyle karşılaştırıp yenile (değişen dosyalar indirilir)"""
+    cache_key = f"items_{folder_type}"
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+    try:
+        if future is not None:
+            future.result()
+        refresh_items(folder_type)
+    except Exception as e:
+        print(f"Snapshot revalidation failed for {folder_type}: {e}")
+
+
+def get_items_metadata(folder_type: str) -> list[dict]:
+    """Liste/filtre görünümü için öğeler (gövdesiz, tek metadata listeleme çağrısı)"""
+    full = get_cached(f"items_{folder_type}")
+    if full is not None:
+        return [_metadata_view(item) for item in full]
+    return _cached_or_load(f"items_meta_{folder_type}", lambda: _load_items_metadata(folder_type))
+
+
+def _load_items_metadata(folder_type: str) -> list[dict]:
+    cache_key = f"items_meta_{folder_type}"
+    generation = _cache_generation
+    folder_ids = get_folder_ids()
+
+    if folder_type not in folder_ids:
+        return []
+
+    all_files = get_storage().list_files(folder_ids[folder_type])
+    store = get_content_store()
+    known = store.get_many(all_files) if store else {}
+
+    # appProperties'i eksik (henüz backfill edilmemiş) dosyalar için gövde indirilir
+    resolved = {}
+    missing = []
+    for f in all_files:
+        if f['id'] in known:
+            resolved[f['id']] = _metadata_view(_apply_listing(known[f['id']], f))
+        else:
+            item = _item_from_listing(f)
+            if item is None:
+                missing.append(f)
+            else:
+                resolved[f['id']] = item
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            fetched = list(executor.map(bind(_fetch_file_content), missing))
+        if store:
+            store.put_many(folder_type, [(file_version(f), item) for f, item in zip(missing, fetched)])
+        for item in fetched:
+            resolved[item["id"]] = _metadata_view(item)
+
+    items = _sort_items([resolved[f['id']] for f in all_files])
+    if generation == _cache_generation:
+        _track_list_change(folder_type, _cache.peek(cache_key), items)
+        set_cached(cache_key, items, _items_ttl())
+        _notify_cache_listeners("folder_meta", folder_type, items)
     return items
 
 
+def get_item(file_id: str, folder_type: str = None) -> dict:
+    """Tek öğeyi gövdesiyle birlikte getir (not açıldığında, lazy)"""
+    _, cached = _find_cached_item(file_id)
+    if cached is not None and cached.get("content") is not None:
+        return cached
+
+    file_info = get_storage().get_file(file_id)
+
+    store = get_content_store()
+    known = store.get_many([file_info]) if store else {}
+    if file_id in known:
+        return _apply_listing(known[file_id], file_info)
+
+    item = _fetch_file_content(file_info)
+    if store:
+        store.put_many(folder_type, [(file_version(file_info), item)])
+    return item
+
+
+def refresh_items(folder_type: str) -> list[dict]:
+    """Bellek ve disk snapshot'ını atlayarak klasörü Drive'dan yeniden yükle"""
+    cache_key = f"items_{folder_type}"
+    _snapshot_served.add(folder_type)
+    # Eski liste silinmez, sadece süresi doldurulur (sürüm karşılaştırması için)
+    _cache.expire(cache_key)
+    return _single_flight(cache_key, lambda: _load_items(folder_type))
+
+
 def get_item_count(folder_type: str) -> int:
     """Klasördeki dosya sayısını hızlıca al"""
-    service = get_drive_service()
     folder_ids = get_folder_ids()
 
     if folder_type not in folder_ids:
         return 0
 
-    all_files = _list_all_files(service, folder_ids[folder_type], fields="nextPageToken, files(id)")
+    all_files = get_storage().list_files(folder_ids[folder_type], fields="nextPageToken, files(id)")
     return len(all_files)
 
 
 def get_all_counts() -> dict:
     """Tüm klasörlerin sayıları (cached)"""
-    cache_key = "all_counts"
-    cached = get_cached(cache_key)
-    if cached is not None:
-        return cached
+    # Senkronizasyon açıkken sayılar bellekteki listelerden gelir
+    if _sync_active:
+        return {folder_type: len(get_items(folder_type)) for folder_type in FOLDER_CONFIG}
+    return _cached_or_load("all_counts", _load_counts)
+
 
+def _load_counts() -> dict:
+    generation = _cache_generation
     counts = {
         "inbox": get_item_count("inbox"),
         "notlar": get_item_count("notlar"),
@@ -358,22 +922,149 @@ def get_all_counts() -> dict:
         "arsiv": get_item_count("arsiv"),
         "cop_kutusu": get_item_count("cop_kutusu"),
     }
-    set_cached(cache_key, counts)
+    if generation == _cache_generation:
+        previous = _cache.peek("all_counts")
+        if previous != counts:
+            _bump_versions("counts")
+            if previous is not None:
+                publish_event("counts_changed", counts=counts)
+        set_cached("all_counts", counts)
     return counts
 
 
+def matches_proje_filter(item: dict, proje_filter: str) -> bool:
+    """Proje filtresi: "Tümü", "Projesi Yok", "<Şirket> (Tümü)" veya tam proje adı"""
+    if proje_filter == "Tümü":
+        return True
+    elif proje_filter == "Projesi Yok":
+        return not item.get("proje")
+    elif proje_filter.endswith(" (Tümü)"):
+        sirket = proje_filter.replace(" (Tümü)", "")
+        return bool(item.get("proje")) and item.get("proje").startswith(f"{sirket} - ")
+    else:
+        return item.get("proje") == proje_filter
+
+
 def get_items_filtered(folder_type: str, proje_filter: str = "Tümü") -> list[dict]:
     """Projeye göre filtrelenmiş öğeler"""
     items = get_items(folder_type)
     if proje_filter == "Tümü":
         return items
-    elif proje_filter == "Projesi Yok":
-        return [item for item in items if not item.get("proje")]
-    elif proje_filter.endswith(" (Tümü)"):
-        sirket = proje_filter.replace(" (Tümü)", "")
-        return [item for item in items if item.get("proje") and item.get("proje").startswith(f"{sirket} - ")]
+    return [item for item in items if matches_proje_filter(item, proje_filter)]
+
+
+def iter_items_filtered(folder_type: str, proje_filter: str = "Tümü"):
+    """Filtrelenmiş öğeleri kopya liste oluşturmadan tek tek döndür (export)"""
+    for item in get_items(folder_type):
+        if matches_proje_filter(item, proje_filter):
+            yield item
+
+
+# ============================================
+# Sayfalama + alan seçimi (list API)
+# ============================================
+
+ITEM_FIELDS = (
+    "id", "filename", "title", "content", "summary", "proje", "created",
+    "modified", "pinned", "reminder", "reminder_time",
+)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Varsayılan sıra (sort=None): sabitliler üstte, sonra en son değişen.
+# Diğerleri (tarih, id) üzerinden tam sıralamadır; "-" azalan.
+SORT_ORDERS = ("modified", "-modified", "created", "-created")
+
+
+def sort_value(item: dict, sort: str) -> str:
+    return item.get(sort.lstrip("-")) or ""
+
+
+def encode_cursor(item: dict, sort: str = None) -> str:
+    """Sayfanın son öğesinden opak cursor (sıralama anahtarı + id)"""
+    if sort:
+        raw = json.dumps([sort, sort_value(item, sort), item["id"]])
     else:
-        return [item for item in items if item.get("proje") == proje_filter]
+        raw = json.dumps([bool(item.get("pinned")), item.get("modified") or "", item["id"]])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = None) -> tuple:
+    """Cursor'ı çöz; bozuksa veya başka bir sıralamaya aitse ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        first, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Geçersiz cursor") from e
+    if sort:
+        if first != sort:
+            raise ValueError("Geçersiz cursor")
+        return str(value), str(last_id)
+    if isinstance(first, str):
+        raise ValueError("Geçersiz cursor")
+    return bool(first), str(value), str(last_id)
+
+
+def _page_start(items: list[dict], cursor: tuple, sort: str = None) -> int:
+    """Sıralı listede cursor'dan sonraki ilk öğenin indeksi.
+
+    Cursor öğesi silinmiş veya taşınmış olsa da sıralama anahtarına göre
+    devam edilir; sayfalar arasında araya giren yazmalar tekrar/atlama yapmaz.
+    """
+    if sort:
+        last = cursor
+        descending = sort.startswith("-")
+        for i, item in enumerate(items):
+            key = (sort_value(item, sort), item["id"])
+            if (key < last) if descending else (key > last):
+                return i
+        return len(items)
+
+    pinned, modified, last_id = cursor
+    for i, item in enumerate(items):
+        if item["id"] == last_id:
+            return i + 1
+        item_pinned = bool(item.get("pinned"))
+        if item_pinned != pinned:
+            if pinned:
+                # Sabitli bölüm bitti
+                return i
+            continue
+        if (item.get("modified") or "") < modified:
+            return i
+    return len(items)
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """'id,title,summary' → alan listesi (None: tüm alanlar); bilinmeyen alan ValueError"""
+    if not fields:
+        return None
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in ITEM_FIELDS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen alan: {', '.join(unknown)}")
+    return selected if "id" in selected else ("id",) + selected
+
+
+def paginate_items(folder_type: str, items: list[dict], limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                   fields: tuple[str, ...] = None, sort: str = None) -> dict:
+    """Sıralı (filtrelenmiş) listeden cursor tabanlı sayfa: {items, next_cursor, total}.
+
+    Liste gövdesiz olabilir; içerik istenmişse sadece bu sayfadaki
+    öğelerin gövdesi getirilir (cache → depo → Drive).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    start = _page_start(items, decode_cursor(cursor, sort), sort) if cursor else 0
+    page = items[start:start + limit]
+
+    if (fields is None or "content" in fields) and any("content" not in item for item in page):
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            page = list(executor.map(bind(lambda item: get_item(item["id"], folder_type)), page))
+
+    next_cursor = encode_cursor(page[-1], sort) if page and start + limit < len(items) else None
+    if fields is not None:
+        page = [{field: item.get(field) for field in fields} for item in page]
+    return {"items": page, "next_cursor": next_cursor, "total": len(items)}
 
 
 def _sanitize_title(title: str) -> str:
@@ -382,17 +1073,152 @@ def _sanitize_title(title: str) -> str:
     return title.replace('\n', ' ').replace('\r', ' ').strip()
 
 
-def _invalidate_items_cache():
-    """Yazma işlemlerinden sonra item cache'lerini temizle"""
-    keys_to_remove = [k for k in _cache if k.startswith("items_") or k == "all_counts"]
-    for k in keys_to_remove:
-        _cache.pop(k, None)
-        _cache_ttl.pop(k, None)
+def _find_cached_item(file_id: str, include_meta: bool = False) -> tuple[str | None, dict | None]:
+    """Bellekteki klasör listelerinde öğeyi bul: (folder_type, item).
+
+    include_meta=True ise gövdesiz (items_meta_*) listelere de bakılır.
+    """
+    prefixes = ("items_", "items_meta_") if include_meta else ("items_",)
+    for prefix in prefixes:
+        for folder_type in FOLDER_CONFIG:
+            for item in _cache.peek(f"{prefix}{folder_type}") or []:
+                if item["id"] == file_id:
+                    return folder_type, item
+    return None, None
+
+
+def _patch_cached_lists(file_id: str, folder_type: str | None, item: dict | None,
+                        from_folder: str | None, is_new: bool = False) -> str | None:
+    """Klasör listelerini yerinde güncelle: öğeyi çıkar, varsa hedef klasöre ekle.
+
+    Tam (items_*) ve metadata (items_meta_*) listeleri birlikte güncellenir,
+    sayılar kaynak/hedef klasöre göre ayarlanır. Bulunduğu klasörü döndürür.
+    """
+    source = None
+    patched, dropped = {}, set()  # paylaşılan katmana yazılacaklar
+    with _cache_lock:
+        for ft in FOLDER_CONFIG:
+            for key, entry in ((f"items_{ft}", item), (f"items_meta_{ft}", _metadata_view(item) if item else None)):
+                items = _cache.peek(key)
+                if items is None:
+                    continue
+                # Okuyan istekler etkilenmesin diye liste kopyalanarak değiştirilir
+                updated = [i for i in items if i["id"] != file_id]
+                if len(updated) != len(items):
+                    source = ft
+                if ft == folder_type and entry is not None:
+                    if key.startswith("items_meta_") or "content" in entry:
+                        updated.append(entry)
+                        _sort_items(updated)
+                    else:
+                        # Gövdesiz öğe tam listeye konamaz: liste yeniden yüklensin
+                        _cache.pop(key)
+                        dropped.add(key)
+                        continue
+                elif len(updated) == len(items):
+                    continue
+                _cache.replace(key, updated)
+                patched[key] = (updated, [entry] if ft == folder_type and entry is not None else [])
+
+        source = source or from_folder
+        if source is None and folder_type is None:
+            # Hiçbir listede olmayan öğenin silinmesi: cache ve istemciler etkilenmez
+            return None
+        _bump_versions(source, folder_type)
+        if source != folder_type:
+            _bump_versions("counts")
+        if item is not None and folder_type is not None:
+            _notify_cache_listeners("upsert", folder_type, item)
+        else:
+            _notify_cache_listeners("remove", source, file_id)
+        counts = _cache.peek("all_counts")
+        if counts is not None:
+            if source is None and not is_new:
+                # Kaynağı bilinmiyor (ör. senkronizasyondan gelen değişiklik): sayıları yeniden hesapla
+                _cache.pop("all_counts")
+                dropped.add("all_counts")
+            elif source != folder_type:
+                counts = dict(counts)
+                if source in counts:
+                    counts[source] = max(0, counts[source] - 1)
+                if folder_type in counts:
+                    counts[folder_type] += 1
+                _cache.replace("all_counts", counts)
+                patched["all_counts"] = (counts, None)
+        _bump_generation()
+        _log_item_change(file_id, folder_type, item)
+        _publish_item_change(file_id, folder_type, item, source, is_new)
+    _share_patches(patched, dropped)
+    return source
+
+
+def _known_counts() -> dict | None:
+    """Drive'a gitmeden bilinen sayılar (listeler veya sayı cache'inden), yoksa None"""
+    lists = {ft: _cache.peek(f"items_{ft}") for ft in FOLDER_CONFIG}
+    if all(items is not None for items in lists.values()):
+        return {ft: len(items) for ft, items in lists.items()}
+    return _cache.peek("all_counts")
+
+
+def _publish_item_change(file_id: str, folder_type: str | None, item: dict | None,
+                         source: str | None, is_new: bool):
+    """Yama sonucunu SSE olayı olarak yayınla (öğe gövdesiz gönderilir)"""
+    if item is None or folder_type is None:
+        publish_event("item_deleted", id=file_id, folder=source)
+    elif is_new or source is None:
+        publish_event("item_created", folder=folder_type, item=_metadata_view(item))
+    elif source != folder_type:
+        publish_event("item_moved", from_folder=source, folder=folder_type, item=_metadata_view(item))
+    else:
+        publish_event("item_updated", folder=folder_type, item=_metadata_view(item))
+    if source != folder_type:
+        publish_event("counts_changed", counts=_known_counts())
+
+
+def _cache_upsert_item(folder_type: str, item: dict, from_folder: str = None, is_new: bool = False):
+    """Öğeyi klasör listesine ekle/güncelle, diğer klasörlerden çıkar"""
+    _patch_cached_lists(item["id"], folder_type, item, from_folder, is_new)
+
+
+def _cache_remove_item(file_id: str, from_folder: str = None) -> str | None:
+    """Öğeyi tüm klasör listelerinden çıkar, bulunduğu klasörü döndür"""
+    return _patch_cached_lists(file_id, None, None, from_folder)
+
+
+def _invalidate_folder(folder_type: str, broadcast: bool = True):
+    """Tek klasörün listelerini düşür (öğe verisi elde yoksa)"""
+    keys = {f"items_{folder_type}", f"items_meta_{folder_type}"}
+    with _cache_lock:
+        for key in keys:
+            _cache.pop(key)
+        _bump_generation()
+        _bump_versions(folder_type, "counts")
+        _notify_cache_listeners("invalidate", folder_type)
+        publish_event("folder_changed", folder=folder_type)
+    if broadcast:
+        _share_patches({}, keys)
+
+
+def invalidate_folder(folder_type: str):
+    """Tek klasörü Drive'dan yeniden yüklenmeye zorla (/api/refresh?folder=...)"""
+    _snapshot_served.add(folder_type)
+    # Klasörün sayısı da değişmiş olabilir; diğer klasörlerin listeleri kalır
+    _cache.pop("all_counts")
+    _invalidate_folder(folder_type, broadcast=False)
+    _share_patches({}, {f"items_{folder_type}", f"items_meta_{folder_type}", "all_counts"})
+
+
+def _write_through(folder_type: str, file_info: dict, md_content: str, from_folder: str = None, is_new: bool = False):
+    """Yazılan içeriği tekrar indirmeden cache'lere ve kalıcı depoya işle"""
+    item = _parse_item(file_info, md_content)
+    store = get_content_store()
+    if store:
+        store.put_many(folder_type, [(file_version(file_info), item)])
+    _cache_upsert_item(folder_type, item, from_folder=from_folder, is_new=is_new)
 
 
 def save_file(title: str, content: str, folder_type: str, proje: str = None, file_id: str = None, pinned: bool = False, reminder: str = None, reminder_time: str = "09:00"):
     """Dosya kaydet veya güncelle"""
-    service = get_drive_service()
     folder_ids = get_folder_ids()
 
     title = _sanitize_title(title)
@@ -401,18 +1227,22 @@ def save_file(title: str, content: str, folder_type: str, proje: str = None, fil
     # Görevler klasörüne eklenen öğeler otomatik olarak günlük hatırlatıcı alır
     if folder_type == "gorevler" and reminder is None and file_id is None:
         reminder = "daily"
-    frontmatter = create_frontmatter(proje, pinned, reminder, reminder_time)
+    # Mevcut notun oluşturulma tarihi korunur (cache / metadata'dan, gövde indirmeden)
+    created = _lookup_item(file_id, folder_type).get("created") if file_id else None
+    created = created or datetime.now().strftime("%Y-%m-%d")
+    frontmatter = create_frontmatter(proje, pinned, reminder, reminder_time, created)
     md_content = f"{frontmatter}\n\n# {title}\n\n{content}"
 
-    media = MediaInMemoryUpload(md_content.encode('utf-8'), mimetype='text/markdown')
+    # Liste görünümü gövde indirmeden çalışsın diye frontmatter appProperties'e de yazılır
+    app_properties = build_app_properties(
+        title, generate_summary(content.strip(), fallback=title), proje, pinned,
+        created, reminder, reminder_time
+    )
 
+    storage = get_storage()
     if file_id:
-        service.files().update(
-            fileId=file_id,
-            media_body=media,
-            supportsAllDrives=True
-        ).execute()
-        _invalidate_items_cache()
+        result = storage.update_file(file_id, content=md_content.encode('utf-8'), app_properties=app_properties)
+        _write_through(folder_type, result, md_content, from_folder=folder_type)
         return file_id
     else:
         date_prefix = datetime.now().strftime("%Y-%m-%d")
@@ -420,17 +1250,8 @@ def save_file(title: str, content: str, folder_type: str, proje: str = None, fil
         safe_title = safe_title[:50].strip().replace(" ", "-").lower()
         filename = f"{date_prefix}-{safe_title}.md"
 
-        file_metadata = {
-            'name': filename,
-            'parents': [folder_ids[folder_type]],
-            'mimeType': 'text/markdown'
-        }
-        result = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            supportsAllDrives=True
-        ).execute()
-        _invalidate_items_cache()
+        result = storage.create_file(folder_ids[folder_type], filename, md_content.encode('utf-8'), app_properties)
+        _write_through(folder_type, result, md_content, is_new=True)
 
         # Yeni görev oluşturulduğunda macOS Anımsatıcılar'a otomatik ekle
         if is_new_task and _reminders_available:
@@ -446,7 +1267,6 @@ def save_file(title: str, content: str, folder_type: str, proje: str = None, fil
 
 def move_file(file_id: str, from_folder: str, to_folder: str):
     """Dosyayı klasörler arası taşı"""
-    service = get_drive_service()
     folder_ids = get_folder_ids()
 
     # Anımsatıcı işlemleri için dosya bilgilerini al
@@ -456,22 +1276,27 @@ def move_file(file_id: str, from_folder: str, to_folder: str):
 
     if _reminders_available and (from_folder == "gorevler" or to_folder == "gorevler"):
         try:
-            frontmatter, title, content = get_file_parsed(file_id)
-            proje = frontmatter.get("proje")
+            item = _lookup_item(file_id, from_folder)
+            proje = item.get("proje")
             proje_info = f" [{proje}]" if proje else ""
-            reminder_title = f"{title}{proje_info}"
-            file_content = content
-            file_reminder_time = frontmatter.get("reminder_time", "09:00")
+            reminder_title = f"{item['title']}{proje_info}"
+            file_content = item.get("content") or item.get("summary")
+            file_reminder_time = item.get("reminder_time") or "09:00"
         except Exception:
             pass
 
-    service.files().update(
-        fileId=file_id,
-        addParents=folder_ids[to_folder],
-        removeParents=folder_ids[from_folder],
-        supportsAllDrives=True
-    ).execute()
-    _invalidate_items_cache()
+    result = get_storage().move_file(file_id, folder_ids[from_folder], folder_ids[to_folder])
+
+    # Öğeyi kaynak listeden hedef listeye taşı (içerik değişmedi)
+    _, cached_item = _find_cached_item(file_id)
+    if cached_item is not None:
+        _cache_upsert_item(to_folder, _apply_listing(dict(cached_item), result), from_folder=from_folder)
+    else:
+        _cache_remove_item(file_id, from_folder=from_folder)
+        _invalidate_folder(to_folder)
+    store = get_content_store()
+    if store:
+        store.set_item_folder(file_id, to_folder)
 
     # Anımsatıcı işlemleri
     if _reminders_available and reminder_title:
@@ -491,112 +1316,162 @@ def move_file(file_id: str, from_folder: str, to_folder: str):
 
 def delete_file(file_id: str, folder_type: str):
     """Dosyayı çöp kutusuna taşı veya kalıcı sil"""
-    service = get_drive_service()
-
     # Görev siliniyorsa Anımsatıcıdan da sil
     if folder_type == "gorevler" and _reminders_available:
         try:
-            frontmatter, title, _ = get_file_parsed(file_id)
-            proje = frontmatter.get("proje")
+            item = _lookup_item(file_id, folder_type)
+            proje = item.get("proje")
             proje_info = f" [{proje}]" if proje else ""
-            delete_reminder(f"{title}{proje_info}")
+            delete_reminder(f"{item['title']}{proje_info}")
         except Exception:
             pass
 
     if folder_type == "cop_kutusu":
-        service.files().delete(fileId=file_id, supportsAllDrives=True).execute()
-        _invalidate_items_cache()
+        get_storage().delete_file(file_id)
+        _cache_remove_item(file_id, from_folder=folder_type)
+        store = get_content_store()
+        if store:
+            store.set_item_folder(file_id, None)
     else:
         move_file(file_id, folder_type, "cop_kutusu")
 
 
 def get_file_parsed(file_id: str) -> tuple[dict, str, str]:
     """Dosyayı oku ve parse et: (frontmatter, title, body_content)"""
-    service = get_drive_service()
-    content = service.files().get_media(fileId=file_id).execute().decode('utf-8')
+    content = get_storage().read_file(file_id).decode('utf-8')
     frontmatter, body = parse_frontmatter(content)
     title, body_content = parse_body(body)
     return frontmatter, title, body_content
 
 
+def _lookup_item(file_id: str, folder_type: str = None) -> dict:
+    """Öğeyi mümkünse indirmeden bul: bellek → metadata listesi → Drive metadata → gövde"""
+    _, item = _find_cached_item(file_id)
+    if item is not None:
+        return item
+    for ft in FOLDER_CONFIG:
+        for meta_item in _cache.peek(f"items_meta_{ft}") or []:
+            if meta_item["id"] == file_id:
+                return meta_item
+
+    file_info = get_storage().get_file(file_id)
+    store = get_content_store()
+    known = store.get_many([file_info]) if store else {}
+    if file_id in known:
+        return _apply_listing(known[file_id], file_info)
+    item = _item_from_listing(file_info)
+    if item is not None:
+        return item
+
+    # appProperties yok (backfill edilmemiş): gövdeyi indirmek zorunlu
+    item = _fetch_file_content(file_info)
+    if store:
+        store.put_many(folder_type, [(file_version(file_info), item)])
+    return item
+
+
+def _update_item_properties(file_id: str, folder_type: str, item: dict = None, **changes) -> dict:
+    """Metadata değişikliği (pin / proje), cache'i yamala.
+
+    Drive'da sadece appProperties güncellenir (medya transferi yok); dosyadaki
+    frontmatter bir sonraki tam kayıtta (save_file) yeniden yazılır. Dosyaların
+    asıl kaynak olduğu backend'de (local) frontmatter hemen yeniden yazılır.
+    """
+    storage = get_storage()
+    item = item or _lookup_item(file_id, folder_type)
+    if storage.files_are_source:
+        if item.get("content") is None:
+            item = get_item(file_id, folder_type)
+        item = Item.from_mapping(item).replace(**changes)
+        frontmatter = create_frontmatter(
+            item.get("proje"), item.get("pinned", False), item.get("reminder"),
+            item.get("reminder_time") or "09:00", item.get("created")
+        )
+        md_content = f"{frontmatter}\n\n# {item['title']}\n\n{item.get('content') or ''}"
+        result = storage.update_file(
+            file_id, content=md_content.encode('utf-8'), app_properties=_app_properties_for_item(item)
+        )
+        _write_through(folder_type, result, md_content, from_folder=folder_type)
+        return item
+
+    item = Item.from_mapping(item).replace(**changes)
+    result = storage.update_file(file_id, app_properties=_app_properties_for_item(item))
+    item = _apply_listing(item, result)
+
+    if "content" in item:
+        # Gövde değişmedi: kalıcı depodaki kayıt aynı sürümle güncellenir
+        store = get_content_store()
+        if store:
+            store.put_many(folder_type, [(file_version(result), item)])
+    _cache_upsert_item(folder_type, item, from_folder=folder_type)
+    return item
+
+
 def update_proje(file_id: str, folder_type: str, proje: str):
-    """Dosyanın projesini güncelle"""
-    frontmatter, title, body_content = get_file_parsed(file_id)
-    save_file(title, body_content, folder_type, proje, file_id, frontmatter.get("pinned", False), frontmatter.get("reminder"), frontmatter.get("reminder_time", "09:00"))
+    """Dosyanın projesini güncelle (metadata; local backend'de frontmatter da)"""
+    _update_item_properties(file_id, folder_type, proje=proje or None)
 
 
 def toggle_pin(file_id: str, folder_type: str) -> bool:
-    """Dosyanın sabitleme durumunu değiştir, yeni durumu döndür"""
-    frontmatter, title, body_content = get_file_parsed(file_id)
-    new_pinned = not frontmatter.get("pinned", False)
-    save_file(title, body_content, folder_type, frontmatter.get("proje"), file_id, new_pinned, frontmatter.get("reminder"), frontmatter.get("reminder_time", "09:00"))
+    """Dosyanın sabitleme durumunu değiştir, yeni durumu döndür (metadata; local backend'de frontmatter da)"""
+    item = _lookup_item(file_id, folder_type)
+    new_pinned = not item.get("pinned", False)
+    _update_item_properties(file_id, folder_type, item, pinned=new_pinned)
     return new_pinned
 
 
+def backfill_app_properties(folder_types: list[str] = None) -> dict:
+    """appProperties'i olmayan mevcut notları geriye dönük doldur (sadece metadata güncellemesi)"""
+    storage = get_storage()
+    folder_ids = get_folder_ids()
+    store = get_content_store()
+    result = {"updated": 0, "skipped": 0, "failed": 0}
+
+    for folder_type in folder_types or FOLDER_CONFIG:
+        if folder_type not in folder_ids:
+            continue
+        all_files = storage.list_files(folder_ids[folder_type])
+        todo = [f for f in all_files if not _has_app_properties(f)]
+        result["skipped"] += len(all_files) - len(todo)
+        known = store.get_many(todo) if store else {}
+
+        def process(file_info: dict):
+            item = known.get(file_info['id']) or _fetch_file_content(file_info)
+            storage.update_file(
+                file_info['id'],
+                app_properties=_app_properties_for_item(item),
+                # modifiedTime korunur, yoksa tüm notlar backfill anına sıralanır
+                modified_time=file_info['modifiedTime']
+            )
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            futures = [executor.submit(bind(process), f) for f in todo]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    result["updated"] += 1
+                except Exception as e:
+                    print(f"appProperties backfill failed: {e}")
+                    result["failed"] += 1
+
+    return result
+
+
 def get_or_create_folder(folder_name: str) -> str:
     """Klasörü al veya oluştur (export, logs vb.)"""
-    service = get_drive_service()
     folder_ids = get_folder_ids()
 
     if folder_name in folder_ids:
         return folder_ids[folder_name]
 
-    file_metadata = {
-        'name': folder_name,
-        'mimeType': 'application/vnd.google-apps.folder',
-        'parents': [SHARED_DRIVE_ID]
-    }
-    folder = service.files().create(
-        body=file_metadata,
-        supportsAllDrives=True,
-        fields='id'
-    ).execute()
+    folder_id = get_storage().create_folder(folder_name)
 
     # Cache güncelle
-    global _folder_ids_cache
-    if _folder_ids_cache:
-        _folder_ids_cache[folder_name] = folder.get('id')
-
-    return folder.get('id')
-
-
-def export_items(items: list[dict], export_name: str) -> str:
-    """Öğeleri tek bir markdown dosyasına export et"""
-    service = get_drive_service()
-    export_folder_id = get_or_create_folder("export")
-
-    today = datetime.now().strftime("%Y-%m-%d %H:%M")
-    content_lines = [f"# Export: {export_name}", f"Tarih: {today}", f"Toplam: {len(items)} öğe", "", "---", ""]
-
-    for item in items:
-        pinned_mark = "📌 " if item.get('pinned') else ""
-        proje_mark = f" 📁 {item.get('proje')}" if item.get('proje') else ""
-        content_lines.append(f"## {pinned_mark}{item['title']}{proje_mark}")
-        content_lines.append("")
-        if item.get('content'):
-            content_lines.append(item['content'])
-            content_lines.append("")
-        content_lines.append("---")
-        content_lines.append("")
-
-    md_content = "\n".join(content_lines)
-
-    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in export_name)
-    filename = f"export-{datetime.now().strftime('%Y%m%d-%H%M')}-{safe_name[:30]}.md"
-
-    media = MediaInMemoryUpload(md_content.encode('utf-8'), mimetype='text/markdown')
-    file_metadata = {
-        'name': filename,
-        'parents': [export_folder_id],
-        'mimeType': 'text/markdown'
-    }
-    service.files().create(
-        body=file_metadata,
-        media_body=media,
-        supportsAllDrives=True
-    ).execute()
+    folder_ids = _cache.peek("folder_ids")
+    if folder_ids:
+        _cache.replace("folder_ids", {**folder_ids, folder_name: folder_id})
 
-    return filename
+    return folder_id
 
 
 def get_sirket_options() -> list[str]:
@@ -630,70 +1505,206 @@ def get_companies_with_counts() -> list[dict]:
 # ============================================
 # ERROR LOGGING - Google Drive'a kaydet
 # ============================================
+# Hatalar bellekte kuyruğa alınır, arka plan thread'i toplu halde yazar.
+# Aynı hata tekrarlanırsa tek kayıt + sayı olarak yazılır; Drive'a
+# ulaşılamazsa kayıtlar yerel spool dosyasında bekler.
 
-def log_error(error_type: str, message: str, details: dict = None):
-    """Hatayı Drive'daki logs klasörüne kaydet"""
-    try:
-        service = get_drive_service()
-        logs_folder_id = get_or_create_folder("logs")
+ERROR_LOG_QUEUE_SIZE = 1000
+ERROR_LOG_FLUSH_INTERVAL = 30  # seconds
+ERROR_LOG_BATCH_SIZE = 50  # bu kadar kayıt birikince beklemeden yaz
+ERROR_LOG_MAX_FILE_BYTES = 256 * 1024  # aşılınca aynı gün için yeni parça dosya
+ERROR_LOG_SPOOL_PATH = os.environ.get("ERROR_LOG_SPOOL_PATH", os.path.join(".cache", "error-log-spool.md"))
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        date_str = datetime.now().strftime("%Y-%m-%d")
 
-        log_entry = f"""## {timestamp} - {error_type}
+def _format_log_entry(entry: dict) -> str:
+    """Tek (birleştirilmiş) hata kaydını markdown'a çevir"""
+    log_entry = f"""## {entry['timestamp']} - {entry['error_type']}
 
-**Message:** {message}
+**Message:** {entry['message']}
 
 """
-        if details:
-            log_entry += "**Details:**\n```json\n"
-            log_entry += json.dumps(details, indent=2, ensure_ascii=False)
-            log_entry += "\n```\n"
-
-        log_entry += "\n---\n\n"
-
-        # Bugünün log dosyasını bul veya oluştur
-        filename = f"error-log-{date_str}.md"
-
-        # Mevcut dosyayı ara
-        results = service.files().list(
-            q=f"'{logs_folder_id}' in parents and name='{filename}' and trashed=false",
-            fields="files(id)",
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True
-        ).execute()
-
-        files = results.get('files', [])
-
-        if files:
-            # Mevcut dosyaya ekle
-            file_id = files[0]['id']
-            existing_content = service.files().get_media(fileId=file_id).execute().decode('utf-8')
-            new_content = existing_content + log_entry
-            media = MediaInMemoryUpload(new_content.encode('utf-8'), mimetype='text/markdown')
-            service.files().update(
-                fileId=file_id,
-                media_body=media,
-                supportsAllDrives=True
-            ).execute()
+    if entry['count'] > 1:
+        log_entry += f"**Count:** {entry['count']} (son: {entry['last_timestamp']})\n\n"
+    if entry['details']:
+        log_entry += "**Details:**\n```json\n"
+        log_entry += json.dumps(entry['details'], indent=2, ensure_ascii=False)
+        log_entry += "\n```\n"
+
+    log_entry += "\n---\n\n"
+    return log_entry
+
+
+def _collapse_log_entries(entries: list[dict]) -> list[dict]:
+    """Aynı tip + mesajlı hataları tek kayıtta topla"""
+    collapsed = {}
+    for entry in entries:
+        key = (entry['error_type'], entry['message'])
+        if key in collapsed:
+            collapsed[key]['count'] += 1
+            collapsed[key]['last_timestamp'] = entry['timestamp']
         else:
-            # Yeni dosya oluştur
-            header = f"# Error Log - {date_str}\n\n"
-            content = header + log_entry
-            media = MediaInMemoryUpload(content.encode('utf-8'), mimetype='text/markdown')
-            file_metadata = {
-                'name': filename,
-                'parents': [logs_folder_id],
-                'mimeType': 'text/markdown'
-            }
-            service.files().create(
-                body=file_metadata,
-                media_body=media,
-                supportsAllDrives=True
-            ).execute()
+            collapsed[key] = dict(entry, count=1, last_timestamp=entry['timestamp'])
+    return list(collapsed.values())
+
+
+class _ErrorLogSink:
+    """Sınırlı kuyruk + arka plan flusher"""
 
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=ERROR_LOG_QUEUE_SIZE)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._log_file = None  # (date_str, file_id, filename, content)
+        self.dropped = 0
+
+    def submit(self, entry: dict) -> bool:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        if self._queue.qsize() >= ERROR_LOG_BATCH_SIZE:
+            self._wake.set()
         return True
-    except Exception as e:
-        # Log yazarken hata olursa sessizce geç
-        print(f"Error logging failed: {e}")
-        return False
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="error-log-flusher", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(ERROR_LOG_FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    def shutdown(self, timeout: float = 10):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def flush(self) -> bool:
+        """Kuyruktaki ve spool'daki kayıtları Drive'a yaz"""
+        with self._flush_lock:
+            entries = []
+            while True:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            text = "".join(_format_log_entry(e) for e in _collapse_log_entries(entries))
+            if self.dropped:
+                text += f"## {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - ErrorLogOverflow\n\n" \
+                        f"**Message:** {self.dropped} kayıt kuyruk dolu olduğu için atıldı\n\n---\n\n"
+                self.dropped = 0
+
+            spooled = self._read_spool()
+            if not text and not spooled:
+                return True
+            try:
+                self._append_to_drive(spooled + text)
+                self._clear_spool()
+                return True
+            except Exception as e:
+                print(f"Error logging failed, spooled locally: {e}")
+                self._spool(text)
+                return False
+
+    def _append_to_drive(self, text: str):
+        storage = get_storage()
+        logs_folder_id = get_or_create_folder("logs")
+        date_str = datetime.now().strftime("%Y-%m-%d")
+
+        if self._log_file is None or self._log_file[0] != date_str:
+            self._log_file = self._find_today_log(logs_folder_id, date_str)
+
+        _, file_id, filename, content = self._log_file
+        if file_id and len(content.encode('utf-8')) + len(text.encode('utf-8')) > ERROR_LOG_MAX_FILE_BYTES:
+            # Dosya büyüdü: aynı gün için yeni parça başlat
+            part = int(filename.rsplit('-part', 1)[1].split('.')[0]) + 1 if '-part' in filename else 2
+            filename = f"error-log-{date_str}-part{part}.md"
+            file_id = None
+
+        if file_id:
+            new_content = content + text
+            storage.update_file(file_id, content=new_content.encode('utf-8'), fields='id')
+        else:
+            new_content = f"# Error Log - {date_str}\n\n" + text
+            file_id = storage.create_file(logs_folder_id, filename, new_content.encode('utf-8'), fields='id')['id']
+
+        # Son içerik bellekte tutulur, sonraki flush'ta tekrar indirilmez
+        self._log_file = (date_str, file_id, filename, new_content)
+
+    def _find_today_log(self, logs_folder_id: str, date_str: str) -> tuple:
+        """Bugünün son log parçasını bul (process başına bir kez indirilir)"""
+        storage = get_storage()
+        files = sorted(
+            storage.list_files(logs_folder_id, fields="nextPageToken, files(id, name)",
+                               name_contains=f"error-log-{date_str}"),
+            key=lambda f: int(f['name'].rsplit('-part', 1)[1].split('.')[0]) if '-part' in f['name'] else 1
+        )
+        if not files:
+            return (date_str, None, f"error-log-{date_str}.md", "")
+        latest = files[-1]
+        content = storage.read_file(latest['id']).decode('utf-8')
+        return (date_str, latest['id'], latest['name'], content)
+
+    def _read_spool(self) -> str:
+        if not ERROR_LOG_SPOOL_PATH or not os.path.exists(ERROR_LOG_SPOOL_PATH):
+            return ""
+        try:
+            with open(ERROR_LOG_SPOOL_PATH, encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def _spool(self, text: str):
+        if not ERROR_LOG_SPOOL_PATH or not text:
+            return
+        try:
+            directory = os.path.dirname(ERROR_LOG_SPOOL_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(ERROR_LOG_SPOOL_PATH, 'a', encoding='utf-8') as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Error log spool failed: {e}")
+
+    def _clear_spool(self):
+        if ERROR_LOG_SPOOL_PATH and os.path.exists(ERROR_LOG_SPOOL_PATH):
+            try:
+                os.remove(ERROR_LOG_SPOOL_PATH)
+            except OSError:
+                pass
+
+
+_error_log_sink = _ErrorLogSink()
+
+
+def log_error(error_type: str, message: str, details: dict = None) -> bool:
+    """Hatayı kuyruğa al (bloklamaz); arka planda Drive'daki logs klasörüne yazılır"""
+    return _error_log_sink.submit({
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "error_type": error_type,
+        "message": message,
+        "details": details,
+    })
+
+
+def flush_error_log() -> bool:
+    """Bekleyen hata kayıtlarını hemen yaz"""
+    return _error_log_sink.flush()
+
+
+def shutdown_error_log():
+    """Flusher'ı durdur ve kalan kayıtları yaz (lifespan shutdown)"""
+    _error_log_sink.shutdown()
@@ -0,0 +1,110 @@
+"""
+Async Drive Erişim Katmanı
+googleapiclient senkron çalıştığı için Drive çağrıları paylaşılan ve
+sınırlı bir thread havuzunda yürütülür; event loop hiçbir Drive veya
+osascript çağrısında bloklanmaz. Senkron API (services.drive) aynen
+kalır, scriptler (daily_reminders.sh) onu kullanmaya devam eder.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from services import drive, export, indexes, search as search_index
+from services.metrics import register_executor
+from services.profiling import bind
+
+# Aynı anda en fazla bu kadar Drive işlemi (fazlası kuyrukta bekler)
+DRIVE_CONCURRENCY = int(os.environ.get("DRIVE_CONCURRENCY", "8"))
+
+_executor = ThreadPoolExecutor(max_workers=DRIVE_CONCURRENCY, thread_name_prefix="drive-io")
+register_executor("drive-io", _executor)
+
+
+async def run_sync(func, *args, **kwargs):
+    """Senkron fonksiyonu Drive thread havuzunda çalıştır ve sonucu bekle"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(bind(func), *args, **kwargs))
+
+
+async def get_items(folder_type: str) -> list[dict]:
+    # Cache'teyse thread'e geçmeden dön
+    cached = drive.get_cached(f"items_{folder_type}")
+    if cached is not None:
+        return cached
+    return await run_sync(drive.get_items, folder_type)
+
+
+async def get_items_filtered(folder_type: str, proje_filter: str = "Tümü", **filters) -> list[dict]:
+    return await run_sync(indexes.query_items, folder_type, proje_filter, **filters)
+
+
+async def get_items_page(folder_type: str, proje_filter: str = "Tümü", limit: int = drive.DEFAULT_PAGE_SIZE,
+                         cursor: str = None, fields: tuple[str, ...] = None, **filters) -> dict:
+    return await run_sync(indexes.query_page, folder_type, proje_filter, limit, cursor, fields, **filters)
+
+
+async def get_delta(since: str = None) -> dict:
+    return await run_sync(drive.get_delta, since)
+
+
+async def get_all_counts() -> dict:
+    cached = drive.get_cached("all_counts")
+    if cached is not None:
+        return cached
+    return await run_sync(drive.get_all_counts)
+
+
+async def get_item(file_id: str, folder_type: str = None) -> dict:
+    return await run_sync(drive.get_item, file_id, folder_type)
+
+
+async def save_file(*args, **kwargs):
+    return await run_sync(drive.save_file, *args, **kwargs)
+
+
+async def move_file(file_id: str, from_folder: str, to_folder: str):
+    return await run_sync(drive.move_file, file_id, from_folder, to_folder)
+
+
+async def delete_file(file_id: str, folder_type: str):
+    return await run_sync(drive.delete_file, file_id, folder_type)
+
+
+async def update_proje(file_id: str, folder_type: str, proje: str):
+    return await run_sync(drive.update_proje, file_id, folder_type, proje)
+
+
+async def toggle_pin(file_id: str, folder_type: str) -> bool:
+    return await run_sync(drive.toggle_pin, file_id, folder_type)
+
+
+async def upload_export(folder_type: str, proje_filter: str, export_name: str, fmt: str = "md") -> str:
+    items = drive.iter_items_filtered(folder_type, proje_filter)
+    return await run_sync(export.upload_export, items, export_name, fmt)
+
+
+async def iter_export(folder_type: str, proje_filter: str, export_name: str, fmt: str = "md"):
+    """Export parçalarını async üret; her parça Drive thread havuzunda hazırlanır"""
+    chunks = await run_sync(
+        lambda: export.iter_export(drive.iter_items_filtered(folder_type, proje_filter), export_name, fmt)
+    )
+    while True:
+        chunk = await run_sync(next, chunks, None)
+        if chunk is None:
+            break
+        if chunk:
+            yield chunk
+
+
+async def backfill_app_properties(folder_types: list[str] = None) -> dict:
+    return await run_sync(drive.backfill_app_properties, folder_types)
+
+
+async def search(query: str, folder: str = None, proje: str = None, limit: int = 20) -> dict:
+    # Tüm klasörler indeksliyse thread'e geçmeden ara
+    index = search_index.get_search_index()
+    missing = index.missing_folders()
+    if not missing or (folder and folder not in missing):
+        return search_index.search(query, folder, proje, limit)
+    return await run_sync(search_index.search, query, folder, proje, limit)
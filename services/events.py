@@ -0,0 +1,150 @@
+"""
+Değişiklik Akışı (Server-Sent Events)
+Drive yazma yolları ve arka plan yenilemeleri ince taneli olaylar
+yayınlar; bağlı istemcilere /api/events üzerinden iletilir. Son olaylar
+sınırlı bir halka tamponda tutulur, yeniden bağlanan istemci
+Last-Event-ID'den sonrasını alır.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from services.item import json_default
+
+EVENT_BUFFER_SIZE = 500  # replay için tutulan son olay sayısı
+HEARTBEAT_INTERVAL = 15  # seconds
+SUBSCRIBER_QUEUE_SIZE = 1000  # yavaş istemci bu kadar geride kalırsa bağlantısı kesilir
+MAX_SSE_CLIENTS = int(os.environ.get("SSE_MAX_CLIENTS", "50"))
+
+# Olay id'leri "<epoch>-<sıra>": restart sonrası eski id'ler tanınır
+EVENT_EPOCH = f"{int(time.time()):x}"
+
+
+class TooManyClients(Exception):
+    pass
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def _put(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBus:
+    """Thread'lerden yayın, event loop'taki abonelere teslim"""
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE, max_clients: int = MAX_SSE_CLIENTS):
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._subscribers = set()
+        self.max_clients = max_clients
+
+    def publish(self, event_type: str, data: dict):
+        """Olayı tampona ekle ve abonelere ilet (her thread'den çağrılabilir, bloklamaz)"""
+        with self._lock:
+            self._seq += 1
+            event = {"id": f"{EVENT_EPOCH}-{self._seq}", "seq": self._seq, "type": event_type, "data": data}
+            self._buffer.append(event)
+            subscribers = list(self._subscribers)
+        closed = []
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, event)
+            except RuntimeError:
+                # Event loop kapanmış
+                closed.append(sub)
+        if closed:
+            with self._lock:
+                self._subscribers.difference_update(closed)
+
+    def subscribe(self, last_event_id: str = None) -> tuple[_Subscriber, list[dict]]:
+        """Abone ol; Last-Event-ID'den sonraki olayları (veya reset olayını) döndür"""
+        sub = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                raise TooManyClients()
+            self._subscribers.add(sub)
+            backlog = self._replay(last_event_id)
+        return sub, backlog
+
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return len(self._subscribers) < self.max_clients
+
+    def unsubscribe(self, sub: _Subscriber):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def _replay(self, last_event_id: str | None) -> list[dict]:
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch == EVENT_EPOCH and seq.isdigit():
+            seq = int(seq)
+            oldest = self._buffer[0]["seq"] if self._buffer else self._seq + 1
+            if seq >= self._seq:
+                return []
+            if seq + 1 >= oldest:
+                return [e for e in self._buffer if e["seq"] > seq]
+        # Tampondan taşmış veya başka process'e ait id: istemci tüm durumu yenilemeli
+        return [{"id": f"{EVENT_EPOCH}-{self._seq}", "seq": self._seq, "type": "reset", "data": {}}]
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+
+_bus = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    return _bus
+
+
+def publish_event(event_type: str, **data):
+    """item_created | item_updated | item_moved | item_deleted | counts_changed | folder_changed"""
+    _bus.publish(event_type, data)
+
+
+def format_sse(event: dict) -> str:
+    payload = json.dumps(event["data"], ensure_ascii=False, default=json_default)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+async def event_stream(last_event_id: str = None):
+    """SSE gövdesi: replay, canlı olaylar ve heartbeat.
+
+    Abonelik gövde başladığında açılır ve finally'de kapanır: istemci
+    akış başlamadan koparsa geride kayıt kalmaz.
+    """
+    try:
+        sub, backlog = _bus.subscribe(last_event_id)
+    except TooManyClients:
+        # Ön kontrolden sonra dolmuş: akış boş kapanır, tarayıcı tekrar bağlanır
+        return
+    try:
+        # Bağlantı koparsa tarayıcı 3 sn sonra Last-Event-ID ile tekrar bağlanır
+        yield "retry: 3000\n\n"
+        for event in backlog:
+            yield format_sse(event)
+        while not sub.overflowed:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        _bus.unsubscribe(sub)
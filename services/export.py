@@ -0,0 +1,109 @@
+"""
+Streaming Export
+Öğeler tek tek işlenip parça parça üretilir (Markdown, JSONL, ZIP);
+çıktı ya doğrudan HTTP yanıtına akıtılır ya da Drive'a resumable
+(parçalı) upload ile yazılır. Bellek kullanımı öğe sayısından bağımsızdır.
+"""
+import json
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from services import drive
+from services.item import json_default
+from services.storage import get_storage
+
+# format: (mimetype, uzantı)
+EXPORT_FORMATS = {
+    "md": ("text/markdown", "md"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "zip": ("application/zip", "zip"),
+}
+
+
+def export_filename(export_name: str, fmt: str = "md") -> str:
+    """export-YYYYMMDD-HHMM-<ad>.<uzantı>"""
+    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in export_name)
+    return f"export-{datetime.now().strftime('%Y%m%d-%H%M')}-{safe_name[:30]}.{EXPORT_FORMATS[fmt][1]}"
+
+
+def _iter_markdown(items: Iterable[dict], export_name: str) -> Iterator[bytes]:
+    today = datetime.now().strftime("%Y-%m-%d %H:%M")
+    yield f"# Export: {export_name}\nTarih: {today}\n\n---\n\n".encode('utf-8')
+
+    total = 0
+    for item in items:
+        pinned_mark = "📌 " if item.get('pinned') else ""
+        proje_mark = f" 📁 {item.get('proje')}" if item.get('proje') else ""
+        lines = [f"## {pinned_mark}{item['title']}{proje_mark}", ""]
+        if item.get('content'):
+            lines += [item['content'], ""]
+        lines += ["---", "", ""]
+        total += 1
+        yield "\n".join(lines).encode('utf-8')
+
+    # Toplam sayı ancak akış bitince belli olur
+    yield f"Toplam: {total} öğe\n".encode('utf-8')
+
+
+def _iter_jsonl(items: Iterable[dict]) -> Iterator[bytes]:
+    for item in items:
+        yield (json.dumps(item, ensure_ascii=False, default=json_default) + "\n").encode('utf-8')
+
+
+class _ZipBuffer:
+    """zipfile'ın yazdığı baytları toplayıp parça parça teslim eden akış"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _iter_zip(items: Iterable[dict]) -> Iterator[bytes]:
+    """Orijinal .md dosyalarını (frontmatter dahil) ZIP olarak akıt"""
+    storage = get_storage()
+    buffer = _ZipBuffer()
+    used_names = set()
+    # Seek edilemeyen akışta zipfile data descriptor kullanır
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for item in items:
+            name = item.get('filename') or f"{item['id']}.md"
+            if name in used_names:
+                name = f"{name[:-3] if name.endswith('.md') else name}-{item['id']}.md"
+            used_names.add(name)
+
+            content = storage.read_file(item['id'])
+            archive.writestr(name, content)
+            yield buffer.drain()
+    # Merkezi dizin close() sırasında yazılır
+    yield buffer.drain()
+
+
+def iter_export(items: Iterable[dict], export_name: str, fmt: str = "md") -> Iterator[bytes]:
+    """Seçilen formatta export baytlarını parça parça üret"""
+    if fmt == "md":
+        return _iter_markdown(items, export_name)
+    if fmt == "jsonl":
+        return _iter_jsonl(items)
+    if fmt == "zip":
+        return _iter_zip(items)
+    raise ValueError(f"Bilinmeyen export formatı: {fmt}")
+
+
+def upload_export(items: Iterable[dict], export_name: str, fmt: str = "md") -> str:
+    """Export'u depodaki export klasörüne parçalı yükle, dosya adını döndür"""
+    export_folder_id = drive.get_or_create_folder("export")
+    filename = export_filename(export_name, fmt)
+    get_storage().upload_stream(export_folder_id, filename, iter_export(items, export_name, fmt), EXPORT_FORMATS[fmt][0])
+    return filename
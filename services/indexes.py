@@ -0,0 +1,296 @@
+"""
+İkincil İndeksler
+Her klasör için proje, şirket, sabitleme ve tarih (created / modified)
+indeksleri. Filtreler birleştirilebilir (şirket + sabitli + tarih
+aralığı), sıralama indeksten okunur; büyük arşivlerde de liste tek tek
+taranmaz. İndeksler services.drive cache'iyle birlikte artımlı
+güncellenir (add_cache_listener).
+"""
+from __future__ import annotations
+import bisect
+import re
+import threading
+
+from services import drive
+from services.item import Item
+
+_DATE_RE = re.compile(r"^\d{4}(-\d{2}(-\d{2}(T[\d:.]+Z?)?)?)?$")
+_EMPTY = frozenset()
+
+
+def company_of(proje: str | None) -> str | None:
+    """Projenin şirketi: SIRKET_PROJE_CONFIG'teki önek, yoksa " - " öncesi"""
+    if not proje:
+        return None
+    for sirket in _COMPANIES:
+        if proje.startswith(f"{sirket} - "):
+            return sirket
+    head, sep, _ = proje.partition(" - ")
+    return head if sep else None
+
+
+# Uzun adlar önce: "ABC Grup" ile "ABC" çakışırsa doğru şirket seçilir
+_COMPANIES = sorted(drive.SIRKET_PROJE_CONFIG, key=len, reverse=True)
+
+
+def _check_date(name: str, value: str | None) -> str | None:
+    if value and not _DATE_RE.match(value):
+        raise ValueError(f"Geçersiz tarih ({name}): {value}")
+    return value or None
+
+
+def _in_range(value: str, start: str | None, end: str | None) -> bool:
+    """Önek dahil aralık: end=2025-01 ocak ayının tamamını kapsar"""
+    if start and value < start:
+        return False
+    return not end or value[:len(end)] <= end
+
+
+class FolderIndex:
+    """Tek klasörün öğeleri ve ikincil indeksleri (_lock tutulurken kullanılır)"""
+
+    def __init__(self, has_content: bool):
+        self.has_content = has_content   # tam listeden mi (gövdeli) kuruldu
+        self.items = {}                  # id → item
+        self.by_proje = {}               # proje (None = projesi yok) → {id}
+        self.by_company = {}             # şirket → {id}
+        self.pinned = set()
+        self.by_created = []             # sıralı [(created, id)]
+        self.by_modified = []            # sıralı [(modified, id)]
+
+    @classmethod
+    def build(cls, items: list[dict], has_content: bool) -> "FolderIndex":
+        index = cls(has_content)
+        for item in items:
+            index._add_to_sets(item)
+        index.by_created = sorted((item.get("created") or "", item["id"]) for item in items)
+        index.by_modified = sorted((item.get("modified") or "", item["id"]) for item in items)
+        return index
+
+    def _add_to_sets(self, item: dict):
+        file_id = item["id"]
+        self.items[file_id] = item
+        self.by_proje.setdefault(item.get("proje"), set()).add(file_id)
+        company = company_of(item.get("proje"))
+        if company:
+            self.by_company.setdefault(company, set()).add(file_id)
+        if item.get("pinned"):
+            self.pinned.add(file_id)
+
+    def add(self, item: dict):
+        self._add_to_sets(item)
+        bisect.insort(self.by_created, (item.get("created") or "", item["id"]))
+        bisect.insort(self.by_modified, (item.get("modified") or "", item["id"]))
+
+    def remove(self, file_id: str) -> dict | None:
+        item = self.items.pop(file_id, None)
+        if item is None:
+            return None
+        proje = item.get("proje")
+        self._discard(self.by_proje, proje, file_id)
+        self._discard(self.by_company, company_of(proje), file_id)
+        self.pinned.discard(file_id)
+        for entries, key in ((self.by_created, "created"), (self.by_modified, "modified")):
+            entry = (item.get(key) or "", file_id)
+            pos = bisect.bisect_left(entries, entry)
+            if pos < len(entries) and entries[pos] == entry:
+                del entries[pos]
+        return item
+
+    @staticmethod
+    def _range(entries: list[tuple[str, str]], start: str | None, end: str | None) -> tuple[int, int]:
+        """Sıralı (değer, id) listesinde önek dahil [start, end] aralığının sınırları"""
+        lo = bisect.bisect_left(entries, (start, "")) if start else 0
+        hi = bisect.bisect_right(entries, (end + "\uffff",)) if end else len(entries)
+        return lo, hi
+
+    @staticmethod
+    def _discard(index: dict, key, file_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(file_id)
+            if not ids:
+                del index[key]
+
+    def query(self, proje_filter: str = "Tümü", company: str = None, proje: str = None, pinned: bool = None,
+              created_from: str = None, created_to: str = None, modified_from: str = None,
+              modified_to: str = None, sort: str = None) -> list[dict]:
+        # Eski tek boyutlu filtre (UI dropdown) diğerleriyle birleştirilir
+        empty_project = False
+        if proje_filter == "Projesi Yok":
+            empty_project = True
+        elif proje_filter.endswith(" (Tümü)"):
+            company = company or proje_filter.replace(" (Tümü)", "")
+            if company != proje_filter.replace(" (Tümü)", ""):
+                return []
+        elif proje_filter != "Tümü":
+            if proje and proje != proje_filter:
+                return []
+            proje = proje_filter
+
+        field = sort.lstrip("-") if sort else "modified"
+        entries = self.by_created if field == "created" else self.by_modified
+        start, end = (created_from, created_to) if field == "created" else (modified_from, modified_to)
+        lo, hi = self._range(entries, start, end)
+
+        sets = []
+        if empty_project:
+            sets.append(self.by_proje.get(None, _EMPTY))
+        if proje:
+            sets.append(self.by_proje.get(proje, _EMPTY))
+        if company:
+            sets.append(self.by_company.get(company, _EMPTY))
+        if pinned:
+            sets.append(self.pinned)
+        # Sıralama dışındaki tarih aralığı da kendi sıralı listesinden küme olur
+        other = self.by_modified if field == "created" else self.by_created
+        other_from, other_to = (modified_from, modified_to) if field == "created" else (created_from, created_to)
+        if other_from or other_to:
+            other_lo, other_hi = self._range(other, other_from, other_to)
+            sets.append({fid for _, fid in other[other_lo:other_hi]})
+        exclude = self.pinned if pinned is False else _EMPTY
+
+        candidates = None
+        if sets:
+            sets.sort(key=len)
+            candidates = set(sets[0]).intersection(*sets[1:])
+
+        if candidates is not None and len(candidates) * 8 < hi - lo:
+            # Aday kümesi küçük: aralığı taramak yerine adayları sırala
+            ordered = sorted(
+                (value, fid) for fid in candidates
+                if fid not in exclude and _in_range(value := self.items[fid].get(field) or "", start, end)
+            )
+        else:
+            ordered = entries[lo:hi]
+            if candidates is not None:
+                ordered = [entry for entry in ordered if entry[1] in candidates]
+            if exclude:
+                ordered = [entry for entry in ordered if entry[1] not in exclude]
+
+        if sort is not None and not sort.startswith("-"):
+            return [self.items[fid] for _, fid in ordered]
+        ids = [fid for _, fid in reversed(ordered)]
+        if sort is None and not exclude:
+            # Varsayılan: sabitliler üstte, sonra en son değişen
+            ids = [fid for fid in ids if fid in self.pinned] + [fid for fid in ids if fid not in self.pinned]
+        return [self.items[fid] for fid in ids]
+
+
+class ItemIndexes:
+    """Klasör başına FolderIndex; cache olaylarıyla güncel tutulur"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._folders = {}
+
+    def index_folder(self, folder_type: str, items: list[dict], has_content: bool = True):
+        index = FolderIndex.build(items, has_content)
+        with self._lock:
+            self._folders[folder_type] = index
+
+    def upsert(self, folder_type: str, item: dict):
+        with self._lock:
+            # Öğe başka klasörden taşınmış olabilir
+            previous = None
+            for ft, index in self._folders.items():
+                removed = index.remove(item["id"])
+                if ft == folder_type:
+                    previous = removed
+            index = self._folders.get(folder_type)
+            if index is None:
+                return
+            if "content" not in item and previous is not None and "content" in previous:
+                # Metadata-only güncelleme: gövde korunur
+                item = Item.from_mapping(previous).replace(**item)
+            index.add(item)
+
+    def remove(self, file_id: str):
+        with self._lock:
+            for index in self._folders.values():
+                index.remove(file_id)
+
+    def invalidate(self, folder_type: str = None):
+        with self._lock:
+            if folder_type is None:
+                self._folders.clear()
+            else:
+                self._folders.pop(folder_type, None)
+
+    def on_cache_event(self, event: str, folder_type: str = None, payload=None):
+        if event == "folder":
+            self.index_folder(folder_type, payload, has_content=True)
+        elif event == "folder_meta":
+            # Tam liste tazeyse indeksi zaten ondan kurulmuştur (aynı öğeler, gövdeli)
+            if not drive.is_folder_fresh(folder_type):
+                self.index_folder(folder_type, payload, has_content=False)
+        elif event == "upsert":
+            self.upsert(folder_type, payload)
+        elif event == "remove":
+            self.remove(payload)
+        elif event in ("invalidate", "clear"):
+            self.invalidate(folder_type)
+
+    def get(self, folder_type: str, with_content: bool = False) -> FolderIndex:
+        """Klasörün güncel indeksi; cache bayatsa veya eksikse önce liste yüklenir"""
+        with self._lock:
+            index = self._folders.get(folder_type)
+        usable = index is not None and (index.has_content or not with_content)
+        if usable and drive.is_folder_fresh(folder_type, with_content=with_content):
+            return index
+        # Yükleme (veya stale-while-revalidate) olay üzerinden indeksi günceller;
+        # cache zaten doluysa olay gelmez, liste doğrudan indekslenir
+        if with_content or drive.is_folder_fresh(folder_type):
+            items, has_content = drive.get_items(folder_type), True
+        else:
+            items, has_content = drive.get_items_metadata(folder_type), False
+        with self._lock:
+            index = self._folders.get(folder_type)
+        if index is None or (with_content and not index.has_content):
+            self.index_folder(folder_type, items, has_content)
+            with self._lock:
+                index = self._folders[folder_type]
+        return index
+
+    def query(self, folder_type: str, with_content: bool = False, **filters) -> list[dict]:
+        index = self.get(folder_type, with_content)
+        with self._lock:
+            return index.query(**filters)
+
+
+_indexes = ItemIndexes()
+drive.add_cache_listener(_indexes.on_cache_event)
+
+
+def get_item_indexes() -> ItemIndexes:
+    return _indexes
+
+
+def parse_filters(company: str = None, proje: str = None, pinned: bool = None,
+                  created_from: str = None, created_to: str = None,
+                  modified_from: str = None, modified_to: str = None, sort: str = None) -> dict:
+    """API parametrelerini doğrula; geçersizse ValueError"""
+    if sort and sort not in drive.SORT_ORDERS:
+        raise ValueError(f"Geçersiz sıralama: {sort} ({', '.join(drive.SORT_ORDERS)})")
+    return {
+        "company": company or None,
+        "proje": proje or None,
+        "pinned": pinned,
+        "created_from": _check_date("created_from", created_from),
+        "created_to": _check_date("created_to", created_to),
+        "modified_from": _check_date("modified_from", modified_from),
+        "modified_to": _check_date("modified_to", modified_to),
+        "sort": sort or None,
+    }
+
+
+def query_items(folder_type: str, proje_filter: str = "Tümü", **filters) -> list[dict]:
+    """Filtrelenmiş + sıralı tam öğeler (gövdeli)"""
+    return _indexes.query(folder_type, with_content=True, proje_filter=proje_filter, **filters)
+
+
+def query_page(folder_type: str, proje_filter: str = "Tümü", limit: int = drive.DEFAULT_PAGE_SIZE,
+               cursor: str = None, fields: tuple[str, ...] = None, **filters) -> dict:
+    """Filtrelenmiş + sıralı sayfa: {items, next_cursor, total}"""
+    items = _indexes.query(folder_type, with_content=False, proje_filter=proje_filter, **filters)
+    return drive.paginate_items(folder_type, items, limit, cursor, fields, filters.get("sort"))
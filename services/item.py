@@ -0,0 +1,148 @@
+"""
+Kompakt Öğe Modeli
+Cache'teki her not 11 anahtarlı bir dict yerine __slots__'lu bir Item
+olarak tutulur. Item mapping protokolünü uygular (item["title"],
+item.get(...), "content" in item, dict(item)), böylece mevcut kod
+değişmeden çalışır. Tekrarlayan kısa metinler (proje, tarih, saat)
+intern edilir; gövde istenirse bellekte zlib ile sıkıştırılmış tutulur
+ve sadece okunduğunda açılır.
+"""
+import os
+import sys
+import zlib
+from collections.abc import Mapping, MutableMapping
+
+# Sıralama API'nin JSON çıktısındaki alan sırasıdır
+FIELDS = (
+    "id", "filename", "title", "content", "summary", "proje", "created",
+    "modified", "pinned", "reminder", "reminder_time",
+)
+INTERNED_FIELDS = frozenset({"proje", "created", "reminder_time"})
+
+# Gövde sıkıştırma (varsayılan kapalı): bu boyuttan kısa gövdeler düz kalır
+COMPRESS_BODIES = os.environ.get("ITEM_COMPRESS_BODIES", "0") == "1"
+COMPRESS_MIN_BYTES = int(os.environ.get("ITEM_COMPRESS_MIN_BYTES", "512"))
+
+_MISSING = object()  # alan hiç yok (ör. metadata-only öğede content)
+_SLOTS = {name: ("_body" if name == "content" else name) for name in FIELDS}
+
+
+def _pack_body(content):
+    if not COMPRESS_BODIES or not isinstance(content, str):
+        return content
+    raw = content.encode("utf-8")
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return content
+    packed = zlib.compress(raw, 6)
+    return packed if len(packed) < len(raw) else content
+
+
+def _unpack_body(value):
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+class Item(MutableMapping):
+    """Tek not: sabit alanlı, dict gibi okunup yazılabilen kayıt"""
+
+    __slots__ = tuple(_SLOTS.values())
+
+    def __init__(self, **fields):
+        for name, slot in _SLOTS.items():
+            object.__setattr__(self, slot, _MISSING)
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def from_mapping(cls, data: Mapping) -> "Item":
+        """dict (ör. depodan okunan JSON) → Item; zaten Item ise aynen döner"""
+        if isinstance(data, Item):
+            return data
+        return cls(**data)
+
+    # ---------- mapping protokolü ----------
+
+    def __getitem__(self, key):
+        slot = _SLOTS.get(key)
+        if slot is None:
+            raise KeyError(key)
+        value = getattr(self, slot)
+        if value is _MISSING:
+            raise KeyError(key)
+        return _unpack_body(value) if slot == "_body" else value
+
+    def __setitem__(self, key, value):
+        slot = _SLOTS.get(key)
+        if slot is None:
+            raise KeyError(f"Bilinmeyen öğe alanı: {key}")
+        if slot == "_body":
+            value = _pack_body(value)
+        elif key in INTERNED_FIELDS and type(value) is str:
+            value = sys.intern(value)
+        object.__setattr__(self, slot, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        object.__setattr__(self, _SLOTS[key], _MISSING)
+
+    def __contains__(self, key):
+        # Mapping varsayılanı __getitem__ çağırır; gövde boşuna açılmasın
+        slot = _SLOTS.get(key)
+        return slot is not None and getattr(self, slot) is not _MISSING
+
+    def __iter__(self):
+        for name, slot in _SLOTS.items():
+            if getattr(self, slot) is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(1 for slot in self.__slots__ if getattr(self, slot) is not _MISSING)
+
+    def get(self, key, default=None):
+        slot = _SLOTS.get(key)
+        if slot is None:
+            return default
+        value = getattr(self, slot)
+        if value is _MISSING:
+            return default
+        return _unpack_body(value) if slot == "_body" else value
+
+    def __eq__(self, other):
+        if isinstance(other, Item):
+            # Sıkıştırma deterministik: gövdeler açılmadan karşılaştırılır
+            return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Item(id={self.get('id')!r}, title={self.get('title')!r})"
+
+    # ---------- kopyalar ----------
+
+    def replace(self, **changes) -> "Item":
+        """Değişiklikler uygulanmış kopya (gövde yeniden sıkıştırılmaz)"""
+        copy = Item.__new__(Item)
+        for slot in self.__slots__:
+            object.__setattr__(copy, slot, getattr(self, slot))
+        for name, value in changes.items():
+            copy[name] = value
+        return copy
+
+    def without_content(self) -> "Item":
+        """Liste görünümü: gövdesiz kopya"""
+        view = self.replace()
+        object.__setattr__(view, "_body", _MISSING)
+        return view
+
+    def to_dict(self) -> dict:
+        return {name: self[name] for name in self}
+
+
+def json_default(obj):
+    """json/orjson `default` kancası: Item → dict"""
+    if isinstance(obj, Item):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,267 @@
+"""
+Metrikler (Prometheus metin biçimi)
+HTTP istekleri (route şablonu başına süre histogramı + durum sayaçları),
+Drive API çağrıları (metot + çağıran fonksiyon başına sayı / süre),
+anımsatıcı (osascript) süreçleri; cache, yanıt cache'i, transport ve
+thread havuzu kuyrukları ise okuma anında toplanır. /api/metrics
+render() çıktısını sunar.
+
+Bağımlılık yok: sayaç / histogram burada, kilit başına birkaç dict işlemi.
+"""
+import sys
+import threading
+import time
+
+PREFIX = "notdefteri_"
+
+# Saniye; Drive çağrıları ve istekler için aynı ölçek (5 ms - 30 sn)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+INF_LABEL = 'le="+Inf"'
+
+# Çağıran fonksiyon aranırken atlanan modüller (backend'in kendisi)
+_SKIP_MODULES = ("services.storage", "services.storage_drive")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}" for k, v in sorted(values.items())]
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, *label_values, value: float):
+        with self._lock:
+            self._values[label_values] = value
+
+    def collect(self) -> list[str]:
+        lines = super().collect()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label değerleri → [bucket sayaçları..., toplam, adet]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, INF_LABEL)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {series[-1]}")
+        return lines
+
+
+# ---------- kayıtlı metrikler ----------
+
+http_requests = Counter("http_requests_total", "HTTP istekleri (route şablonu, metot, durum)",
+                        ("route", "method", "status"))
+http_duration = Histogram("http_request_duration_seconds", "Yanıt başlığına kadar süre",
+                          ("route", "method"))
+http_in_progress = Gauge("http_requests_in_progress", "Şu an işlenen istekler")
+drive_calls = Counter("drive_api_calls_total", "Drive API çağrıları (metot, çağıran fonksiyon, sonuç)",
+                      ("method", "caller", "outcome"))
+drive_duration = Histogram("drive_api_call_duration_seconds", "Drive API çağrı süresi (retry dahil)",
+                           ("method", "caller"))
+reminder_duration = Histogram("reminder_subprocess_duration_seconds", "osascript süreç süresi (sonuç)",
+                              ("outcome",), buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+
+_METRICS = [http_requests, http_duration, http_in_progress, drive_calls, drive_duration, reminder_duration]
+_collectors = []  # okuma anında çalışan fonksiyonlar → metrik satırları
+_executors = {}   # havuz adı → ThreadPoolExecutor
+
+
+def register_collector(collector):
+    """collector() → list[Counter | Gauge] (render sırasında çağrılır)"""
+    _collectors.append(collector)
+
+
+def register_executor(name: str, executor):
+    """Thread havuzu: kuyruk derinliği ve thread sayısı dışa verilir"""
+    _executors[name] = executor
+
+
+def observe_request(route: str, method: str, status: int, seconds: float):
+    http_requests.inc(route, method, str(status))
+    http_duration.observe(seconds, route, method)
+
+
+def observe_drive_call(method: str, caller: str, seconds: float, ok: bool):
+    drive_calls.inc(method, caller, "ok" if ok else "error")
+    drive_duration.observe(seconds, method, caller)
+
+
+def observe_reminder(seconds: float, outcome: str):
+    reminder_duration.observe(seconds, outcome)
+
+
+def drive_caller(depth: int = 2) -> str:
+    """Backend dışındaki ilk çağıran: "drive._load_items" gibi"""
+    frame = sys._getframe(depth)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _SKIP_MODULES:
+            return f"{module.removeprefix('services.')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+# ---------- ASGI middleware ----------
+
+class MetricsMiddleware:
+    """Route şablonu başına süre ve durum (SSE / stream'lerde süre yanıt başlığına kadardır)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        state = {"status": 500, "recorded": False}
+
+        def record():
+            if not state["recorded"]:
+                state["recorded"] = True
+                route = scope.get("route")
+                observe_request(getattr(route, "path", "unmatched"), scope["method"], state["status"],
+                                time.perf_counter() - start)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                record()
+            await send(message)
+
+        http_in_progress.inc(amount=1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_progress.inc(amount=-1)
+            record()
+
+
+# ---------- okuma anında toplananlar ----------
+
+def _executor_metrics() -> list:
+    queued = Gauge("threadpool_queue_depth", "Thread havuzunda bekleyen iş", ("pool",))
+    threads = Gauge("threadpool_threads", "Thread havuzunun açık thread sayısı", ("pool",))
+    limit = Gauge("threadpool_max_workers", "Thread havuzu üst sınırı", ("pool",))
+    for name, executor in _executors.items():
+        queued.set(name, value=executor._work_queue.qsize())
+        threads.set(name, value=len(executor._threads))
+        limit.set(name, value=executor._max_workers)
+    return [queued, threads, limit]
+
+
+def _cache_metrics() -> list:
+    from services.drive import get_cache_stats
+    from services.response_cache import get_response_cache
+
+    stats = get_cache_stats()
+    counters = {
+        stat: Counter(f"cache_{stat}_total", f"Veri cache'i {stat} (namespace)", ("namespace",))
+        for stat in ("hits", "stale_hits", "misses", "evictions")
+    }
+    entries = Gauge("cache_entries", "Veri cache'indeki kayıtlar", ("namespace",))
+    size = Gauge("cache_bytes", "Veri cache'inin tahmini boyutu", ("namespace",))
+    for namespace, values in stats["namespaces"].items():
+        for stat, counter in counters.items():
+            counter.inc(namespace, amount=values.get(stat, 0))
+        entries.set(namespace, value=values["entries"])
+        size.set(namespace, value=values["bytes"])
+    limit = Gauge("cache_max_bytes", "Veri cache'i bellek bütçesi")
+    limit.set(value=stats["max_bytes"])
+
+    response = get_response_cache().stats()
+    response_requests = Counter("response_cache_requests_total", "Hazır yanıt cache'i (sonuç)", ("result",))
+    response_requests.inc("hit", amount=response["hits"])
+    response_requests.inc("miss", amount=response["misses"])
+    response_size = Gauge("response_cache_bytes", "Hazır yanıt cache'inin boyutu")
+    response_size.set(value=response["bytes"])
+    return [*counters.values(), entries, size, limit, response_requests, response_size]
+
+
+def _transport_metrics() -> list:
+    from services.transport import get_transport_stats
+
+    transport = Counter("drive_transport_total", "Drive HTTP transport sayaçları", ("counter",))
+    for name, value in get_transport_stats().items():
+        transport.inc(name, amount=value)
+    return [transport]
+
+
+register_collector(_executor_metrics)
+register_collector(_cache_metrics)
+register_collector(_transport_metrics)
+
+
+def render() -> str:
+    """Tüm metrikler, Prometheus text exposition 0.0.4"""
+    lines = []
+    for metric in _METRICS:
+        lines += metric.collect()
+    for collector in _collectors:
+        try:
+            for metric in collector():
+                lines += metric.collect()
+        except Exception as e:
+            lines.append(f"# collector {getattr(collector, '__name__', collector)} failed: {_escape(e)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,354 @@
+"""
+İstek Profili (isteğe bağlı, örneklemeli)
+`X-Profile: 1` başlığı veya `?profile=1` ile (giriş yapılmışsa) ya da
+PROFILE_SLOW_MS aşan her istekte, isteğin yığınları duvar saati ile
+örneklenir: event loop'ta isteğin task'i çalışırken loop thread'i,
+ayrıca bind() ile isteğe bağlanan worker thread'leri (drive-io havuzu,
+get_items'ın paralel indirme thread'leri). Profil PROFILE_DIR'e JSON
+olarak yazılır, /api/profiles listeler.
+
+Varsayılan kapalı: PROFILE_DIR verilmezse middleware hiç eklenmez.
+Açıkken de profil yokken örnekleme thread'i çalışmaz, bind() ContextVar
+okuyup fonksiyonun kendisini döndürür.
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+import types
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "")  # boş = profil kapalı (middleware eklenmez)
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "0"))  # 0 = otomatik profil kapalı
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL_MS", "5")) / 1000  # seconds
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+
+PROFILE_HEADER = b"x-profile"
+MAX_DEPTH = 128
+TOP_FUNCTIONS = 40
+
+# Otomatik profile girmeyen yollar (uzun yaşayan akış, gözlem endpoint'leri)
+_SKIP_PREFIXES = ("/api/events", "/api/metrics", "/api/profiles")
+_ID_RE = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{6}$")
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_current = contextvars.ContextVar("profile", default=None)
+_labels = {}  # code nesnesi → "fonksiyon (dosya:satır)"
+
+
+def is_enabled() -> bool:
+    return bool(PROFILE_DIR)
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_ROOT + os.sep):
+        return filename[len(_ROOT) + 1:]
+    _, marker, rest = filename.rpartition("site-packages" + os.sep)
+    return rest if marker else os.path.basename(filename)
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def _fold(frame, role: str) -> str:
+    """Yığın → flame graph satırı: "rol;dış;...;iç" """
+    stack = []
+    # Worker thread'lerinde havuz / bind() çerçeveleri atlanır: yığın işin kendisiyle başlar
+    while frame is not None and frame.f_code is not _BOUND_CODE and len(stack) < MAX_DEPTH:
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    stack.append(role)
+    return ";".join(reversed(stack))
+
+
+def _thread_role(ident: int) -> str:
+    """drive-io_3 → drive-io, ThreadPoolExecutor-4_1 → ThreadPoolExecutor"""
+    thread = threading._active.get(ident)
+    name = thread.name if thread is not None else f"thread-{ident}"
+    return re.sub(r"(-\d+)?_\d+$", "", name)
+
+
+class Profile:
+    """Tek isteğin örnekleri: yığın (folded) → saniye"""
+
+    def __init__(self, method: str, path: str, reason: str):
+        self.id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.route = None
+        self.status = None
+        self.started = datetime.now(timezone.utc)
+        self.duration = 0.0
+        self.samples = 0
+        self.stacks = {}
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._threads = {}  # ident → iç içe bağlanma sayısı
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def attach(self):
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def detach(self):
+        ident = threading.get_ident()
+        with self._lock:
+            count = self._threads.pop(ident, 1) - 1
+            if count:
+                self._threads[ident] = count
+
+    def sample(self, frames: dict, weight: float):
+        with self._lock:
+            idents = [(ident, None) for ident in self._threads]
+        if asyncio.current_task(self._loop) is self._task:
+            idents.append((self._loop_thread, "event-loop"))
+        for ident, role in idents:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            key = _fold(frame, role or _thread_role(ident))
+            with self._lock:
+                self.stacks[key] = self.stacks.get(key, 0.0) + weight
+                self.samples += 1
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stacks = dict(self.stacks)
+        self_time, total_time, threads = {}, {}, {}
+        for key, seconds in stacks.items():
+            role, *frames = key.split(";")
+            threads[role] = threads.get(role, 0.0) + seconds
+            if frames:
+                self_time[frames[-1]] = self_time.get(frames[-1], 0.0) + seconds
+            for label in set(frames):
+                total_time[label] = total_time.get(label, 0.0) + seconds
+        top = sorted(total_time, key=lambda label: (self_time.get(label, 0.0), total_time[label]), reverse=True)
+        return {
+            **self.summary(),
+            "interval_ms": PROFILE_INTERVAL * 1000,
+            "threads_ms": {role: round(s * 1000, 1) for role, s in sorted(threads.items(), key=lambda kv: -kv[1])},
+            "top": [
+                {"function": label, "self_ms": round(self_time.get(label, 0.0) * 1000, 1),
+                 "total_ms": round(total_time[label] * 1000, 1)}
+                for label in top[:TOP_FUNCTIONS]
+            ],
+            "stacks": {key: round(seconds * 1000, 3) for key, seconds in sorted(stacks.items())},
+        }
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "reason": self.reason,
+            "started": self.started.isoformat(),
+            "duration_ms": round(self.duration * 1000, 1),
+            "samples": self.samples,
+        }
+
+
+class _Sampler:
+    """Açık profiller varken çalışan tek örnekleme thread'i"""
+
+    def __init__(self):
+        self._profiles = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, profile: Profile):
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: Profile):
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self):
+        last = time.perf_counter()
+        while True:
+            time.sleep(PROFILE_INTERVAL)
+            now = time.perf_counter()
+            weight, last = now - last, now
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles)
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.sample(frames, weight)
+
+
+_sampler = _Sampler()
+
+
+def bind(func):
+    """Profil açıksa func'ı çalıştığı thread'i isteğe bağlayarak sar; değilse func'ın kendisi.
+    Thread havuzuna verilen işler için (contextvar'lar havuza taşınmaz)."""
+    profile = _current.get()
+    if profile is None:
+        return func
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        token = _current.set(profile)
+        profile.attach()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.detach()
+            _current.reset(token)
+
+    return run
+
+
+_BOUND_CODE = next(const for const in bind.__code__.co_consts if isinstance(const, types.CodeType))
+
+
+# ---------- depolama ----------
+
+def _path(profile_id: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{profile_id}.json")
+
+
+def save_profile(profile: Profile):
+    """JSON'a yaz, en yeni PROFILE_KEEP profil dışındakileri sil"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    tmp = _path(profile.id) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profile.to_dict(), f, ensure_ascii=False)
+    os.replace(tmp, _path(profile.id))
+    for profile_id in _profile_ids()[PROFILE_KEEP:]:
+        try:
+            os.remove(_path(profile_id))
+        except OSError:
+            pass
+
+
+def _profile_ids() -> list[str]:
+    """En yeniden eskiye"""
+    try:
+        entries = [
+            (entry.stat().st_mtime, entry.name[:-5]) for entry in os.scandir(PROFILE_DIR)
+            if entry.name.endswith(".json") and _ID_RE.match(entry.name[:-5])
+        ]
+    except OSError:
+        return []
+    return [profile_id for _, profile_id in sorted(entries, reverse=True)]
+
+
+def load_profile(profile_id: str) -> dict | None:
+    if not PROFILE_DIR or not _ID_RE.match(profile_id):
+        return None
+    try:
+        with open(_path(profile_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_profiles(limit: int = PROFILE_KEEP) -> list[dict]:
+    """Son profillerin özetleri (yığınlar hariç)"""
+    result = []
+    for profile_id in _profile_ids()[:limit]:
+        profile = load_profile(profile_id)
+        if profile is not None:
+            profile.pop("stacks", None)
+            profile.pop("top", None)
+            result.append(profile)
+    return result
+
+
+def folded(profile: dict) -> str:
+    """flamegraph.pl / speedscope için folded satırlar (değer: mikrosaniye)"""
+    return "".join(f"{stack} {round(ms * 1000)}\n" for stack, ms in profile["stacks"].items())
+
+
+# ---------- ASGI middleware ----------
+
+def _requested(scope) -> str | None:
+    """Açık tetik: "header" / "query" / None"""
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER and value not in (b"", b"0"):
+            return "header"
+    query = scope.get("query_string", b"")
+    if b"profile=" in query and dict(parse_qsl(query.decode("latin-1"))).get("profile", "0") not in ("", "0"):
+        return "query"
+    return None
+
+
+def _display_path(scope) -> str:
+    """Yol + sorgu (key parametresi çıkarılır)"""
+    query = [(k, v) for k, v in parse_qsl(scope.get("query_string", b"").decode("latin-1")) if k != "key"]
+    return scope["path"] + (f"?{urlencode(query)}" if query else "")
+
+
+class ProfilingMiddleware:
+    """Açık tetikte (yetkiliyse) veya PROFILE_SLOW_MS eşiğinde isteği profille.
+    authorize(scope) → bool: açık tetik sadece giriş yapılmışsa geçerli."""
+
+    def __init__(self, app, authorize):
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        reason = _requested(scope)
+        if reason is not None and not self.authorize(scope):
+            reason = None
+        if reason is None and (PROFILE_SLOW_MS <= 0 or not scope["path"].startswith("/api/")
+                               or scope["path"].startswith(_SKIP_PREFIXES)):
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(scope["method"], _display_path(scope), reason or "slow")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if reason is not None:
+                    message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        token = _current.set(profile)
+        _sampler.add(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _sampler.remove(profile)
+            _current.reset(token)
+            profile.finish()
+            profile.route = getattr(scope.get("route"), "path", None)
+            if reason is not None or profile.duration * 1000 >= PROFILE_SLOW_MS:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, save_profile, profile)
+                except OSError as e:
+                    # services.drive bind() için bu modülü import eder: döngüsüz olsun diye burada
+                    from services.drive import log_error
+                    log_error("ProfileSaveError", str(e), {"profile_id": profile.id, "path": profile.path})
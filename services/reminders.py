@@ -3,8 +3,11 @@ macOS Reminders (Anımsatıcılar) Entegrasyonu
 osascript kullanarak Anımsatıcılar uygulamasına görev ekler
 """
 import subprocess
+import time
 from datetime import datetime, timedelta
 
+from services.metrics import observe_reminder
+
 
 # Varsayılan Anımsatıcılar listesi adı
 DEFAULT_LIST_NAME = "Kişisel Not Defterim Anımsatıcılar"
@@ -24,7 +27,9 @@ def get_list_for_project(proje: str = None) -> str:
 
 
 def _run_applescript(script: str) -> tuple[bool, str]:
-    """AppleScript çalıştır"""
+    """AppleScript çalıştır (süresi /api/metrics'e yazılır)"""
+    start = time.perf_counter()
+    outcome = "error"
     try:
         result = subprocess.run(
             ["osascript", "-e", script],
@@ -33,12 +38,16 @@ def _run_applescript(script: str) -> tuple[bool, str]:
             timeout=10
         )
         if result.returncode == 0:
+            outcome = "ok"
             return True, result.stdout.strip()
         return False, result.stderr.strip()
     except subprocess.TimeoutExpired:
+        outcome = "timeout"
         return False, "Timeout"
     except Exception as e:
         return False, str(e)
+    finally:
+        observe_reminder(time.perf_counter() - start, outcome)
 
 
 def ensure_reminders_list(list_name: str = DEFAULT_LIST_NAME) -> bool:
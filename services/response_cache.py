@@ -0,0 +1,118 @@
+"""
+Hazır Yanıt Cache'i
+Sık okunan liste yanıtlarının JSON baytları ve gzip/brotli halleri
+ETag (cache sürümü) başına bir kez üretilir; sonraki isteklerde
+serileştirme ve sıkıştırma yapılmadan aynen gönderilir.
+"""
+from __future__ import annotations
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from services.item import json_default
+
+# Opsiyonel hızlı encoder / brotli (kurulu değilse standart yol)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RESPONSE_CACHE_BYTES = int(os.environ.get("RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024)))
+COMPRESS_MIN_SIZE = 500  # GZipMiddleware ile aynı eşik
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps(content) -> bytes:
+    """JSON baytları (orjson varsa onunla)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+class EncodedBody:
+    """Aynı gövdenin ham, gzip ve brotli halleri"""
+
+    __slots__ = ("raw", "gzip", "br", "size")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.gzip = None
+        self.br = None
+        if len(raw) >= COMPRESS_MIN_SIZE:
+            self.gzip = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+            if brotli is not None:
+                self.br = brotli.compress(raw, quality=BROTLI_QUALITY)
+        self.size = len(raw) + len(self.gzip or b"") + len(self.br or b"")
+
+    def select(self, accept_encoding: str) -> tuple[bytes, str | None]:
+        """İstemcinin kabul ettiği en küçük kodlama: (gövde, Content-Encoding)"""
+        accepted = {part.split(";")[0].strip() for part in (accept_encoding or "").lower().split(",")}
+        if self.br is not None and "br" in accepted:
+            return self.br, "br"
+        if self.gzip is not None and "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.raw, None
+
+
+class ResponseCache:
+    """ETag anahtarlı, toplam bayt sınırlı LRU"""
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> EncodedBody | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: str, content) -> EncodedBody:
+        """İçeriği serileştir + sıkıştır ve sakla"""
+        body = EncodedBody(dumps(content))
+        if body.size > self.max_bytes:
+            return body
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = body
+            self._bytes += body.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return body
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "encoder": "orjson" if orjson is not None else "json",
+                "brotli": brotli is not None,
+            }
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
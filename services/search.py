@@ -0,0 +1,279 @@
+"""
+Tam Metin Arama
+Tüm klasörlerdeki notların başlık + içeriği üzerinde bellek içi ters
+indeks. Türkçe'ye uygun normalizasyon (ı/İ, ş, ğ, ç, ö, ü), BM25 skorlama
+ve önek eşleşmesi. İndeks services.drive cache'iyle birlikte artımlı
+güncellenir (add_cache_listener).
+"""
+import bisect
+import html
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from services import drive
+from services.item import Item
+
+# BM25 parametreleri
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 3  # başlıktaki terim içerikteki terimin bu katı sayılır
+
+MIN_PREFIX_LENGTH = 2  # daha kısa terimler sadece tam eşleşir
+MAX_PREFIX_EXPANSION = 50  # bir önekin açılabileceği en fazla terim
+SNIPPET_CHARS = 160
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Türkçe harfleri ASCII karşılıklarına katla (1:1, offsetler korunur)
+_FOLD = str.maketrans({
+    "ı": "i", "ş": "s", "ğ": "g", "ç": "c", "ö": "o", "ü": "u",
+    "â": "a", "î": "i", "û": "u",
+})
+
+
+def normalize(text: str) -> str:
+    """Türkçe küçük harfe çevir ve aksanları kaldır (uzunluk değişmez)"""
+    if not text:
+        return ""
+    # str.lower() 'I' → 'i' ve 'İ' → 'i̇' (2 karakter) yapar; Türkçe kuralları önce uygulanır
+    text = text.replace("I", "ı").replace("İ", "i").lower().translate(_FOLD)
+    if text.isascii():
+        return text
+    return "".join(
+        c if c.isascii() else unicodedata.normalize("NFKD", c)[0]
+        for c in text
+    )
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """Klasör listelerinden beslenen BM25 ters indeksi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs = {}        # id → (folder, item, {term: tf}, length)
+        self._postings = {}    # term → {id: tf}
+        self._terms = []       # önek araması için sıralı terim listesi
+        self._total_length = 0
+        self._folders = set()  # güncel olarak indekslenmiş klasörler
+
+    # ---------- güncelleme ----------
+
+    def _add(self, folder_type: str, item: dict, new_terms: set = None):
+        """new_terms verilirse yeni terimler oraya toplanır (toplu ekleme sonunda tek sıralama)"""
+        tf = Counter(tokenize(item.get("content") or ""))
+        for term in tokenize(item.get("title") or ""):
+            tf[term] += TITLE_WEIGHT
+        length = sum(tf.values())
+        self._docs[item["id"]] = (folder_type, item, tf, length)
+        self._total_length += length
+        for term, count in tf.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if new_terms is None:
+                    bisect.insort(self._terms, term)
+                else:
+                    new_terms.add(term)
+            postings[item["id"]] = count
+
+    def _remove(self, file_id: str):
+        doc = self._docs.pop(file_id, None)
+        if doc is None:
+            return
+        _, _, tf, length = doc
+        self._total_length -= length
+        for term in tf:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(file_id, None)
+            if not postings:
+                del self._postings[term]
+                pos = bisect.bisect_left(self._terms, term)
+                if pos < len(self._terms) and self._terms[pos] == term:
+                    del self._terms[pos]
+
+    def index_folder(self, folder_type: str, items: list[dict]):
+        """Klasörün tam listesini uygula; sadece değişen öğeler yeniden indekslenir"""
+        with self._lock:
+            current = {item["id"]: item for item in items}
+            new_terms = set()
+            for file_id, (folder, item, _, _) in list(self._docs.items()):
+                if folder == folder_type and file_id not in current:
+                    self._remove(file_id)
+            for file_id, item in current.items():
+                doc = self._docs.get(file_id)
+                if doc is not None and doc[0] == folder_type and doc[1].get("modified") == item.get("modified") \
+                        and doc[1].get("content") == item.get("content"):
+                    # İçerik aynı: sadece metadata (pin, proje) referansını güncelle
+                    self._docs[file_id] = (folder_type, item, doc[2], doc[3])
+                    continue
+                self._remove(file_id)
+                self._add(folder_type, item, new_terms)
+            if new_terms:
+                # Terim başına insort ilk kurulumda O(T²) olurdu: bir kez sırala
+                self._terms.extend(term for term in new_terms if term in self._postings)
+                self._terms.sort()
+            self._folders.add(folder_type)
+
+    def upsert(self, folder_type: str, item: dict):
+        with self._lock:
+            doc = self._docs.get(item["id"])
+            if "content" not in item and doc is not None:
+                # Metadata-only güncelleme: mevcut içerik korunur
+                item = Item.from_mapping(doc[1]).replace(**item)
+            self._remove(item["id"])
+            self._add(folder_type, item)
+
+    def remove(self, file_id: str):
+        with self._lock:
+            self._remove(file_id)
+
+    def invalidate(self, folder_type: str = None):
+        """Klasör bir sonraki aramada yeniden yüklensin (eski kayıtlar o zamana kadar kalır)"""
+        with self._lock:
+            if folder_type is None:
+                self._folders.clear()
+            else:
+                self._folders.discard(folder_type)
+
+    def on_cache_event(self, event: str, folder_type: str = None, payload=None):
+        if event == "folder":
+            self.index_folder(folder_type, payload)
+        elif event == "upsert":
+            self.upsert(folder_type, payload)
+        elif event == "remove":
+            self.remove(payload)
+        elif event in ("invalidate", "clear"):
+            self.invalidate(folder_type)
+
+    def missing_folders(self) -> list[str]:
+        return [f for f in drive.FOLDER_CONFIG if f not in self._folders]
+
+    # ---------- arama ----------
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        """Sorgu terimini indeks terimlerine aç: tam eşleşme 1.0, önek 0.8"""
+        matches = []
+        if term in self._postings:
+            matches.append((term, 1.0))
+        if len(term) >= MIN_PREFIX_LENGTH:
+            pos = bisect.bisect_right(self._terms, term)
+            while pos < len(self._terms) and self._terms[pos].startswith(term) \
+                    and len(matches) < MAX_PREFIX_EXPANSION:
+                matches.append((self._terms[pos], 0.8))
+                pos += 1
+        return matches
+
+    def search(self, query: str, folder: str = None, proje: str = None, limit: int = 20) -> list[dict]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            avg_length = max(1, self._total_length / n_docs)
+            scores = {}
+            matched_terms = {}
+            for i, term in enumerate(terms):
+                term_scores = {}
+                for index_term, weight in self._expand(term):
+                    postings = self._postings[index_term]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for file_id, tf in postings.items():
+                        length = self._docs[file_id][3]
+                        score = weight * idf * tf * (BM25_K1 + 1) / (
+                            tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                        )
+                        if score > term_scores.get(file_id, 0):
+                            term_scores[file_id] = score
+                        matched_terms.setdefault(file_id, set()).add(index_term)
+                # Tüm sorgu terimleri eşleşmeli (AND)
+                if i == 0:
+                    scores = term_scores
+                else:
+                    scores = {fid: s + term_scores[fid] for fid, s in scores.items() if fid in term_scores}
+                if not scores:
+                    return []
+
+            candidates = []
+            for file_id, score in scores.items():
+                folder_type, item, _, _ = self._docs[file_id]
+                if folder and folder_type != folder:
+                    continue
+                if proje and not drive.matches_proje_filter(item, proje):
+                    continue
+                candidates.append((score, folder_type, item, matched_terms[file_id]))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        return [
+            {
+                "id": item["id"],
+                "folder": folder_type,
+                "title": item.get("title"),
+                "proje": item.get("proje"),
+                "pinned": item.get("pinned", False),
+                "modified": item.get("modified"),
+                "score": round(score, 4),
+                "snippet": make_snippet(item.get("content") or item.get("summary") or "", matched),
+            }
+            for score, folder_type, item, matched in candidates[:limit]
+        ]
+
+
+def make_snippet(text: str, terms: set[str], width: int = SNIPPET_CHARS) -> str:
+    """Eşleşen ilk terim çevresinden HTML-escape edilmiş, <mark>'lı kesit"""
+    normalized = normalize(text)
+    spans = [
+        (m.start(), m.end()) for m in _TOKEN_RE.finditer(normalized)
+        if any(m.group().startswith(t) for t in terms)
+    ]
+    start = max(0, spans[0][0] - width // 3) if spans else 0
+    end = min(len(text), start + width)
+
+    parts = [] if start == 0 else ["…"]
+    pos = start
+    for s, e in spans:
+        if s < start or e > end:
+            continue
+        parts.append(html.escape(text[pos:s]))
+        parts.append(f"<mark>{html.escape(text[s:e])}</mark>")
+        pos = e
+    parts.append(html.escape(text[pos:end]))
+    if end < len(text):
+        parts.append("…")
+    return "".join(parts).replace("\n", " ")
+
+
+_index = SearchIndex()
+drive.add_cache_listener(_index.on_cache_event)
+
+
+def get_search_index() -> SearchIndex:
+    return _index
+
+
+def search(query: str, folder: str = None, proje: str = None, limit: int = 20) -> dict:
+    """Sorguyu çalıştır; henüz indekslenmemiş klasörler önce yüklenir"""
+    started = time.perf_counter()
+    folders = [folder] if folder else drive.FOLDER_CONFIG
+    for folder_type in folders:
+        if folder_type in _index.missing_folders():
+            # Cache doluysa yükleme olayı gelmez: listeyi doğrudan indeksle
+            _index.index_folder(folder_type, drive.get_items(folder_type))
+    results = _index.search(query, folder, proje, limit)
+    return {
+        "query": query,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
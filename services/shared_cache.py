@@ -0,0 +1,347 @@
+"""
+Paylaşılan Cache Katmanı (çok worker'lı kurulum)
+Aynı makinedeki uvicorn worker'ları bellek cache'lerinin arkasında tek
+bir SQLite (WAL) dosyasını okur: bir worker'ın Drive'dan yüklediği liste
+diğerlerine Drive'a gitmeden gelir, aynı klasörü aynı anda tek worker
+yükler (lease). Yazan worker değişen anahtarları invalidation tablosuna
+ekler; diğerleri kısa aralıklarla okuyup kendi bellek kopyalarını düşürür.
+SHARED_CACHE_PATH boşsa (varsayılan) katman kapalıdır.
+"""
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from services.item import Item, json_default
+
+SHARED_CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", "")
+POLL_INTERVAL = float(os.environ.get("SHARED_CACHE_POLL_INTERVAL", "0.5"))  # seconds
+
+INVALIDATION_RETENTION = 60 * 60  # seconds
+ITEM_RETENTION = 7 * 24 * 60 * 60  # hiçbir listeye yazılmayan öğe satırları
+MAINTENANCE_INTERVAL = 300  # seconds
+CLEAR_ALL = "*"  # invalidation: tüm anahtarlar
+
+ITEM_LIST_PREFIX = "items_"
+META_LIST_PREFIX = "items_meta_"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=json_default)
+
+
+class SharedCache:
+    """Process'ler arası anahtar → değer deposu + invalidation günlüğü + lease'ler.
+
+    Öğe listeleri (items_*) öğe satırları ve sıralı id listesi olarak
+    saklanır; tek notluk bir yama tüm klasörü yeniden yazmaz.
+    """
+
+    def __init__(self, path: str, poll_interval: float = POLL_INTERVAL):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires REAL,
+                version INTEGER NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                meta TEXT NOT NULL,
+                content TEXT,
+                content_of TEXT,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS invalidations (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                keys TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                until REAL NOT NULL
+            );
+        """)
+        # Açılıştan önceki invalidation'lar bu process'i ilgilendirmez
+        row = self._conn.execute("SELECT MAX(seq) FROM invalidations").fetchone()
+        self._last_seq = row[0] or 0
+        self._last_maintenance = time.time()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "published": 0, "received": 0}
+        self._handler = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- okuma ----------
+
+    def get(self, key: str) -> tuple | None:
+        """Taze kayıt: (değer, expires | None, sürüm); yoksa, süresi dolduysa veya eksikse None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires, version FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            value = None
+            if row is not None and (row[1] is None or row[1] > time.time()):
+                data = json.loads(row[0])
+                value = self._load_items(key, data) if key.startswith(ITEM_LIST_PREFIX) else data
+            self._stats["hits" if value is not None else "misses"] += 1
+        return (value, row[1], row[2]) if value is not None else None
+
+    def _load_items(self, key: str, ids: list[str]) -> list[Item] | None:
+        """Sıralı id listesinden öğeler (_lock tutulurken); eksik satır / gövde varsa None"""
+        with_content = not key.startswith(META_LIST_PREFIX)
+        rows = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for file_id, meta, content, content_of in self._conn.execute(
+                f"SELECT id, meta, content, content_of FROM items WHERE id IN ({placeholders})", chunk
+            ):
+                rows[file_id] = (meta, content, content_of)
+        items = []
+        for file_id in ids:
+            row = rows.get(file_id)
+            if row is None:
+                return None
+            fields = json.loads(row[0])
+            if with_content:
+                # Gövde, meta'daki sürümle (modified) yazılmış olmalı
+                if row[1] is None or row[2] != fields.get("modified"):
+                    return None
+                fields["content"] = row[1]
+            items.append(Item(**fields))
+        return items
+
+    # ---------- yazma ----------
+
+    def put(self, key: str, value, ttl: float | None) -> int:
+        """Değeri yaz (ttl=None: süresiz), yeni sürümü döndür"""
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        with self._transaction():
+            data = self._write_value(key, value, value, now)
+            self._conn.execute(
+                "INSERT INTO entries (key, data, expires, version, updated) VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data=excluded.data, expires=excluded.expires, "
+                "version=entries.version + 1, updated=excluded.updated",
+                (key, data, expires, now)
+            )
+            version = self._conn.execute("SELECT version FROM entries WHERE key = ?", (key,)).fetchone()[0]
+        self._stats["writes"] += 1
+        return version
+
+    def patch(self, key: str, value, changed: list, version: int) -> int | None:
+        """Süresini değiştirmeden güncelle, yeni sürümü döndür; öğe listelerinde sadece
+        `changed` satırları yazılır. Kayıt yoksa veya bu arada başka worker yazdıysa
+        (sürüm farklı) None: çağıran kaydı silip yeniden yüklenmeye bırakır."""
+        now = time.time()
+        with self._transaction():
+            row = self._conn.execute("SELECT version FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] != version:
+                return None
+            data = self._write_value(key, value, changed, now)
+            self._conn.execute(
+                "UPDATE entries SET data = ?, version = ?, updated = ? WHERE key = ?",
+                (data, version + 1, now, key)
+            )
+        self._stats["writes"] += 1
+        return version + 1
+
+    @contextmanager
+    def _transaction(self):
+        """Yazma kilidiyle tek transaction (diğer process'lerin yazmaları beklenir)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _write_value(self, key: str, value, rows: list, now: float) -> str:
+        """entries.data için JSON; öğe listelerinde `rows` öğe satırlarına yazılır"""
+        if not key.startswith(ITEM_LIST_PREFIX):
+            return _dumps(value)
+        self._conn.executemany(
+            "INSERT INTO items (id, meta, content, content_of, updated) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET meta=excluded.meta, "
+            "content=COALESCE(excluded.content, items.content), "
+            "content_of=COALESCE(excluded.content_of, items.content_of), updated=excluded.updated",
+            [self._item_row(item, now) for item in rows]
+        )
+        return _dumps([item["id"] for item in value])
+
+    @staticmethod
+    def _item_row(item, now: float) -> tuple:
+        item = Item.from_mapping(item)
+        content = item.get("content") if "content" in item else None
+        return (
+            item["id"],
+            _dumps(item.without_content()),
+            content,
+            item.get("modified") if content is not None else None,
+            now,
+        )
+
+    def delete(self, *keys: str):
+        with self._lock:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self):
+        """Tüm kayıtları sil (öğe satırları bakımda temizlenir)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    # ---------- invalidation ----------
+
+    def publish(self, keys):
+        """Diğer worker'lara bu anahtarların yerel kopyalarını düşürmelerini bildir"""
+        keys = sorted(set(keys))
+        if not keys:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO invalidations (keys, origin, at) VALUES (?, ?, ?)",
+                (_dumps(keys), self.origin, time.time())
+            )
+            self._stats["published"] += 1
+
+    def poll(self) -> set[str]:
+        """Son okumadan bu yana diğer process'lerin yayınladığı anahtarlar"""
+        keys = set()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, keys, origin FROM invalidations WHERE seq > ? ORDER BY seq", (self._last_seq,)
+            ).fetchall()
+            for seq, data, origin in rows:
+                self._last_seq = seq
+                if origin != self.origin:
+                    keys.update(json.loads(data))
+                    self._stats["received"] += 1
+        if time.time() - self._last_maintenance > MAINTENANCE_INTERVAL:
+            self._maintenance()
+        return keys
+
+    def _maintenance(self):
+        now = time.time()
+        self._last_maintenance = now
+        with self._lock:
+            self._conn.execute("DELETE FROM invalidations WHERE at < ?", (now - INVALIDATION_RETENTION,))
+            self._conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?", (now - INVALIDATION_RETENTION,))
+            self._conn.execute("DELETE FROM items WHERE updated < ?", (now - ITEM_RETENTION,))
+            self._conn.execute("DELETE FROM leases WHERE until < ?", (now,))
+
+    def watch(self, handler):
+        """Arka plan thread'i: yayınlanan anahtarları handler(keys) ile uygula (tekrar çağrılırsa bir şey yapmaz)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._handler = handler
+            self._thread = threading.Thread(target=self._watch, name="shared-cache-watch", daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                keys = self.poll()
+                if keys:
+                    self._handler(keys)
+            except Exception as e:
+                print(f"Shared cache poll error: {e}")
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.poll_interval * 2)
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE owner = ?", (self.origin,))
+            self._conn.close()
+
+    # ---------- lease ----------
+
+    def try_lease(self, name: str, ttl: float) -> bool:
+        """Adlandırılmış kilidi al veya yenile (sahibi bu process ise); başkasındaysa False"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (name, owner, until) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner=excluded.owner, until=excluded.until "
+                "WHERE leases.until < ? OR leases.owner = excluded.owner",
+                (name, self.origin, now + ttl, now)
+            )
+            return cursor.rowcount > 0
+
+    def release(self, name: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, self.origin))
+
+    def is_leased(self, name: str) -> bool:
+        """Kilit başka bir process'te ve süresi dolmamış mı"""
+        with self._lock:
+            row = self._conn.execute("SELECT owner, until FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] != self.origin and row[1] > time.time()
+
+    def wait_for(self, key: str, lease: str, timeout: float, interval: float = 0.1) -> tuple | None:
+        """Başka worker'ın yüklediği kaydı bekle; kilit bırakıldıysa veya süre dolduysa None"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            found = self.get(key)
+            if found is not None:
+                return found
+            if not self.is_leased(lease):
+                # Yükleyen bitirdi ama yazamadı (ör. hata): son bir kez bak
+                return self.get(key)
+            time.sleep(interval)
+        return None
+
+    # ---------- görünürlük ----------
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            items = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            leases = dict(self._conn.execute(
+                "SELECT name, owner FROM leases WHERE until > ?", (time.time(),)
+            ).fetchall())
+            return {
+                "origin": self.origin,
+                "entries": entries,
+                "items": items,
+                "leases": leases,
+                **self._stats,
+            }
+
+
+_shared = None
+_shared_failed = False
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache | None:
+    """Paylaşılan katman singleton'ı (kapalıysa veya açılamazsa None)"""
+    global _shared, _shared_failed
+    if _shared is None and SHARED_CACHE_PATH and not _shared_failed:
+        with _shared_lock:
+            if _shared is None and not _shared_failed:
+                try:
+                    _shared = SharedCache(SHARED_CACHE_PATH)
+                except (OSError, sqlite3.Error) as e:
+                    _shared_failed = True
+                    print(f"Shared cache disabled: {e}")
+    return _shared
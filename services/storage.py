@@ -0,0 +1,191 @@
+"""
+Depolama Backend'leri
+services.drive'ın dosya işlemleri (klasör arama, listeleme, okuma,
+oluşturma, güncelleme, taşıma, silme) bu arayüz üzerinden yapılır.
+Kayıtlar Drive listeleme biçimindedir (id, name, modifiedTime,
+md5Checksum, appProperties, parents); üst katman backend'i bilmez.
+
+STORAGE_BACKEND:
+    drive  → Google Drive v3 (services/storage_drive.py, varsayılan)
+    local  → diskte aynı klasör düzeni, frontmatter'lı .md dosyaları
+             (services/storage_local.py; kimlik bilgisi / ağ gerekmez)
+STORAGE_LATENCY_MS > 0 ise seçilen backend çağrı başına gecikme ekleyen
+LatencyBackend ile sarılır (benchmark / yük testi).
+"""
+from __future__ import annotations
+import os
+import random
+import threading
+import time
+from typing import Iterator
+
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "drive")
+LOCAL_STORAGE_PATH = os.environ.get("LOCAL_STORAGE_PATH", "data")
+STORAGE_LATENCY_MS = float(os.environ.get("STORAGE_LATENCY_MS", "0"))
+STORAGE_JITTER_MS = float(os.environ.get("STORAGE_JITTER_MS", "0"))
+
+# Paralel içerik indirme thread sayısı (services.drive); Drive connection pool'u buna göre boyutlanır
+FETCH_WORKERS = int(os.environ.get("DRIVE_FETCH_WORKERS", "5"))
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+MARKDOWN_MIME = "text/markdown"
+LIST_FIELDS = "nextPageToken, files(id, name, modifiedTime, md5Checksum, appProperties)"
+WRITE_FIELDS = "id, name, modifiedTime, md5Checksum, appProperties"
+
+
+class StorageError(Exception):
+    """Backend'e özgü olmayan depolama hatası (status: HTTP benzeri kod)"""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+class StorageBackend:
+    """Notların saklandığı yer. Klasörler kök altındaki adlarıyla bulunur,
+    dosya id'leri taşımada değişmez."""
+
+    name = "base"
+    supports_changes = False   # Changes API benzeri artımlı değişiklik akışı
+    changes_scope = None       # değişiklik token'ının saklandığı anahtar eki
+    files_are_source = False   # .md dosyaları asıl kaynak: metadata değişikliği frontmatter'a hemen yazılır
+
+    # ---------- klasörler ----------
+
+    def list_folders(self) -> dict[str, str]:
+        """Kökteki klasörler: {ad: id}"""
+        raise NotImplementedError
+
+    def create_folder(self, name: str) -> str:
+        raise NotImplementedError
+
+    # ---------- okuma ----------
+
+    def list_files(self, folder_id: str, fields: str = LIST_FIELDS, name_contains: str = None) -> list[dict]:
+        """Klasördeki tüm dosyalar (en son değişen önce)"""
+        raise NotImplementedError
+
+    def get_file(self, file_id: str, fields: str = WRITE_FIELDS) -> dict:
+        raise NotImplementedError
+
+    def read_file(self, file_id: str) -> bytes:
+        raise NotImplementedError
+
+    # ---------- yazma ----------
+
+    def create_file(self, folder_id: str, name: str, content: bytes, app_properties: dict = None,
+                    mimetype: str = MARKDOWN_MIME, fields: str = WRITE_FIELDS) -> dict:
+        raise NotImplementedError
+
+    def update_file(self, file_id: str, content: bytes = None, app_properties: dict = None,
+                    modified_time: str = None, fields: str = WRITE_FIELDS) -> dict:
+        """İçeriği ve/veya appProperties'i güncelle (None değerli property silinir)"""
+        raise NotImplementedError
+
+    def move_file(self, file_id: str, from_folder_id: str, to_folder_id: str, fields: str = WRITE_FIELDS) -> dict:
+        raise NotImplementedError
+
+    def delete_file(self, file_id: str):
+        """Kalıcı sil"""
+        raise NotImplementedError
+
+    def upload_stream(self, folder_id: str, name: str, chunks: Iterator[bytes], mimetype: str) -> str:
+        """Boyutu bilinmeyen akışı dosyaya yaz (export), dosya id'sini döndür"""
+        raise NotImplementedError
+
+    # ---------- değişiklikler (supports_changes) ----------
+
+    def get_start_token(self) -> str:
+        raise NotImplementedError
+
+    def list_changes(self, page_token: str, fields: str) -> dict:
+        """Tek sayfa: {changes, nextPageToken?, newStartPageToken?}"""
+        raise NotImplementedError
+
+
+class LatencyBackend(StorageBackend):
+    """Her çağrıya sabit + rastgele gecikme ekleyen sarmalayıcı; çağrı sayısı ve süresini tutar"""
+
+    CALLS = (
+        "list_folders", "create_folder", "list_files", "get_file", "read_file", "create_file",
+        "update_file", "move_file", "delete_file", "upload_stream", "get_start_token", "list_changes",
+    )
+
+    def __init__(self, inner: StorageBackend, latency_ms: float = 0, jitter_ms: float = 0, seed: int = None):
+        self.inner = inner
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.name = f"{inner.name}+latency"
+        self.supports_changes = inner.supports_changes
+        self.changes_scope = inner.changes_scope
+        self.files_are_source = inner.files_are_source
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = {}
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0
+        return max(0.0, self.latency + jitter)
+
+    def _call(self, method: str, *args, **kwargs):
+        time.sleep(self._delay())
+        start = time.perf_counter()
+        try:
+            return getattr(self.inner, method)(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                count, total = self.calls.get(method, (0, 0.0))
+                self.calls[method] = (count + 1, total + elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {method: {"count": count, "seconds": round(total, 4)} for method, (count, total) in self.calls.items()}
+
+
+def _delegate(method: str):
+    def call(self, *args, **kwargs):
+        return self._call(method, *args, **kwargs)
+    call.__name__ = method
+    return call
+
+
+for _method in LatencyBackend.CALLS:
+    setattr(LatencyBackend, _method, _delegate(_method))
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    """Ayarlardan backend oluştur"""
+    if backend == "local":
+        from services.storage_local import LocalBackend
+        storage = LocalBackend(LOCAL_STORAGE_PATH)
+    elif backend == "drive":
+        from services.storage_drive import DriveBackend
+        storage = DriveBackend()
+    else:
+        raise ValueError(f"Bilinmeyen STORAGE_BACKEND: {backend} (drive, local)")
+    if STORAGE_LATENCY_MS > 0 or STORAGE_JITTER_MS > 0:
+        storage = LatencyBackend(storage, STORAGE_LATENCY_MS, STORAGE_JITTER_MS)
+    return storage
+
+
+def get_storage() -> StorageBackend:
+    """Backend singleton'ı (ilk kullanımda STORAGE_BACKEND'e göre kurulur)"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+def set_storage(storage: StorageBackend | None):
+    """Backend'i değiştir (benchmark / yük testi; None: ayarlardan yeniden kur)"""
+    global _storage
+    with _storage_lock:
+        _storage = storage
@@ -0,0 +1,244 @@
+"""
+Google Drive Backend
+StorageBackend'in Google Drive v3 (Shared Drive) uygulaması. Servis
+hesabı GCP_CREDENTIALS'tan okunur, istekler DriveHttp (havuzlu, retry'lı
+transport) üzerinden gider.
+"""
+import json
+import os
+import threading
+import time
+from typing import Iterator
+
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from googleapiclient.http import MediaInMemoryUpload, MediaUpload
+
+from services.metrics import drive_caller, observe_drive_call
+from services.storage import FETCH_WORKERS, FOLDER_MIME, LIST_FIELDS, MARKDOWN_MIME, WRITE_FIELDS, StorageBackend
+from services.transport import DriveHttp
+
+SCOPES = ['https://www.googleapis.com/auth/drive']
+SHARED_DRIVE_ID = os.environ.get("SHARED_DRIVE_ID", "0AFbVhvJLQtOHUk9PVA")
+
+# Connection pool paralel içerik indirme thread'lerine göre boyutlanır
+POOL_SIZE = int(os.environ.get("DRIVE_POOL_SIZE", str(FETCH_WORKERS * 2)))
+
+# Resumable upload parça boyutu (256 KB'ın katı olmalı)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def get_credentials():
+    """Environment'tan credentials al"""
+    creds_json = os.environ.get("GCP_CREDENTIALS")
+    if creds_json:
+        creds_info = json.loads(creds_json)
+        return service_account.Credentials.from_service_account_info(creds_info, scopes=SCOPES)
+    raise ValueError("GCP_CREDENTIALS environment variable not set")
+
+
+class _StreamingUpload(MediaUpload):
+    """Boyutu bilinmeyen akışı Drive'a resumable parçalar halinde yükler.
+
+    googleapiclient size() None dönünce her parçayı getbytes ile ister ve
+    kısa okumayı dosya sonu kabul eder. Sadece henüz onaylanmamış baytlar
+    bellekte tutulur.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], mimetype: str, chunksize: int = UPLOAD_CHUNK_SIZE):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._buffer = bytearray()
+        self._offset = 0  # _buffer[0]'ın akıştaki konumu
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return None
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def getbytes(self, begin, length):
+        # Sunucunun onayladığı baytları bırak (retry'da sadece begin'den sonrası gerekir)
+        if begin > self._offset:
+            del self._buffer[:begin - self._offset]
+            self._offset = begin
+        while len(self._buffer) < length:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer.extend(chunk)
+        return bytes(self._buffer[:length])
+
+
+class DriveBackend(StorageBackend):
+    """Shared Drive: klasörler drive kökünde, dosyalar klasörlerin altında"""
+
+    supports_changes = True
+
+    def __init__(self, service=None, drive_id: str = SHARED_DRIVE_ID):
+        self.drive_id = drive_id
+        self.name = f"drive:{drive_id}"
+        self.changes_scope = drive_id
+        self._service = service
+        self._service_lock = threading.Lock()
+
+    @property
+    def service(self):
+        """googleapiclient servisi - lazy singleton (thread-safe, pooled transport)"""
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    http = DriveHttp(get_credentials(), pool_size=POOL_SIZE)
+                    self._service = build('drive', 'v3', http=http, cache_discovery=False)
+        return self._service
+
+    def _execute(self, method: str, request):
+        """İsteği çalıştır; metot + çağıran fonksiyon başına sayı / süre kaydedilir"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = request.execute()
+            ok = True
+            return result
+        finally:
+            observe_drive_call(method, drive_caller(), time.perf_counter() - start, ok)
+
+    # ---------- klasörler ----------
+
+    def list_folders(self) -> dict[str, str]:
+        results = self._execute("files.list", self.service.files().list(
+            q=f"'{self.drive_id}' in parents and mimeType='{FOLDER_MIME}' and trashed=false",
+            fields="files(id, name)",
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
+            corpora="drive",
+            driveId=self.drive_id
+        ))
+        return {folder['name']: folder['id'] for folder in results.get('files', [])}
+
+    def create_folder(self, name: str) -> str:
+        folder = self._execute("files.create", self.service.files().create(
+            body={'name': name, 'mimeType': FOLDER_MIME, 'parents': [self.drive_id]},
+            supportsAllDrives=True,
+            fields='id'
+        ))
+        return folder.get('id')
+
+    # ---------- okuma ----------
+
+    def list_files(self, folder_id: str, fields: str = LIST_FIELDS, name_contains: str = None) -> list[dict]:
+        """Klasördeki tüm dosyaları pagination ile çek"""
+        query = f"'{folder_id}' in parents and trashed=false"
+        if name_contains:
+            query += f" and name contains '{name_contains}'"
+        all_files = []
+        page_token = None
+        while True:
+            results = self._execute("files.list", self.service.files().list(
+                q=query,
+                fields=fields,
+                orderBy="modifiedTime desc",
+                pageSize=100,
+                pageToken=page_token,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True
+            ))
+            all_files.extend(results.get('files', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        return all_files
+
+    def get_file(self, file_id: str, fields: str = WRITE_FIELDS) -> dict:
+        return self._execute("files.get", self.service.files().get(fileId=file_id, fields=fields, supportsAllDrives=True))
+
+    def read_file(self, file_id: str) -> bytes:
+        return self._execute("files.get_media", self.service.files().get_media(fileId=file_id))
+
+    # ---------- yazma ----------
+
+    def create_file(self, folder_id: str, name: str, content: bytes, app_properties: dict = None,
+                    mimetype: str = MARKDOWN_MIME, fields: str = WRITE_FIELDS) -> dict:
+        body = {'name': name, 'parents': [folder_id], 'mimeType': mimetype}
+        if app_properties:
+            body['appProperties'] = {k: v for k, v in app_properties.items() if v is not None}
+        return self._execute("files.create", self.service.files().create(
+            body=body,
+            media_body=MediaInMemoryUpload(content, mimetype=mimetype),
+            supportsAllDrives=True,
+            fields=fields
+        ))
+
+    def update_file(self, file_id: str, content: bytes = None, app_properties: dict = None,
+                    modified_time: str = None, fields: str = WRITE_FIELDS) -> dict:
+        body = {}
+        if app_properties is not None:
+            body['appProperties'] = app_properties
+        if modified_time is not None:
+            body['modifiedTime'] = modified_time
+        kwargs = {'body': body} if body else {}
+        if content is not None:
+            kwargs['media_body'] = MediaInMemoryUpload(content, mimetype=MARKDOWN_MIME)
+        return self._execute("files.update", self.service.files().update(
+            fileId=file_id,
+            supportsAllDrives=True,
+            fields=fields,
+            **kwargs
+        ))
+
+    def move_file(self, file_id: str, from_folder_id: str, to_folder_id: str, fields: str = WRITE_FIELDS) -> dict:
+        return self._execute("files.update", self.service.files().update(
+            fileId=file_id,
+            addParents=to_folder_id,
+            removeParents=from_folder_id,
+            supportsAllDrives=True,
+            fields=fields
+        ))
+
+    def delete_file(self, file_id: str):
+        self._execute("files.delete", self.service.files().delete(fileId=file_id, supportsAllDrives=True))
+
+    def upload_stream(self, folder_id: str, name: str, chunks: Iterator[bytes], mimetype: str) -> str:
+        request = self.service.files().create(
+            body={'name': name, 'parents': [folder_id], 'mimeType': mimetype},
+            media_body=_StreamingUpload(chunks, mimetype),
+            supportsAllDrives=True,
+            fields='id'
+        )
+        start = time.perf_counter()
+        response = None
+        try:
+            while response is None:
+                _, response = request.next_chunk()
+        finally:
+            observe_drive_call("files.create", drive_caller(1), time.perf_counter() - start, response is not None)
+        return response.get('id')
+
+    # ---------- Changes API ----------
+
+    def get_start_token(self) -> str:
+        return self._execute("changes.getStartPageToken", self.service.changes().getStartPageToken(
+            supportsAllDrives=True,
+            driveId=self.drive_id
+        ))['startPageToken']
+
+    def list_changes(self, page_token: str, fields: str) -> dict:
+        return self._execute("changes.list", self.service.changes().list(
+            pageToken=page_token,
+            driveId=self.drive_id,
+            includeItemsFromAllDrives=True,
+            supportsAllDrives=True,
+            pageSize=1000,
+            fields=fields
+        ))
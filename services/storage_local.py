@@ -0,0 +1,223 @@
+"""
+Yerel Disk Backend'i
+Drive'daki düzenin aynısı diskte: kök altında inbox/notlar/gorevler/
+arsiv/cop_kutusu klasörleri ve frontmatter'lı .md dosyaları. Kimlik
+bilgisi ve ağ gerekmez (STORAGE_BACKEND=local, LOCAL_STORAGE_PATH).
+
+- Klasör id'si klasör adı, dosya id'si dosya adıdır; adlar klasörler
+  arasında benzersiz tutulur, böylece taşımada id değişmez
+- appProperties her klasörün .props/ alt dizininde dosya başına JSON
+- modifiedTime dosyanın mtime'ı (mikrosaniye); md5Checksum yok, içerik
+  sürümü modifiedTime'dır (listeleme dosyaları okumaz)
+"""
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Iterator
+
+from services.storage import LIST_FIELDS, MARKDOWN_MIME, WRITE_FIELDS, StorageBackend, StorageError
+
+DEFAULT_FOLDERS = ("inbox", "notlar", "gorevler", "arsiv", "cop_kutusu")
+PROPS_DIR = ".props"
+
+
+def _format_mtime(mtime_ns: int) -> str:
+    """Drive biçimi (RFC 3339, UTC); mikrosaniye hassasiyeti sürüm karşılaştırması için"""
+    moment = datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _parse_mtime(value: str) -> float:
+    for pattern in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(value, pattern).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    raise StorageError(f"Geçersiz modifiedTime: {value}", status=400)
+
+
+class LocalBackend(StorageBackend):
+    """Kök dizin altında klasör başına bir dizin"""
+
+    files_are_source = True
+
+    def __init__(self, root: str, folders: tuple[str, ...] = DEFAULT_FOLDERS):
+        self.root = os.path.abspath(root)
+        self.name = f"local:{self.root}"
+        self._lock = threading.RLock()
+        self._locations = {}  # dosya adı → klasör (taramayla güncellenir)
+        for folder in folders:
+            os.makedirs(os.path.join(self.root, folder), exist_ok=True)
+
+    # ---------- yollar ----------
+
+    def _folder_path(self, folder_id: str) -> str:
+        if not folder_id or os.sep in folder_id or folder_id.startswith("."):
+            raise StorageError(f"Geçersiz klasör: {folder_id}", status=400)
+        path = os.path.join(self.root, folder_id)
+        if not os.path.isdir(path):
+            raise StorageError(f"Klasör bulunamadı: {folder_id}", status=404)
+        return path
+
+    def _locate(self, file_id: str) -> str:
+        """Dosyanın bulunduğu klasör; bilinmiyorsa klasörler yeniden taranır"""
+        if not file_id or os.sep in file_id or file_id.startswith("."):
+            raise StorageError(f"Geçersiz dosya id: {file_id}", status=400)
+        with self._lock:
+            folder = self._locations.get(file_id)
+            if folder is not None and os.path.exists(os.path.join(self.root, folder, file_id)):
+                return folder
+            for folder in self.list_folders():
+                if os.path.exists(os.path.join(self.root, folder, file_id)):
+                    self._locations[file_id] = folder
+                    return folder
+        raise StorageError(f"Dosya bulunamadı: {file_id}", status=404)
+
+    def _props_path(self, folder: str, file_id: str) -> str:
+        return os.path.join(self.root, folder, PROPS_DIR, f"{file_id}.json")
+
+    def _read_props(self, folder: str, file_id: str) -> dict:
+        try:
+            with open(self._props_path(folder, file_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_props(self, folder: str, file_id: str, props: dict):
+        path = self._props_path(folder, file_id)
+        if not props:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._atomic_write(path, json.dumps(props, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        tmp = f"{path}.tmp-{threading.get_ident()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _info(self, folder: str, file_id: str) -> dict:
+        """Drive listeleme kaydı biçiminde dosya bilgisi"""
+        stat = os.stat(os.path.join(self.root, folder, file_id))
+        return {
+            'id': file_id,
+            'name': file_id,
+            'mimeType': MARKDOWN_MIME,
+            'parents': [folder],
+            'modifiedTime': _format_mtime(stat.st_mtime_ns),
+            'appProperties': self._read_props(folder, file_id),
+        }
+
+    def _unique_name(self, name: str) -> str:
+        """Tüm klasörlerde benzersiz dosya adı (çakışmada -2, -3 ...)"""
+        stem, ext = os.path.splitext(name)
+        candidate, n = name, 1
+        while any(os.path.exists(os.path.join(self.root, folder, candidate)) for folder in self.list_folders()):
+            n += 1
+            candidate = f"{stem}-{n}{ext}"
+        return candidate
+
+    # ---------- klasörler ----------
+
+    def list_folders(self) -> dict[str, str]:
+        return {
+            entry.name: entry.name for entry in os.scandir(self.root)
+            if entry.is_dir() and not entry.name.startswith(".")
+        }
+
+    def create_folder(self, name: str) -> str:
+        if not name or os.sep in name or name.startswith("."):
+            raise StorageError(f"Geçersiz klasör adı: {name}", status=400)
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        return name
+
+    # ---------- okuma ----------
+
+    def list_files(self, folder_id: str, fields: str = LIST_FIELDS, name_contains: str = None) -> list[dict]:
+        path = self._folder_path(folder_id)
+        files = []
+        for entry in os.scandir(path):
+            if not entry.is_file() or entry.name.startswith(".") or ".tmp-" in entry.name:
+                continue
+            if name_contains and name_contains not in entry.name:
+                continue
+            files.append(self._info(folder_id, entry.name))
+        with self._lock:
+            self._locations.update((f['id'], folder_id) for f in files)
+        files.sort(key=lambda f: f['modifiedTime'], reverse=True)
+        return files
+
+    def get_file(self, file_id: str, fields: str = WRITE_FIELDS) -> dict:
+        return self._info(self._locate(file_id), file_id)
+
+    def read_file(self, file_id: str) -> bytes:
+        with open(os.path.join(self.root, self._locate(file_id), file_id), "rb") as f:
+            return f.read()
+
+    # ---------- yazma ----------
+
+    def create_file(self, folder_id: str, name: str, content: bytes, app_properties: dict = None,
+                    mimetype: str = MARKDOWN_MIME, fields: str = WRITE_FIELDS) -> dict:
+        folder_path = self._folder_path(folder_id)
+        with self._lock:
+            file_id = self._unique_name(os.path.basename(name))
+            self._atomic_write(os.path.join(folder_path, file_id), content)
+            self._write_props(folder_id, file_id, {k: v for k, v in (app_properties or {}).items() if v is not None})
+            self._locations[file_id] = folder_id
+        return self._info(folder_id, file_id)
+
+    def update_file(self, file_id: str, content: bytes = None, app_properties: dict = None,
+                    modified_time: str = None, fields: str = WRITE_FIELDS) -> dict:
+        with self._lock:
+            folder = self._locate(file_id)
+            path = os.path.join(self.root, folder, file_id)
+            if content is not None:
+                self._atomic_write(path, content)
+            if app_properties is not None:
+                # Drive gibi birleştirilir: None değerli anahtar silinir
+                props = self._read_props(folder, file_id)
+                for key, value in app_properties.items():
+                    if value is None:
+                        props.pop(key, None)
+                    else:
+                        props[key] = value
+                self._write_props(folder, file_id, props)
+            if modified_time is not None:
+                moment = _parse_mtime(modified_time)
+                os.utime(path, (moment, moment))
+        return self._info(folder, file_id)
+
+    def move_file(self, file_id: str, from_folder_id: str, to_folder_id: str, fields: str = WRITE_FIELDS) -> dict:
+        target = self._folder_path(to_folder_id)
+        with self._lock:
+            folder = self._locate(file_id)
+            if folder != from_folder_id:
+                raise StorageError(f"{file_id} {from_folder_id} klasöründe değil", status=409)
+            props = self._read_props(folder, file_id)
+            os.replace(os.path.join(self.root, folder, file_id), os.path.join(target, file_id))
+            self._write_props(to_folder_id, file_id, props)
+            self._write_props(folder, file_id, {})
+            self._locations[file_id] = to_folder_id
+        return self._info(to_folder_id, file_id)
+
+    def delete_file(self, file_id: str):
+        with self._lock:
+            folder = self._locate(file_id)
+            os.remove(os.path.join(self.root, folder, file_id))
+            self._write_props(folder, file_id, {})
+            self._locations.pop(file_id, None)
+
+    def upload_stream(self, folder_id: str, name: str, chunks: Iterator[bytes], mimetype: str) -> str:
+        folder_path = self._folder_path(folder_id)
+        with self._lock:
+            file_id = self._unique_name(os.path.basename(name))
+            tmp = os.path.join(folder_path, f".{file_id}.tmp-{threading.get_ident()}")
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, os.path.join(folder_path, file_id))
+        return file_id
@@ -0,0 +1,229 @@
+"""
+Drive Changes API Senkronizasyonu
+Arka planda changes.list ile Shared Drive'daki değişiklikleri izler ve
+bellekteki klasör listelerine uygular. Okumalar bellekten yapılır, Drive
+trafiği arşiv boyutuyla değil değişiklik sayısıyla orantılıdır.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+
+from services import drive
+from services.content_store import get_content_store
+from services.shared_cache import get_shared_cache
+from services.storage import FOLDER_MIME, get_storage
+
+SYNC_INTERVAL = float(os.environ.get("DRIVE_SYNC_INTERVAL", "10"))  # seconds, 0 = kapalı
+MAX_BACKOFF = 300  # seconds
+LEADER_LEASE = "drive-sync"  # paylaşılan cache açıkken senkronizasyonu tek worker yapar
+
+CHANGE_FIELDS = (
+    "nextPageToken, newStartPageToken, "
+    "changes(fileId, removed, file(id, name, parents, trashed, mimeType, modifiedTime, md5Checksum, appProperties))"
+)
+
+
+def _token_key() -> str:
+    return f"changes_token:{get_storage().changes_scope}"
+
+
+class DriveSyncEngine:
+    """changes.list tabanlı artımlı senkronizasyon (tek arka plan thread'i)"""
+
+    def __init__(self, interval: float = SYNC_INTERVAL):
+        self.interval = interval
+        self.last_sync = None
+        self.last_error = None
+        self._token = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="drive-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        drive.set_sync_active(False)
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.release(LEADER_LEASE)
+
+    def _is_leader(self) -> bool:
+        """Paylaşılan cache kapalıysa her zaman; açıksa lease'i tutan tek worker"""
+        shared = get_shared_cache()
+        if shared is None:
+            return True
+        try:
+            leader = shared.try_lease(LEADER_LEASE, max(self.interval * 3, 60))
+        except Exception as e:
+            # Lease okunamıyorsa eski davranış: her worker kendi senkronize eder
+            print(f"Drive sync lease error: {e}")
+            return True
+        if not leader and self._token is not None:
+            # Liderlik başka worker'a geçti: yazmalar ondan invalidation ile gelir
+            self._token = None
+            drive.set_sync_active(False)
+        return leader
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.is_set():
+            if not self._is_leader():
+                self._stop.wait(self.interval)
+                continue
+            try:
+                if self._token is None:
+                    self._bootstrap()
+                else:
+                    self.poll()
+                if not drive._sync_active:
+                    drive.set_sync_active(True)
+                self.last_sync = time.time()
+                self.last_error = None
+                delay = self.interval
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Drive sync error: {e}")
+                # Senkronizasyon koparsa TTL cache'e geri dön (bayat veri sunma)
+                drive.set_sync_active(False)
+                status = getattr(getattr(e, "resp", None), "status", None)
+                if status in (400, 404, 410):
+                    # Token geçersiz: baştan yükle
+                    self._reset_token()
+                delay = min(delay * 2, MAX_BACKOFF)
+            self._stop.wait(delay)
+
+    def _reset_token(self):
+        self._token = None
+        store = get_content_store()
+        if store:
+            store.set_meta(_token_key(), None)
+
+    def _save_token(self, token: str):
+        self._token = token
+        store = get_content_store()
+        if store:
+            store.set_meta(_token_key(), token)
+
+    def _bootstrap(self):
+        """Başlangıç token'ı al ve klasörleri belleğe yükle"""
+        store = get_content_store()
+        token = store.get_meta(_token_key()) if store else None
+
+        if token is None:
+            # Önce token, sonra tam yükleme: aradaki değişiklikler kaybolmaz
+            token = get_storage().get_start_token()
+            for folder_type in drive.FOLDER_CONFIG:
+                drive.refresh_items(folder_type)
+        else:
+            # Disk snapshot'ı token ile tutarlı, üzerine değişiklikleri uygula
+            for folder_type in drive.FOLDER_CONFIG:
+                drive.get_items(folder_type)
+
+        self._token = token
+        self.poll()
+
+    def poll(self) -> int:
+        """Token'dan bu yana gelen değişiklikleri uygula, uygulanan sayıyı döndür"""
+        storage = get_storage()
+        page_token = self._token
+        new_token = None
+        affected = set()
+        applied = 0
+
+        while page_token:
+            response = storage.list_changes(page_token, fields=CHANGE_FIELDS)
+            for change in response.get('changes', []):
+                affected |= self._apply(change)
+                applied += 1
+            new_token = response.get('newStartPageToken', new_token)
+            page_token = response.get('nextPageToken')
+
+        store = get_content_store()
+        if store:
+            for folder_type in affected:
+                items = drive.get_cached(f"items_{folder_type}")
+                if items is not None:
+                    store.set_folder(folder_type, items)
+        if new_token:
+            self._save_token(new_token)
+        return applied
+
+    def _apply(self, change: dict) -> set[str]:
+        """Tek değişikliği bellekteki listelere uygula, etkilenen klasörleri döndür"""
+        file_id = change['fileId']
+        file_info = change.get('file') or {}
+        if file_info.get('mimeType') == FOLDER_MIME:
+            return set()
+
+        folder_by_id = {
+            folder_id: name for name, folder_id in drive.get_folder_ids().items()
+            if name in drive.FOLDER_CONFIG
+        }
+        target = None
+        if not change.get('removed') and not file_info.get('trashed'):
+            target = next((folder_by_id[p] for p in file_info.get('parents', []) if p in folder_by_id), None)
+
+        # Silindi, çöpe atıldı veya takip edilmeyen bir klasöre taşındı (logs/, export/ ...)
+        if target is None:
+            source, _ = drive._find_cached_item(file_id, include_meta=True)
+            if source is None:
+                return set()
+            drive._cache_remove_item(file_id, from_folder=source)
+            return {source}
+
+        # Hedef listesi bellekte yok (süresi doldu/LRU): eski yerinden çıkar, hedefi yeniden yüklet
+        if drive.get_cached(f"items_{target}") is None:
+            source, _ = drive._find_cached_item(file_id, include_meta=True)
+            if source is not None and source != target:
+                drive._cache_remove_item(file_id, from_folder=source)
+            drive.invalidate_folder(target)
+            return {target, source} - {None}
+
+        source, cached = drive._find_cached_item(file_id)
+        # Bu process'in kendi yazması write-through ile zaten uygulandı: sürüm aynıysa atla
+        if source == target and cached is not None and cached.get("modified") == file_info.get("modifiedTime"):
+            if drive._apply_listing(dict(cached), file_info) == dict(cached):
+                return set()
+
+        store = get_content_store()
+        known = store.get_many([file_info]) if store else {}
+        if file_id in known:
+            item = drive._apply_listing(known[file_id], file_info)
+        else:
+            item = drive._fetch_file_content(file_info)
+            if store:
+                store.put_many(target, [(drive.file_version(file_info), item)])
+
+        drive._cache_upsert_item(target, item)
+        return {target, source} - {None}
+
+
+_engine = None
+
+
+def start_sync() -> DriveSyncEngine | None:
+    """Arka plan senkronizasyonunu başlat (DRIVE_SYNC_INTERVAL=0 ise veya backend
+    değişiklik akışı sunmuyorsa kapalı)"""
+    global _engine
+    if SYNC_INTERVAL <= 0 or not get_storage().supports_changes:
+        return None
+    if _engine is None:
+        _engine = DriveSyncEngine()
+        _engine.start()
+    return _engine
+
+
+def stop_sync():
+    """Senkronizasyonu durdur"""
+    global _engine
+    if _engine is not None:
+        _engine.stop()
+        _engine = None
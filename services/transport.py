@@ -0,0 +1,153 @@
+"""
+Drive HTTP Transport
+googleapiclient için httplib2 uyumlu, thread-safe ve bağlantı havuzlu
+HTTP katmanı: keep-alive, timeout, retry ve kilitli token yenileme.
+"""
+import os
+import threading
+
+import httplib2
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from google.auth.transport.requests import Request as AuthRequest
+
+CONNECT_TIMEOUT = float(os.environ.get("DRIVE_CONNECT_TIMEOUT", "5"))  # seconds
+READ_TIMEOUT = float(os.environ.get("DRIVE_READ_TIMEOUT", "30"))  # seconds
+MAX_RETRIES = 3
+
+# Rate limit ve geçici sunucu hatalarında tekrar dene (Retry-After'a uyar)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Drive'da PATCH (files.update) idempotent; POST (create) tekrar denenmez
+RETRY_METHODS = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,          # googleapiclient'ın yaptığı mantıksal istekler
+    "http_requests": 0,     # retry'lar dahil gerçek HTTP istekleri
+    "new_connections": 0,   # yeni TCP/TLS el sıkışmaları
+    "token_refreshes": 0,
+    "auth_retries": 0,
+    "errors": 0,
+}
+
+
+def _count(key: str, n: int = 1):
+    with _stats_lock:
+        _stats[key] += n
+
+
+def get_transport_stats() -> dict:
+    """Bağlantı yeniden kullanımı / yeni el sıkışma sayaçları"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["reused_connections"] = max(0, stats["http_requests"] - stats["new_connections"])
+    return stats
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count("new_connections")
+        return super()._new_conn()
+
+    def _make_request(self, *args, **kwargs):
+        _count("http_requests")
+        return super()._make_request(*args, **kwargs)
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count("new_connections")
+        return super()._new_conn()
+
+    def _make_request(self, *args, **kwargs):
+        _count("http_requests")
+        return super()._make_request(*args, **kwargs)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Sayaçlı connection pool kullanan requests adapter'ı"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class DriveHttp:
+    """googleapiclient'ın beklediği httplib2.Http arayüzü (sadece request)"""
+
+    def __init__(self, credentials, pool_size: int, max_retries: int = MAX_RETRIES):
+        self.credentials = credentials
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_block: havuz doluysa yeni (atılacak) bağlantı açmak yerine sıra bekle
+        self._adapter = _PooledAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+        # requests.Session thread-safe değil: her thread kendi Session'ını kullanır,
+        # bağlantı havuzu (adapter) hepsinde ortaktır
+        self._local = threading.local()
+
+        self._auth_lock = threading.Lock()
+        self._auth_request = AuthRequest(self._new_session())
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        return session
+
+    @property
+    def _session(self) -> requests.Session:
+        """Bu thread'in Session'ı (ilk kullanımda oluşturulur)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    def _auth_headers(self, force_refresh: bool = False) -> dict:
+        """Token'ı tek thread yeniler, diğerleri kilitte bekler"""
+        headers = {}
+        with self._auth_lock:
+            if force_refresh or not self.credentials.valid:
+                self.credentials.refresh(self._auth_request)
+                _count("token_refreshes")
+            self.credentials.apply(headers)
+        return headers
+
+    def _send(self, method: str, uri: str, body, headers: dict, force_refresh: bool = False):
+        request_headers = dict(headers)
+        request_headers.update(self._auth_headers(force_refresh))
+        return self._session.request(method, uri, data=body, headers=request_headers, timeout=self.timeout)
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=None, connection_type=None):
+        _count("requests")
+        headers = headers or {}
+        try:
+            response = self._send(method, uri, body, headers)
+            if response.status_code == 401:
+                # Token sunucu tarafında geçersiz: bir kez yenile ve tekrar dene
+                _count("auth_retries")
+                response = self._send(method, uri, body, headers, force_refresh=True)
+        except requests.RequestException:
+            _count("errors")
+            raise
+
+        info = {k.lower(): v for k, v in response.headers.items()}
+        # requests gövdeyi zaten açtı
+        info.pop("content-encoding", None)
+        info.pop("content-length", None)
+        info["status"] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content